@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# Micro and end-to-end benchmarks for the game engine.
+#
+#   python benchmarks/bench.py --output bench.json
+#   python benchmarks/bench.py --compare bench.json --tolerance 0.15
+#
+# Every result is reported in operations (ticks, moves, eggs...) per second,
+# with the peak memory allocated while running it, measured on a separate
+# tracemalloc run so that tracing does not skew the timings.
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from random import Random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from snake.direction import Direction
+from snake.game import Board, DrawMode, Game, RandomEggCreator, Snake
+from snake.topology import Topology
+from snake.types import Position
+from snake.ui.headless import HeadlessUi
+
+DEFAULT_SIZES = [20, 100, 300, 1000]
+FILL_RATIOS = [0.1, 0.5, 0.9, 0.99]
+# Topology tables take a few hundred bytes per cell, skip them past that
+MAX_TOPOLOGY_SIZE = 300
+
+# A benchmark is a setup returning the function to time, and how many
+# operations one call of that function performs
+Setup = Callable[[], Tuple[Callable[[], Any], int]]
+
+
+def line_snake(size: int) -> List[Position]:
+    # As long as possible while moving right forever on a torus row
+    return [(x, 0) for x in range(size - 2, -1, -1)]
+
+
+def filled_snake(size: int, ratio: float) -> List[Position]:
+    # First cells in row-major order, head on the left so the snake goes left
+    cells = max(2, int(size * size * ratio))
+    return [(index % size, index // size) for index in range(cells)]
+
+
+def bench_move(size: int, repeat: int, topology: bool = False) -> Setup:
+    # With topology, moves are looked up in the tables of a torus topology
+    def setup() -> Tuple[Callable[[], Any], int]:
+        table = Topology(size, size) if topology else None
+        snake = Snake(Board(size, size, table), line_snake(size))
+        move = snake.move
+
+        def run() -> None:
+            for _ in range(repeat):
+                move()
+        return run, repeat
+    return setup
+
+
+def bench_direction(size: int, repeat: int) -> Setup:
+    def setup() -> Tuple[Callable[[], Any], int]:
+        snake = Snake(Board(size, size), line_snake(size))
+        turns = [Direction.UP, Direction.LEFT, Direction.DOWN, Direction.RIGHT] * (repeat // 4)
+
+        def run() -> None:
+            for turn in turns:
+                snake.direction = turn
+        return run, len(turns)
+    return setup
+
+
+def bench_will_eat_egg(size: int, repeat: int) -> Setup:
+    def setup() -> Tuple[Callable[[], Any], int]:
+        snake = Snake(Board(size, size), line_snake(size))
+        will_eat_egg = snake.will_eat_egg
+        egg = (size - 1, size - 1)
+
+        def run() -> None:
+            for _ in range(repeat):
+                will_eat_egg(egg)
+        return run, repeat
+    return setup
+
+
+def bench_place_egg(size: int, ratio: float, repeat: int) -> Setup:
+    def setup() -> Tuple[Callable[[], Any], int]:
+        game = Game(ui=HeadlessUi(), size=size, snake=filled_snake(size, ratio),
+                    egg_creator=RandomEggCreator(size, Random(0)))
+        place_egg = game._place_egg
+
+        def run() -> None:
+            for _ in range(repeat):
+                place_egg()
+        return run, repeat
+    return setup
+
+
+def bench_game_run(size: int, ticks: int) -> Setup:
+    def setup() -> Tuple[Callable[[], Any], int]:
+        def run() -> None:
+            played = 0
+            seed = 0
+            while played < ticks:
+                game = Game(ui=HeadlessUi(rng=Random(seed)),
+                            iterations=ticks - played,
+                            size=size,
+                            egg_creator=RandomEggCreator(size, Random(seed)),
+                            draw_mode=DrawMode.SKIP)
+                game.run()
+                played += game.ticks
+                seed += 1
+        return run, ticks
+    return setup
+
+
+def bench_import(module: str) -> Setup:
+    # Fresh interpreter start-up plus `import module`
+    def setup() -> Tuple[Callable[[], Any], int]:
+        def run() -> None:
+            subprocess.run([sys.executable, "-c", "import " + module], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return run, 1
+    return setup
+
+
+def measure(setup: Setup, rounds: int) -> Dict[str, float]:
+    best = float("inf")
+    operations = 0
+    for _ in range(rounds):
+        run, operations = setup()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    run, _ = setup()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": operations / best if best > 0 else float("inf"),
+        "seconds": best,
+        "peak_memory_bytes": peak,
+    }
+
+
+def benchmarks(sizes: List[int], quick: bool) -> List[Tuple[str, Dict[str, Any], Setup]]:
+    repeat = 2_000 if quick else 100_000
+    ticks = 2_000 if quick else 50_000
+    suite: List[Tuple[str, Dict[str, Any], Setup]] = [
+        ("import", {"module": "snake"}, bench_import("snake")),
+        ("import", {"module": "snake.ui.pygame"}, bench_import("snake.ui.pygame")),
+    ]
+    for size in sizes:
+        suite.append(("snake.move", {"size": size}, bench_move(size, repeat)))
+        if size <= MAX_TOPOLOGY_SIZE:
+            suite.append(("snake.move", {"size": size, "topology": "wrap"},
+                          bench_move(size, repeat, topology=True)))
+        suite.append(("snake.direction", {"size": size}, bench_direction(size, repeat)))
+        suite.append(("snake.will_eat_egg", {"size": size}, bench_will_eat_egg(size, repeat)))
+        for ratio in FILL_RATIOS:
+            suite.append(("game.place_egg", {"size": size, "fill": ratio},
+                          bench_place_egg(size, ratio, repeat // 10)))
+        suite.append(("game.run", {"size": size}, bench_game_run(size, ticks)))
+    return suite
+
+
+def key(result: Dict[str, Any]) -> str:
+    return json.dumps({name: value for name, value in result.items()
+                       if name not in ("ops_per_sec", "seconds", "peak_memory_bytes")},
+                      sort_keys=True)
+
+
+def compare(results: List[Dict[str, Any]],
+            baseline: List[Dict[str, Any]],
+            tolerance: float) -> List[str]:
+    # Returns one message per result slower than the baseline by more than tolerance
+    previous = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        ratio = result["ops_per_sec"] / before["ops_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append("{}: {:.0f} ops/s, was {:.0f} ops/s ({:+.0%})".format(
+                key(result), result["ops_per_sec"], before["ops_per_sec"], ratio - 1))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the snake engine.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="fewer operations per round")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed slowdown before flagging a regression")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, params, setup in benchmarks(args.sizes, args.quick):
+        if args.filter not in name:
+            continue
+        result = dict(name=name, **params, **measure(setup, args.rounds))
+        results.append(result)
+        print("{:<20} {:<28} {:>14,.0f} ops/s {:>12,} B".format(
+            name, json.dumps(params), result["ops_per_sec"], result["peak_memory_bytes"]))
+
+    report = {"python": platform.python_version(), "machine": platform.machine(),
+              "results": results}
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(results, json.load(baseline)["results"], args.tolerance)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
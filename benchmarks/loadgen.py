@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# Load generator for the game server: opens many connections, each playing
+# random turns, and reports the ticks received per second and their
+# lateness (how much later than --interval after the previous one a tick
+# arrived), measured on the client side.
+#
+#   python -m snake.server --interval 0.05 &
+#   python benchmarks/loadgen.py --sessions 2000 --interval 0.05 --duration 20
+#
+# A session whose game ends reconnects at once, keeping the load constant.
+import argparse
+import asyncio
+import json
+import resource
+import sys
+from random import Random
+from typing import Any, Dict, List, Optional
+
+from snake.instrumentation import PhaseStats
+from snake.server import Delta, End, Full, read_message
+
+
+class LoadGenerator:
+    ticks: int
+    games: int
+    errors: int
+    lateness: PhaseStats
+    _stop: Optional[float]
+
+    def __init__(self, host: str, port: int, interval: float, turn_probability: float):
+        self._host = host
+        self._port = port
+        self._interval = interval
+        self._turn_probability = turn_probability
+        self.ticks = 0
+        self.games = 0
+        self.errors = 0
+        self.lateness = PhaseStats()
+        self._stop = None
+
+    def _running(self) -> bool:
+        # Until duration seconds after the last session opened
+        return self._stop is None or asyncio.get_running_loop().time() < self._stop
+
+    async def session(self, rng: Random) -> None:
+        while self._running():
+            try:
+                reader, writer = await asyncio.open_connection(self._host, self._port)
+            except OSError:
+                self.errors += 1
+                await asyncio.sleep(self._interval)
+                continue
+            try:
+                await self._play(reader, writer, rng)
+            except (OSError, asyncio.IncompleteReadError):
+                self.errors += 1
+            finally:
+                writer.close()
+
+    async def _play(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                    rng: Random) -> None:
+        loop = asyncio.get_running_loop()
+        full = await read_message(reader)
+        assert isinstance(full, Full)
+        last = loop.time()
+        while self._running():
+            message = await read_message(reader, full.width)
+            if isinstance(message, End):
+                self.games += 1
+                return
+            assert isinstance(message, Delta)
+            now = loop.time()
+            self.ticks += 1
+            self.lateness.add(max(0, int((now - last - self._interval) * 1e9)))
+            last = now
+            if rng.random() < self._turn_probability:
+                writer.write(bytes((rng.randint(1, 4),)))
+
+    async def run(self, sessions: int, duration: float, ramp_up: float, seed: int) -> None:
+        # Opens the sessions in batches over ramp_up seconds, not to flood
+        # the listen backlog, then only measures at full load
+        loop = asyncio.get_running_loop()
+        tasks: List['asyncio.Future[None]'] = []
+        batches = max(1, int(ramp_up / .01))
+        for batch in range(batches):
+            tasks.extend(asyncio.ensure_future(self.session(Random(seed + session)))
+                         for session in range(batch * sessions // batches,
+                                              (batch + 1) * sessions // batches))
+            await asyncio.sleep(ramp_up / batches)
+        self.ticks = 0
+        self.lateness = PhaseStats()
+        self._stop = loop.time() + duration
+        await asyncio.gather(*tasks)
+
+
+def raise_file_limit() -> None:
+    # Every connection is a file descriptor, the soft limit is often 1024
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load the snake game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=.2,
+                        help="seconds per tick, as given to the server")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds at full load")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="seconds to open the sessions")
+    parser.add_argument("--turn-probability", type=float, default=.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    raise_file_limit()
+    generator = LoadGenerator(args.host, args.port, args.interval, args.turn_probability)
+    asyncio.run(generator.run(args.sessions, args.duration, args.ramp_up, args.seed))
+    lateness = generator.lateness
+    report: Dict[str, Any] = {
+        "sessions": args.sessions,
+        "ticks_per_sec": generator.ticks / args.duration,
+        "games": generator.games,
+        "errors": generator.errors,
+        "lateness_p50_ms": lateness.quantile(.5) / 1e6,
+        "lateness_p99_ms": lateness.quantile(.99) / 1e6,
+        "lateness_max_ms": lateness.max_ns / 1e6,
+    }
+    print(json.dumps(report))
+    return 1 if generator.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,15 @@
+import argparse
+
 if __name__ == "__main__":
-    from snake import Game, PygameUi
+    from snake import Game
+    from snake.timestep import Timestep
+    from snake.ui import get_backend
+
+    parser = argparse.ArgumentParser(description="Play snake.")
+    parser.add_argument("ui", nargs="?", default="pygame", help="pygame or term")
+    parser.add_argument("--speed", type=float, default=5, help="ticks per second")
+    parser.add_argument("--fps", type=float, default=60, help="frames per second, at most")
+    args = parser.parse_args()
 
-    Game(ui=PygameUi(20), size=20).run()
+    Game(ui=get_backend(args.ui)(20, fps=None), size=20,
+         timestep=Timestep(tick_rate=args.speed, fps=args.fps)).run()
@@ -1,2 +1,13 @@
+from typing import Any
+
 from .game import Game
-from .ui.pygame import PygameUi
+
+# UI backends are imported on first use, so that `import snake` only loads
+# the game core: no pygame banner nor SDL initialization when headless.
+
+
+def __getattr__(name: str) -> Any:
+    if name == "PygameUi":
+        from .ui.pygame import PygameUi
+        return PygameUi
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
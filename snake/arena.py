@@ -0,0 +1,155 @@
+from collections import Counter
+from random import Random
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from .direction import Direction
+from .free_cells import FreeCells
+from .game import Board, EggCreator, RandomEggCreator, Snake, SnakeView, egg_picker
+from .topology import Topology
+from .types import Position
+
+# A player gets the arena and the index of its snake, returns its direction
+Player = Callable[['Arena', int], Direction]
+
+HEAD_TO_HEAD = "head-to-head"
+COLLISION = "collision"
+WALL = "wall"
+
+
+class Arena:
+    # Several snakes on one board, all sharing one FreeCells occupancy, so
+    # that a collision test is one lookup whatever the number of snakes and
+    # their length.
+    # Snakes move simultaneously. Each tick is resolved in one pass:
+    # - every snake turns and computes its next head
+    # - the snakes that do not eat drop their tail, freeing the cell
+    # - heads landing on the same cell all die (head-to-head)
+    # - heads landing on a taken cell die (collision), including the cell
+    #   another head is just leaving: it is that snake's neck now; so do
+    #   heads hitting a wall, with a topology that has some
+    # - survivors take their new cell, then dead snakes leave the board
+    # Eggs come from a shared pool of a fixed size, refilled as they are
+    # eaten; every egg eaten scores one point for its snake.
+    _board: Board
+    _free_cells: FreeCells
+    _egg_creator: EggCreator
+    _pick_egg: Callable[[FreeCells], Position]
+    _eggs: Set[Position]
+    _egg_count: int
+    snakes: List[Snake]
+    alive: List[bool]
+    scores: List[int]
+    causes: List[Optional[str]]
+    ticks: int
+
+    def __init__(self,
+                 snakes: Sequence[List[Position]],
+                 size: int = 20,
+                 eggs: int = 1,
+                 egg_creator: Optional[EggCreator] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None,
+                 rng: Optional[Random] = None,
+                 topology: Optional[Topology] = None):
+        if topology is not None:
+            self._board = Board(topology.width, topology.height, topology)
+        else:
+            self._board = Board(width or size, height or size)
+        self._free_cells = self._board.free_cells()
+        self.snakes = [Snake(self._board, list(positions), self._free_cells)
+                       for positions in snakes]
+        self._egg_creator = egg_creator or RandomEggCreator(
+            self._board.width, rng, self._board.height)
+        self._pick_egg = egg_picker(self._egg_creator)
+        self._eggs = set()
+        self._egg_count = eggs
+        self.alive = [True] * len(self.snakes)
+        self.scores = [0] * len(self.snakes)
+        self.causes = [None] * len(self.snakes)
+        self.ticks = 0
+        self._place_eggs()
+
+    @property
+    def board(self) -> Board:
+        return self._board
+
+    @property
+    def free_cells(self) -> FreeCells:
+        return self._free_cells
+
+    @property
+    def eggs(self) -> Set[Position]:
+        return self._eggs
+
+    @property
+    def over(self) -> bool:
+        # Over when at most one snake is left (none, for a single snake)
+        return sum(self.alive) <= (1 if len(self.snakes) > 1 else 0)
+
+    def snake(self, index: int) -> SnakeView:
+        return self.snakes[index].view()
+
+    def step(self, directions: Sequence[Direction]) -> bool:
+        # Plays one tick, directions being indexed like the snakes (dead
+        # ones are ignored); returns False when the arena is over
+        self.ticks += 1
+        moving = [index for index, alive in enumerate(self.alive) if alive]
+        heads: Dict[int, Optional[Position]] = {}
+        for index in moving:
+            snake = self.snakes[index]
+            snake.direction = directions[index]
+            heads[index] = snake.next_head()
+
+        eating = {index for index in moving if heads[index] in self._eggs}
+        for index in moving:
+            if index not in eating:
+                self.snakes[index].drop_tail()
+
+        landings = Counter(heads.values())
+        dead = []
+        for index in moving:
+            head = heads[index]
+            if head is None:
+                dead.append((index, WALL))
+            elif landings[head] > 1:
+                dead.append((index, HEAD_TO_HEAD))
+            elif not self._free_cells.is_free(self._cell(head)):
+                dead.append((index, COLLISION))
+        dying = {index for index, _ in dead}
+
+        for index in moving:
+            if index in dying:
+                continue
+            head = heads[index]
+            assert head is not None
+            self.snakes[index].push_head(head)
+            if index in eating:
+                self.scores[index] += 1
+                self._eggs.discard(head)
+        for index, cause in dead:
+            self.alive[index] = False
+            self.causes[index] = cause
+            self.snakes[index].clear()
+
+        self._place_eggs()
+        return not self.over
+
+    def play(self, players: Sequence[Player], iterations: Optional[int] = None) -> List[int]:
+        # Runs until the arena is over or after iterations ticks, returns the scores
+        while not self.over and iterations != 0:
+            self.step([player(self, index) if self.alive[index] else Direction.DEFAULT
+                       for index, player in enumerate(players)])
+            if iterations:
+                iterations -= 1
+        return self.scores
+
+    def _place_eggs(self) -> None:
+        # Eggs are not in the occupancy (snakes move onto them), so a pick
+        # landing on another egg, or off the free cells, is drawn again
+        while len(self._eggs) < self._egg_count and len(self._free_cells) > len(self._eggs):
+            egg = self._pick_egg(self._free_cells)
+            if egg in self._free_cells and egg not in self._eggs:
+                self._eggs.add(egg)
+
+    def _cell(self, position: Position) -> int:
+        return position[1] * self._board.width + position[0]
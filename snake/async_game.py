@@ -0,0 +1,90 @@
+import asyncio
+from typing import Iterable, List, Optional
+
+from .game import DrawMode, EggCreator, Game, draw_mode_for
+from .types import Position
+from .ui.headless import HeadlessUi
+from .ui.protocol import AsyncUiProtocol
+
+
+class AsyncGame:
+    # Game.run for asyncio: the UI is awaited, and ticks are paced by the
+    # event loop clock instead of blocking, so that one loop can host
+    # hundreds of games (see run_games), each in its own task.
+    # Ticks are due every interval seconds from the start; a game running
+    # late plays its next tick right away but does not burst to catch up.
+    # With interval None, it plays as fast as possible, still yielding to
+    # the other tasks between ticks.
+    _game: Game
+    _ui: AsyncUiProtocol
+    _interval: Optional[float]
+    _iterations: Optional[int]
+
+    def __init__(self,
+                 ui: AsyncUiProtocol,
+                 interval: Optional[float] = .2,
+                 iterations: Optional[int] = None,
+                 size: int = 20,
+                 egg_creator: Optional[EggCreator] = None,
+                 snake: List[Position] = Game.DEFAULT_SNAKE,
+                 draw_mode: DrawMode = DrawMode.COPY,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None):
+        # The wrapped Game is only driven through start and step, it never
+        # calls its own ui: it decides what each frame draws, for this one
+        self._game = Game(ui=HeadlessUi(),
+                          size=size,
+                          egg_creator=egg_creator,
+                          snake=snake,
+                          draw_mode=draw_mode_for(ui, draw_mode),
+                          width=width,
+                          height=height)
+        self._ui = ui
+        self._interval = interval
+        self._iterations = iterations
+
+    @property
+    def game(self) -> Game:
+        return self._game
+
+    async def run(self) -> bool:
+        game = self._game
+        ui = self._ui
+        interval = self._interval
+        iterations = self._iterations
+        loop = asyncio.get_running_loop()
+        game.start()
+        view = game.snake
+        due = loop.time()
+        while True:
+            snake = game._frame(view)
+            if snake is not None:
+                await ui.draw(snake=snake, egg=game.egg)
+            elif game._draw_mode is DrawMode.DELTA:
+                try:
+                    await ui.draw_delta(head=view.head, tail=game.vacated, egg=game.egg)
+                except NotImplementedError:
+                    game._deltas_unsupported()
+                    await ui.draw(snake=view, egg=game.egg)
+
+            if not game.step(await ui.direction()):
+                break
+
+            if iterations:
+                iterations -= 1
+
+            if iterations == 0:
+                break
+
+            if interval is None:
+                await asyncio.sleep(0)
+            else:
+                due = max(due + interval, loop.time())
+                await asyncio.sleep(due - loop.time())
+
+        return not game.lost
+
+
+async def run_games(games: Iterable[AsyncGame]) -> List[bool]:
+    # Runs the games concurrently, returns what each run returned, in order
+    return list(await asyncio.gather(*(game.run() for game in games)))
@@ -0,0 +1,328 @@
+from array import array
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from .direction import TURNS, Direction
+from .game import Snake, SnakeView
+from .types import Position
+from .ui.protocol import UiProtocol
+
+
+class Autopilot(UiProtocol):
+    # Steers the snake on its own, through the UiProtocol: give it to Game
+    # as the ui, optionally wrapping a real ui that it forwards draws to.
+    # It keeps the live SnakeView from the first draw, so run the game with
+    # DrawMode.VIEW or DrawMode.DELTA.
+    #
+    # When the body lies along a Hamiltonian cycle of the board in order
+    # (from the tail, every segment is further along the cycle), the cells
+    # ahead of the head on the cycle, up to the tail, are all free. Any move
+    # that lands there keeps that property, so the snake can never be
+    # trapped: it takes the move getting closest to the egg along the cycle
+    # (a shortcut), and just follows the cycle once it covers
+    # fill_threshold of the board. Whether the body is along the cycle is
+    # tracked tick by tick, from the cells the head and the tail move to.
+    #
+    # A body off the cycle (the starting one, usually) is brought back onto
+    # it: when every body cell ahead of the head on the cycle is left before
+    # the head gets there, the snake follows the cycle until the body lies
+    # along it, one O(1) step per tick.
+    #
+    # Otherwise, each new egg gets a BFS over the torus. The path is only
+    # taken if the tail can still be reached once the egg is eaten (played
+    # on a clone of the snake), and is then followed as long as it stays
+    # valid: one BFS per egg, not per tick. Without a safe path, the snake
+    # chases its tail, until it can get back onto the cycle.
+    _width: int
+    _height: int
+    _ui: Optional[UiProtocol]
+    _snake: Optional[SnakeView]
+    _egg: Optional[Position]
+    _path: Deque[int]
+    _path_egg: Optional[Position]
+    _neighbours: List[array]
+    _orders: List[array]
+    _order: Optional[array]
+    # The cycle direction the snake is getting back onto, if any
+    _realign: Optional[array]
+    # For each cycle direction, the sum of the rank gaps along the body from
+    # the tail to the head: it lies along the cycle when that is < a turn
+    _gaps: List[int]
+    _tracked: Optional[Tuple[int, int]]
+
+    def __init__(self,
+                 width: int,
+                 height: Optional[int] = None,
+                 ui: Optional[UiProtocol] = None,
+                 fill_threshold: float = .5):
+        self._width = width
+        self._height = height or width
+        self._ui = ui
+        self._fill_threshold = fill_threshold
+        self._snake = None
+        self._egg = None
+        self._path = deque()
+        self._path_egg = None
+
+        cells = self._width * self._height
+        # _neighbours[turn][cell]: the cell reached from cell going towards TURNS[turn]
+        self._neighbours = [array('i', (self._neighbour(cell, turn) for cell in range(cells)))
+                            for turn in TURNS]
+        # Rank of every cell along the Hamiltonian cycle, in both directions
+        self._orders = self._hamiltonian_cycles()
+        self._order = None
+        self._realign = None
+        self._gaps = [0] * len(self._orders)
+        self._tracked = None
+        # BFS bookkeeping, reused across searches: a cell is visited by the
+        # current search when _seen[cell] == _stamp, so no clearing is needed
+        self._seen = array('i', [0]) * cells
+        self._parent = array('i', [0]) * cells
+        self._stamp = 0
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        if not isinstance(snake, SnakeView):
+            raise TypeError("Autopilot needs DrawMode.VIEW or DrawMode.DELTA")
+        if snake is not self._snake:
+            self._tracked = None
+            self._order = None
+            self._realign = None
+        self._snake = snake
+        self._egg = egg
+        if self._ui is not None:
+            self._ui.draw(snake=snake, egg=egg)
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        self._egg = egg
+        if self._ui is not None:
+            self._ui.draw_delta(head=head, tail=tail, egg=egg)
+
+    def direction(self) -> Direction:
+        if self._ui is not None:
+            # Still give the wrapped ui a chance to process its events
+            self._ui.direction()
+        if self._snake is None or self._egg is None:
+            return Direction.DEFAULT
+        head = self._cell(self._snake.head)
+        tail = self._cell(self._snake.tail)
+
+        if self._orders:
+            self._track(head, tail)
+            if self._order is None:
+                self._order = self._aligned_order()
+        if self._order is not None:
+            self._realign = None
+            following = self._along_cycle(self._order, head, tail)
+            if following is not None:
+                return self._turn(head, following)
+            self._order = None
+
+        if self._orders and self._realign is None:
+            self._realign = self._realignable(head)
+        if self._realign is not None:
+            following = self._next_on_cycle(self._realign, head)
+            if self._passable(following, tail):
+                self._path.clear()
+                return self._turn(head, following)
+            # Held up by a body cell: the snake grew on the way
+            self._realign = None
+
+        if (self._egg != self._path_egg or not self._path
+                or not self._passable(self._path[0], tail)
+                or self._turn(head, self._path[0]) is Direction.DEFAULT):
+            self._plan(head, tail)
+        if not self._path:
+            return Direction.DEFAULT
+        return self._turn(head, self._path.popleft())
+
+    def _along_cycle(self, order: array, head: int, tail: int) -> Optional[int]:
+        # The next cell when the body lies along the cycle, None if it does not
+        assert self._snake is not None and self._egg is not None
+        cells = len(order)
+        rank = order[head]
+        to_tail = (order[tail] - rank) % cells
+        to_egg = (order[self._cell(self._egg)] - rank) % cells
+        shortcuts = len(self._snake) < self._fill_threshold * cells
+        best = None
+        best_distance = 0
+        for neighbours in self._neighbours:
+            cell = neighbours[head]
+            distance = (order[cell] - rank) % cells
+            if distance == 1 and not shortcuts:
+                return cell
+            if (0 < distance < to_tail and distance <= to_egg and distance > best_distance
+                    and self._snake.is_free(cell)):
+                best = cell
+                best_distance = distance
+        return best
+
+    def _aligned_order(self) -> Optional[array]:
+        # The cycle direction the body lies along, if any: going from the
+        # head to the tail, ranks only go down, for less than a full turn
+        for order, gaps in zip(self._orders, self._gaps):
+            if gaps < len(order):
+                return order
+        return None
+
+    def _realignable(self, head: int) -> Optional[array]:
+        # A cycle direction to follow from the head until the body lies
+        # along it: the body cell k cells from the tail is left after k + 1
+        # ticks, the head should not get there before. O(length).
+        assert self._snake is not None
+        body = [self._cell(position) for position in self._snake]
+        length = len(body)
+        for order in self._orders:
+            cells = len(order)
+            rank = order[head]
+            if all((order[body[index]] - rank) % cells >= length - index
+                   for index in range(1, length)):
+                return order
+        return None
+
+    def _next_on_cycle(self, order: array, head: int) -> int:
+        cells = len(order)
+        rank = order[head]
+        for neighbours in self._neighbours:
+            if (order[neighbours[head]] - rank) % cells == 1:
+                return neighbours[head]
+        raise ValueError("the cycle should go through neighbours")
+
+    def _track(self, head: int, tail: int) -> None:
+        # Updates _gaps with the gap the head opened and the one the tail
+        # closed since the last tick; walks the whole body only when the
+        # snake did not just move one cell (first tick, a new snake)
+        if self._tracked == (head, tail):
+            return
+        if self._tracked is not None:
+            last_head, last_tail = self._tracked
+            up, down, left, right = self._neighbours
+            if (head in (up[last_head], down[last_head], left[last_head], right[last_head])
+                    and (tail == last_tail
+                         or tail in (up[last_tail], down[last_tail], left[last_tail], right[last_tail]))):
+                gaps = self._gaps
+                for index, order in enumerate(self._orders):
+                    cells = len(order)
+                    gaps[index] += (order[head] - order[last_head]) % cells
+                    if tail != last_tail:
+                        gaps[index] -= (order[tail] - order[last_tail]) % cells
+                self._tracked = (head, tail)
+                return
+        assert self._snake is not None
+        body = [self._cell(position) for position in self._snake]
+        for index, order in enumerate(self._orders):
+            cells = len(order)
+            self._gaps[index] = sum((order[front] - order[back]) % cells
+                                    for front, back in zip(body, body[1:]))
+        self._tracked = (head, tail)
+
+    def _plan(self, head: int, tail: int) -> None:
+        assert self._snake is not None and self._egg is not None
+        egg = self._cell(self._egg)
+        self._path_egg = self._egg
+        path = self._bfs(head, egg, tail)
+        if path is not None and self._tail_reachable_after(path):
+            self._path = deque(path)
+            return
+        # No safe way to the egg yet: follow the tail, one step at a time
+        self._path_egg = None
+        path = self._bfs(head, tail, tail)
+        if path:
+            self._path = deque(path[:1])
+            return
+        # Trapped: any free cell, the most open one first
+        snake = self._snake
+        options = [cell for cell in (neighbours[head] for neighbours in self._neighbours)
+                   if self._passable(cell, tail)]
+        options.sort(key=lambda cell: -sum(snake.is_free(neighbours[cell])
+                                           for neighbours in self._neighbours))
+        self._path = deque(options[:1])
+
+    def _tail_reachable_after(self, path: List[int]) -> bool:
+        # Plays the path on a copy of the snake, then looks for its tail
+        assert self._snake is not None and self._egg is not None
+        snake = self._snake.clone()
+        head = self._cell(snake.view().head)
+        try:
+            for cell in path:
+                snake.make_move(self._turn(head, cell), self._egg)
+                head = cell
+        except Snake.BitesItselfError:
+            return False
+        if snake.fills_board():
+            return True
+        view = snake.view()
+        tail = self._cell(view.tail)
+        return self._bfs(head, tail, tail, view) is not None
+
+    def _bfs(self, start: int, goal: int, tail: int,
+             snake: Optional[SnakeView] = None) -> Optional[List[int]]:
+        # Shortest path from start to goal, excluding start. The tail cell
+        # counts as free, as it moves out of the way on the next tick.
+        view = snake if snake is not None else self._snake
+        assert view is not None
+        is_free = view.is_free
+        self._stamp += 1
+        stamp = self._stamp
+        seen = self._seen
+        parent = self._parent
+        neighbours = self._neighbours
+        seen[start] = stamp
+        queue = deque((start,))
+        while queue:
+            cell = queue.popleft()
+            for table in neighbours:
+                following = table[cell]
+                if seen[following] == stamp:
+                    continue
+                if following == goal:
+                    parent[following] = cell
+                    path = [following]
+                    while parent[path[-1]] != start:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return path
+                if is_free(following) or following == tail:
+                    seen[following] = stamp
+                    parent[following] = cell
+                    queue.append(following)
+        return None
+
+    def _passable(self, cell: int, tail: int) -> bool:
+        assert self._snake is not None
+        return self._snake.is_free(cell) or cell == tail
+
+    def _turn(self, head: int, cell: int) -> Direction:
+        for turn, neighbours in zip(TURNS, self._neighbours):
+            if neighbours[head] == cell:
+                return turn
+        return Direction.DEFAULT
+
+    def _neighbour(self, cell: int, turn: Direction) -> int:
+        x = (cell % self._width + turn.x) % self._width
+        y = (cell // self._width + turn.y) % self._height
+        return y * self._width + x
+
+    def _cell(self, position: Position) -> int:
+        return position[1] * self._width + position[0]
+
+    def _hamiltonian_cycles(self) -> List[array]:
+        # A cycle through the whole board: along row 0, then back and forth
+        # over the other rows without column 0, and up column 0. With an
+        # odd number of rows, the last row ends on the right edge and wraps
+        # around to column 0, so any torus has one (but a single column).
+        # Returns the rank of every cell, going each way round.
+        width, height = self._width, self._height
+        if width < 2:
+            return []
+        path = [(x, 0) for x in range(width)]
+        for y in range(1, height):
+            columns = range(width - 1, 0, -1) if y % 2 == 1 else range(1, width)
+            path.extend((x, y) for x in columns)
+        path.extend((0, y) for y in range(height - 1, 0, -1))
+        cells = len(path)
+        forward = array('i', [0]) * cells
+        backward = array('i', [0]) * cells
+        for rank, position in enumerate(path):
+            forward[self._cell(position)] = rank
+            backward[self._cell(position)] = cells - 1 - rank
+        return [forward, backward]
@@ -0,0 +1,151 @@
+from typing import List, Optional, Sequence
+
+import numpy as np  # type: ignore
+
+from .direction import Direction
+from .game import Board, Game, Snake
+from .types import Position
+
+# Actions are Direction values (UP=1 ... DEFAULT=5); 0 behaves like None
+# and keeps the current direction, like any value outside [1, 4].
+_DX = np.array([0, 0, 0, -1, 1, 0, 0, 0], dtype=np.int64)
+_DY = np.array([0, -1, 1, 0, 0, 0, 0, 0], dtype=np.int64)
+_OPPOSITE = np.array([0, 2, 1, 4, 3, 0, 0, 0], dtype=np.int64)
+
+
+class BatchGame:
+    # N independent games stepped together with NumPy.
+    # Each game keeps its body as a ring buffer of cell indices
+    # (y * width + x): head points at the head slot, and the tail sits
+    # length - 1 slots behind it. The occupancy planes mirror the body
+    # so that self-bites are a single gather per tick.
+    _board: Board
+    _snake: List[Position]
+    _rng: 'np.random.Generator'
+
+    def __init__(self,
+                 games: int,
+                 size: int = 20,
+                 snake: List[Position] = Game.DEFAULT_SNAKE,
+                 seed: Optional[int] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None):
+        if len(snake) < 2:
+            raise Exception("snake should have a length of at least 2")
+        self._board = Board(width or size, height or size)
+        self._snake = list(snake)
+        self._rng = np.random.default_rng(seed)
+
+        cells = self._board.size
+        self.body = np.zeros((games, cells), dtype=np.int32)
+        self.head = np.zeros(games, dtype=np.int64)
+        self.length = np.zeros(games, dtype=np.int64)
+        self.occupancy = np.zeros((games, cells), dtype=bool)
+        self.egg = np.zeros(games, dtype=np.int64)
+        self.direction = np.zeros(games, dtype=np.int64)
+        self.alive = np.zeros(games, dtype=bool)
+        self.won = np.zeros(games, dtype=bool)
+        self.ticks = np.zeros(games, dtype=np.int64)
+        self.reset()
+
+    @property
+    def games(self) -> int:
+        return len(self.head)
+
+    @property
+    def running(self) -> 'np.ndarray':
+        return self.alive & ~self.won
+
+    @property
+    def grid(self) -> 'np.ndarray':
+        # (games, height, width) view on the occupancy planes, not a copy
+        return self.occupancy.reshape(self.games, self._board.height, self._board.width)
+
+    def reset(self, games: Optional[Sequence[int]] = None) -> None:
+        rows = np.arange(self.games) if games is None else np.asarray(games, dtype=np.int64)
+        if len(rows) == 0:
+            return
+        width = self._board.width
+        # Body is stored tail first, so that the head ends up in the last slot
+        cells = np.array([y * width + x for (x, y) in reversed(self._snake)])
+        self.body[rows] = 0
+        self.body[rows, :len(cells)] = cells
+        self.head[rows] = len(cells) - 1
+        self.length[rows] = len(cells)
+        self.occupancy[rows] = False
+        self.occupancy[np.ix_(rows, cells)] = True
+        self.direction[rows] = Snake(self._board, list(self._snake)).direction.value
+        self.alive[rows] = True
+        self.won[rows] = len(cells) == self._board.size
+        self.ticks[rows] = 0
+        self._place_eggs(rows[~self.won[rows]])
+
+    def step(self, actions: Sequence[int]) -> 'np.ndarray':
+        # Advances every running game by one tick, with the same rules as
+        # Game.run. Returns the mask of games that ended during this tick.
+        action = np.asarray(actions, dtype=np.int64)
+        rows = np.flatnonzero(self.running)
+        if len(rows) == 0:
+            return np.zeros(self.games, dtype=bool)
+
+        width = self._board.width
+        height = self._board.height
+        cells = self._board.size
+
+        action = action[rows]
+        direction = self.direction[rows]
+        turns = (action >= 1) & (action <= 4) & (action != _OPPOSITE[direction])
+        direction = np.where(turns, action, direction)
+        self.direction[rows] = direction
+
+        head = self.head[rows]
+        head_cell = self.body[rows, head]
+        new_x = (head_cell % width + _DX[direction]) % width
+        new_y = (head_cell // width + _DY[direction]) % height
+        new_head = new_y * width + new_x
+
+        eaten = new_head == self.egg[rows]
+        tail = self.body[rows, (head - self.length[rows] + 1) % cells]
+        # Moving onto the tail is fine, unless the tail stays because we grow
+        bites = self.occupancy[rows, new_head] & ~((new_head == tail) & ~eaten)
+
+        moves = ~bites
+        moving = rows[moves]
+        eaten = eaten[moves]
+        new_head = new_head[moves]
+        shrinking = ~eaten
+        self.occupancy[moving[shrinking], tail[moves][shrinking]] = False
+        slot = (head[moves] + 1) % cells
+        self.body[moving, slot] = new_head
+        self.head[moving] = slot
+        self.occupancy[moving, new_head] = True
+        self.length[moving] += eaten
+
+        self.alive[rows[bites]] = False
+        filled = self.length[moving] == cells
+        self.won[moving[filled]] = True
+        self.ticks[rows] += 1
+        self._place_eggs(moving[eaten & ~filled])
+
+        ended = np.zeros(self.games, dtype=bool)
+        ended[rows[bites]] = True
+        ended[moving[filled]] = True
+        return ended
+
+    def positions(self, game: int) -> List[Position]:
+        width = self._board.width
+        slots = (self.head[game] - np.arange(self.length[game])) % self._board.size
+        return [(int(cell % width), int(cell // width)) for cell in self.body[game, slots]]
+
+    def egg_position(self, game: int) -> Position:
+        egg = int(self.egg[game])
+        return (egg % self._board.width, egg // self._board.width)
+
+    def _place_eggs(self, rows: 'np.ndarray') -> None:
+        # Uniform pick among the free cells: draw a rank k in [0, free) and
+        # take the k-th free cell of each board in one vectorized pass
+        if len(rows) == 0:
+            return
+        free = ~self.occupancy[rows]
+        rank = self._rng.integers(0, free.sum(axis=1))
+        self.egg[rows] = (np.cumsum(free, axis=1) > rank[:, None]).argmax(axis=1)
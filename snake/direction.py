@@ -43,3 +43,15 @@ class Direction(Enum):
         else:
             raise ValueError(
                 "Invalid delta for direction, x and y should be integers in [-1, 0, 1]")
+
+
+# The four turns a snake can take, and the one it cannot take from each
+TURNS = [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]
+OPPOSITES = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
+# (x, y) of every turn, without the property calls
+DELTAS = {turn: (turn.x, turn.y) for turn in TURNS}
@@ -0,0 +1,216 @@
+from random import Random
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+from .batch import BatchGame
+from .direction import Direction
+from .game import DrawMode, Game, RandomEggCreator
+from .types import Position
+from .ui.headless import HeadlessUi
+
+# Gym-style environments for training agents: the caller owns the loop,
+# calling reset then step(action) until done.
+#
+# Observations are int8 grids of (height, width) cells holding EMPTY, BODY,
+# HEAD or EGG. Each environment keeps one grid up to date in place, only
+# rewriting the handful of cells a tick changes, and every call returns a
+# read-only view on it: keep a copy if you need an observation to outlive
+# the next step.
+#
+# Actions are Direction values (UP=1 ... RIGHT=4); any other value keeps
+# the current direction, as does going back.
+
+EMPTY = 0
+BODY = 1
+HEAD = 2
+EGG = 3
+
+REWARD_EGG = 1.0
+REWARD_DEATH = -1.0
+
+Info = Dict[str, Any]
+
+
+class SnakeEnv:
+    # One game, played through Game.step.
+    _width: int
+    _height: int
+    _snake: List[Position]
+    _max_ticks: Optional[int]
+    _rng: Random
+    _game: Game
+    _grid: 'np.ndarray'
+    _observation: 'np.ndarray'
+
+    def __init__(self,
+                 size: int = 20,
+                 snake: List[Position] = Game.DEFAULT_SNAKE,
+                 max_ticks: Optional[int] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None):
+        self._width = width or size
+        self._height = height or size
+        self._snake = list(snake)
+        self._max_ticks = max_ticks
+        self._rng = Random()
+        self._grid = np.zeros((self._height, self._width), dtype=np.int8)
+        self._observation = self._grid.view()
+        self._observation.flags.writeable = False
+        self.reset()
+
+    @property
+    def game(self) -> Game:
+        return self._game
+
+    @property
+    def observation(self) -> 'np.ndarray':
+        return self._observation
+
+    def reset(self, seed: Optional[int] = None) -> 'np.ndarray':
+        # Without a seed, eggs keep coming from the previous random stream
+        if seed is not None:
+            self._rng = Random(seed)
+        self._game = Game(ui=HeadlessUi(),
+                          width=self._width,
+                          height=self._height,
+                          egg_creator=RandomEggCreator(self._width, self._rng, self._height),
+                          snake=self._snake,
+                          draw_mode=DrawMode.SKIP)
+        self._game.start()
+        grid = self._grid
+        grid[:] = EMPTY
+        for x, y in self._game.snake:
+            grid[y, x] = BODY
+        self._set(self._game.snake.head, HEAD)
+        self._set(self._game.egg, EGG)
+        return self._observation
+
+    def step(self, action: int) -> Tuple['np.ndarray', float, bool, Info]:
+        game = self._game
+        if game.won or game.lost:
+            raise ValueError("the game is over, call reset")
+        snake = game.snake
+        head, tail, egg, length = snake.head, snake.tail, game.egg, len(snake)
+        direction = Direction(action) if 1 <= action <= 4 else Direction.DEFAULT
+
+        playing = game.step(direction)
+
+        # Only these cells can change: the old tail, head and egg, then the
+        # new head and egg (the egg is never under the snake)
+        for cell in (tail, head, egg):
+            self._set(cell, BODY if cell in snake else EMPTY)
+        self._set(snake.head, HEAD)
+        if playing:
+            self._set(game.egg, EGG)
+
+        reward = REWARD_DEATH if game.lost else REWARD_EGG * (len(snake) - length)
+        truncated = self._max_ticks is not None and game.ticks >= self._max_ticks
+        info = {"won": game.won, "ticks": game.ticks, "length": len(snake),
+                "truncated": truncated and playing}
+        return self._observation, reward, not playing or truncated, info
+
+    def _set(self, position: Position, value: int) -> None:
+        self._grid[position[1], position[0]] = value
+
+
+class VectorEnv:
+    # K games stepped together on a BatchGame, with auto-reset: a game that
+    # ends is reset within the same step, so the observation returned for
+    # it is the first of its next episode, and info holds how the previous
+    # one ended. NumPy runs on one core: to use them all, run one VectorEnv
+    # per worker process.
+    _batch: BatchGame
+    _max_ticks: Optional[int]
+    _grids: 'np.ndarray'
+    _cells: 'np.ndarray'
+    _observations: 'np.ndarray'
+    _games: 'np.ndarray'
+
+    def __init__(self,
+                 envs: int,
+                 size: int = 20,
+                 snake: List[Position] = Game.DEFAULT_SNAKE,
+                 seed: Optional[int] = None,
+                 max_ticks: Optional[int] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None):
+        self._width = width or size
+        self._height = height or size
+        self._snake = list(snake)
+        self._max_ticks = max_ticks
+        self._batch = BatchGame(envs, snake=self._snake, seed=seed,
+                                width=self._width, height=self._height)
+        self._grids = np.zeros((envs, self._height, self._width), dtype=np.int8)
+        # Flat (envs, cells) view on the same memory, indexed like BatchGame
+        self._cells = self._grids.reshape(envs, -1)
+        self._observations = self._grids.view()
+        self._observations.flags.writeable = False
+        self._games = np.arange(envs)
+        self._redraw(self._games)
+
+    @property
+    def envs(self) -> int:
+        return len(self._games)
+
+    @property
+    def batch(self) -> BatchGame:
+        return self._batch
+
+    @property
+    def observations(self) -> 'np.ndarray':
+        return self._observations
+
+    def reset(self, seed: Optional[int] = None) -> 'np.ndarray':
+        if seed is not None:
+            self._batch = BatchGame(self.envs, snake=self._snake, seed=seed,
+                                    width=self._width, height=self._height)
+        else:
+            self._batch.reset()
+        self._redraw(self._games)
+        return self._observations
+
+    def step(self, actions: Any) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray', Info]:
+        batch = self._batch
+        games = self._games
+        cells = self._cells
+        size = cells.shape[1]
+        head = batch.body[games, batch.head]
+        tail = batch.body[games, (batch.head - batch.length + 1) % size]
+        egg = batch.egg.copy()
+        length = batch.length.copy()
+
+        ended = batch.step(actions)
+
+        # Same cells as SnakeEnv.step, for all the games at once
+        occupancy = batch.occupancy
+        for cell in (tail, head, egg):
+            cells[games, cell] = occupancy[games, cell]
+        cells[games, batch.body[games, batch.head]] = HEAD
+        playing = batch.running
+        cells[games[playing], batch.egg[playing]] = EGG
+
+        rewards = REWARD_EGG * (batch.length - length).astype(np.float32)
+        lost = ended & ~batch.alive
+        rewards[lost] = REWARD_DEATH
+        truncated = np.zeros(self.envs, dtype=bool)
+        if self._max_ticks is not None:
+            truncated = playing & (batch.ticks >= self._max_ticks)
+        dones = ended | truncated
+        info = {"won": batch.won & dones, "lost": lost, "truncated": truncated,
+                "ticks": np.where(dones, batch.ticks, 0),
+                "length": np.where(dones, batch.length, 0)}
+
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            batch.reset(list(finished))
+            self._redraw(finished)
+        return self._observations, rewards, dones, info
+
+    def _redraw(self, games: 'np.ndarray') -> None:
+        batch = self._batch
+        cells = self._cells
+        cells[games] = batch.occupancy[games]
+        cells[games, batch.body[games, batch.head[games]]] = HEAD
+        playing = games[batch.running[games]]
+        cells[playing, batch.egg[playing]] = EGG
@@ -0,0 +1,138 @@
+from array import array
+from random import Random, randrange
+from typing import Iterator, Optional
+
+from .types import Position
+
+
+class FreeCells:
+    # Set of the board cells not covered by the snake, cells being
+    # numbered y * width + x.
+    # Occupancy is a bitset, one bit per cell, so that membership is O(1)
+    # and a 4096x4096 board takes 2MB. Uniform picks use rejection sampling
+    # while at least half of the board is free (at most 2 draws expected).
+    # Past that, a dense array of the free cells is built once, with _slots
+    # mapping every cell to its index in it (-1 when taken), and kept up to
+    # date from then on: add / remove (swap-remove) and picks stay O(1).
+    # That index costs 4 bytes per cell plus 4 per free cell: up to 96MB
+    # more on a 4096x4096 board, only for games that fill half of it.
+    __slots__ = ('_width', '_height', '_taken', '_free', '_cells', '_slots')
+    _width: int
+    _height: int
+    _taken: bytearray
+    _free: int
+    _cells: Optional[array]
+    _slots: Optional[array]
+
+    def __init__(self, width: int, height: int):
+        self._width = width
+        self._height = height
+        self._taken = bytearray((width * height + 7) // 8)
+        self._free = width * height
+        self._cells = None
+        self._slots = None
+
+    def clone(self) -> 'FreeCells':
+        clone = FreeCells.__new__(FreeCells)
+        clone._width = self._width
+        clone._height = self._height
+        clone._taken = self._taken[:]
+        clone._free = self._free
+        clone._cells = self._cells[:] if self._cells is not None else None
+        clone._slots = self._slots[:] if self._slots is not None else None
+        return clone
+
+    def add(self, position: Position) -> None:
+        self.release(self._cell(position))
+
+    def remove(self, position: Position) -> None:
+        self.take(self._cell(position))
+
+    def release(self, cell: int) -> None:
+        mask = 1 << (cell & 7)
+        if not self._taken[cell >> 3] & mask:
+            return
+        self._taken[cell >> 3] ^= mask
+        self._free += 1
+        if self._cells is not None and self._slots is not None:
+            self._slots[cell] = len(self._cells)
+            self._cells.append(cell)
+
+    def take(self, cell: int) -> bool:
+        # Marks the cell as taken, returns False if it already was
+        mask = 1 << (cell & 7)
+        if self._taken[cell >> 3] & mask:
+            return False
+        self._taken[cell >> 3] |= mask
+        self._free -= 1
+        if self._cells is not None and self._slots is not None:
+            slot = self._slots[cell]
+            last = self._cells.pop()
+            if last != cell:
+                self._cells[slot] = last
+                self._slots[last] = slot
+            self._slots[cell] = -1
+        return True
+
+    def is_free(self, cell: int) -> bool:
+        return not self._taken[cell >> 3] & (1 << (cell & 7))
+
+    def choice(self, rng: Optional[Random] = None) -> Position:
+        if not self._free:
+            raise IndexError("no free cell left on the board")
+        pick = rng.randrange if rng else randrange
+        if self._cells is None:
+            size = self._width * self._height
+            if 2 * self._free >= size:
+                while True:
+                    cell = pick(size)
+                    if self.is_free(cell):
+                        return self._position(cell)
+            self._index()
+        assert self._cells is not None
+        return self._position(self._cells[pick(len(self._cells))])
+
+    def index_order(self) -> Optional[array]:
+        # A copy of the free cells in index order, None until it is built:
+        # picks from the same RNG state depend on it
+        return self._cells[:] if self._cells is not None else None
+
+    def restore_index(self, cells: array) -> None:
+        # Builds the index in the order index_order gave, for the same cells
+        slots = array('i', [-1]) * (self._width * self._height)
+        for slot, cell in enumerate(cells):
+            slots[cell] = slot
+        self._cells = cells[:]
+        self._slots = slots
+
+    def _index(self) -> None:
+        cells = array('i', (cell for cell in range(self._width * self._height)
+                            if self.is_free(cell)))
+        slots = array('i', [-1]) * (self._width * self._height)
+        for slot, cell in enumerate(cells):
+            slots[cell] = slot
+        self._cells = cells
+        self._slots = slots
+
+    def _cell(self, position: Position) -> int:
+        return position[1] * self._width + position[0]
+
+    def _position(self, cell: int) -> Position:
+        return (cell % self._width, cell // self._width)
+
+    def __len__(self) -> int:
+        return self._free
+
+    def __contains__(self, position: object) -> bool:
+        if not isinstance(position, (tuple, list)) or len(position) != 2:
+            return False
+        x, y = position
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return False
+        return self.is_free(y * self._width + x)
+
+    def __iter__(self) -> Iterator[Position]:
+        if self._cells is not None:
+            return (self._position(cell) for cell in self._cells)
+        return (self._position(cell) for cell in range(self._width * self._height)
+                if self.is_free(cell))
@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from random import Random
+from time import perf_counter
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .direction import DELTAS, OPPOSITES, TURNS, Direction
+from .game import DrawMode, Game, RandomEggCreator
+from .topology import Topology
+from .types import Position
+from .ui.headless import HeadlessUi
+
+# Invariant fuzzing of the game engine: seeded games on random input, with
+# every tick checked against an independent model of what must happen.
+# A failing input is shrunk to a minimal one and saved as a reproducer,
+# which replays on its own:
+#
+#   python -m snake.fuzz --seeds 1000 --ticks 10000 --workers 8 --out failures
+#   python -m snake.fuzz --reproduce failures/seed-42.json
+
+
+class InvariantError(Exception):
+    # kind names the invariant, to tell failures apart whatever the tick
+    def __init__(self, kind: str, tick: int, message: str):
+        super().__init__("tick {}: {}: {}".format(tick, kind, message))
+        self.kind = kind
+        self.tick = tick
+
+
+class Checker:
+    # Plays ticks on a started game, then checks the outcome against its own
+    # model of the snake: a deque of the body and a set of its cells, moved
+    # one cell per tick like the game's, so that a check costs the same
+    # whatever the length of the snake and the size of the board.
+    # Invariants: reverse turns are ignored; the head moves one cell,
+    # wrapping around the edges (or per the topology); the snake grows by
+    # one on eggs only, otherwise its tail leaves; it dies exactly when
+    # its head hits its body or a wall; body cells are unique and taken in
+    # the occupancy; the egg is never on the body, and only moves when eaten.
+    _game: Game
+    _body: Deque[Position]
+    _cells: Set[Position]
+    ticks: int
+
+    def __init__(self, game: Game):
+        self._game = game
+        board = game.board
+        self._width = board.width
+        self._height = board.height
+        self._topology: Optional[Topology] = board.topology
+        self._playable = board.playable
+        self._body = deque(game.snake)
+        self._cells = set(self._body)
+        self.ticks = game.ticks
+        if len(self._cells) != len(self._body):
+            self._fail("unique-body", "the snake starts on itself")
+
+    def step(self, direction: Direction) -> bool:
+        # Plays one tick, returns False when the game is over
+        game = self._game
+        snake = game.snake
+        body = self._body
+        cells = self._cells
+        egg = game.egg
+        self.ticks += 1
+
+        heading = snake.direction
+        if direction is Direction.DEFAULT or direction is OPPOSITES[heading]:
+            expected_direction = heading
+        else:
+            expected_direction = direction
+        head = self._neighbour(body[0], expected_direction)
+        eats = head == egg
+
+        playing = game.step(direction)
+        if snake.direction is not expected_direction:
+            self._fail("reverse-turn" if direction is OPPOSITES[heading] else "turn",
+                       "asked {}, heading {}, went {}".format(
+                           direction.name, heading.name, snake.direction.name))
+
+        tail = None
+        if not eats:
+            tail = body.pop()
+            cells.discard(tail)
+        if head is None or head in cells:
+            if playing or not game.lost:
+                self._fail("death", "the snake went on from {} to {}".format(body[0], head))
+            return False
+        if game.lost:
+            self._fail("death", "the snake died going from {} to {}".format(body[0], head))
+        body.appendleft(head)
+        cells.add(head)
+
+        if snake.head != head:
+            self._fail("move", "head on {}, expected {}".format(snake.head, head))
+        if len(snake) != len(body):
+            self._fail("growth", "length {}, expected {}{}".format(
+                len(snake), len(body), " (egg eaten)" if eats else ""))
+        if game.vacated != tail:
+            self._fail("growth", "tail left {}, expected {}".format(game.vacated, tail))
+        if snake.tail != body[-1]:
+            self._fail("growth", "tail on {}, expected {}".format(snake.tail, body[-1]))
+        if snake.is_free(self._cell(head)):
+            self._fail("occupancy", "head cell {} is free".format(head))
+        if tail is not None and tail not in cells and not snake.is_free(self._cell(tail)):
+            self._fail("occupancy", "vacated cell {} is still taken".format(tail))
+
+        if len(body) == self._playable:
+            if playing or not game.won:
+                self._fail("win", "the snake fills the board, the game goes on")
+            return False
+        if not playing:
+            self._fail("death", "the game ended with no reason")
+        if game.egg in cells:
+            self._fail("egg", "egg on the body at {}".format(game.egg))
+        if not eats and game.egg != egg:
+            self._fail("egg", "egg moved from {} to {} without being eaten".format(egg, game.egg))
+        return True
+
+    def _neighbour(self, position: Position, direction: Direction) -> Optional[Position]:
+        if self._topology is not None:
+            return self._topology.neighbour(position, direction)
+        x, y = DELTAS[direction]
+        return ((position[0] + x) % self._width, (position[1] + y) % self._height)
+
+    def _cell(self, position: Position) -> int:
+        return position[1] * self._width + position[0]
+
+    def _fail(self, kind: str, message: str) -> None:
+        raise InvariantError(kind, self.ticks, message)
+
+
+@dataclass(frozen=True)
+class Failure:
+    # Everything needed to replay a failing game: eggs come from
+    # RandomEggCreator with Random(seed), the input is directions
+    seed: int
+    width: int
+    height: int
+    snake: Tuple[Position, ...]
+    directions: Tuple[Direction, ...]
+    kind: str
+    message: str
+
+    def replay(self) -> Optional[InvariantError]:
+        return run_case(self.seed, self.directions, self.width, self.height, self.snake)[1]
+
+    def save(self, path: str) -> None:
+        data = asdict(self)
+        data["directions"] = [direction.name for direction in self.directions]
+        with open(path, "w") as out:
+            json.dump(data, out, indent=1)
+
+    @staticmethod
+    def load(path: str) -> 'Failure':
+        with open(path) as source:
+            data = json.load(source)
+        return Failure(seed=data["seed"],
+                       width=data["width"],
+                       height=data["height"],
+                       snake=tuple((x, y) for x, y in data["snake"]),
+                       directions=tuple(Direction[name] for name in data["directions"]),
+                       kind=data["kind"],
+                       message=data["message"])
+
+
+def run_case(seed: int,
+             directions: Iterable[Direction],
+             width: int,
+             height: int,
+             snake: Sequence[Position] = Game.DEFAULT_SNAKE) -> Tuple[int, Optional[InvariantError]]:
+    # Plays directions until the game is over; returns the ticks played and
+    # the broken invariant, if any. The engine raising counts as one.
+    game = Game(ui=HeadlessUi(),
+                egg_creator=RandomEggCreator(width, Random(seed), height),
+                snake=list(snake),
+                draw_mode=DrawMode.SKIP,
+                width=width,
+                height=height)
+    game.start()
+    checker = Checker(game)
+    try:
+        for direction in directions:
+            if not checker.step(direction):
+                break
+    except InvariantError as error:
+        return checker.ticks, error
+    except Exception as error:
+        return checker.ticks, InvariantError("crash", checker.ticks, repr(error))
+    return checker.ticks, None
+
+
+def random_directions(rng: Random, turn_rate: float) -> Iterator[Direction]:
+    # Mostly going straight, so that the snake lives and grows
+    while True:
+        if rng.random() < turn_rate:
+            yield rng.choice(TURNS)
+        else:
+            yield Direction.DEFAULT
+
+
+def fuzz(seed: int,
+         ticks: int = 10000,
+         size: int = 10,
+         turn_rate: float = .2,
+         width: Optional[int] = None,
+         height: Optional[int] = None,
+         snake: Sequence[Position] = Game.DEFAULT_SNAKE) -> Tuple[int, Optional[Failure]]:
+    # One game of at most ticks ticks; returns the ticks played and the
+    # failure found, not minimized
+    width = width or size
+    height = height or size
+    rng = Random(2 * seed + 1)
+    directions: List[Direction] = []
+    source = random_directions(rng, turn_rate)
+
+    def recorded() -> Iterator[Direction]:
+        for _ in range(ticks):
+            direction = next(source)
+            directions.append(direction)
+            yield direction
+
+    played, error = run_case(seed, recorded(), width, height, snake)
+    if error is None:
+        return played, None
+    return played, Failure(seed, width, height, tuple(snake), tuple(directions[:error.tick]),
+                           error.kind, str(error))
+
+
+def minimize(failure: Failure) -> Failure:
+    # Delta debugging: drops chunks of the input, halving their size, as
+    # long as the same invariant still breaks; then straightens the turns
+    # that are not needed. Eggs keep coming from the same seed.
+    def fails(directions: Sequence[Direction]) -> Optional[InvariantError]:
+        error = run_case(failure.seed, directions, failure.width, failure.height, failure.snake)[1]
+        return error if error is not None and error.kind == failure.kind else None
+
+    directions = list(failure.directions)
+    error = fails(directions)
+    if error is None:
+        return failure
+    chunk = max(len(directions) // 2, 1)
+    while chunk >= 1:
+        start = 0
+        while start < len(directions):
+            candidate = directions[:start] + directions[start + chunk:]
+            found = fails(candidate) if candidate else None
+            if found is not None:
+                directions, error = candidate[:found.tick], found
+            else:
+                start += chunk
+        chunk //= 2
+    for index, direction in enumerate(directions):
+        if direction is not Direction.DEFAULT:
+            candidate = directions[:index] + [Direction.DEFAULT] + directions[index + 1:]
+            found = fails(candidate)
+            if found is not None:
+                directions, error = candidate, found
+    return Failure(failure.seed, failure.width, failure.height, failure.snake,
+                   tuple(directions[:error.tick]), error.kind, str(error))
+
+
+def _fuzz_chunk(args: Tuple[List[int], int, int, float]) -> Tuple[int, List[Failure]]:
+    seeds, ticks, size, turn_rate = args
+    total = 0
+    failures = []
+    for seed in seeds:
+        played, failure = fuzz(seed, ticks, size, turn_rate)
+        total += played
+        if failure is not None:
+            failures.append(minimize(failure))
+    return total, failures
+
+
+def fuzz_many(seeds: Iterable[int],
+              ticks: int = 10000,
+              size: int = 10,
+              turn_rate: float = .2,
+              workers: int = 1,
+              chunk_size: int = 16) -> Dict[str, Any]:
+    # Fuzzes every seed, minimizes the failures in the workers
+    seeds = list(seeds)
+    tasks = [(seeds[start:start + chunk_size], ticks, size, turn_rate)
+             for start in range(0, len(seeds), chunk_size)]
+    started = perf_counter()
+    if workers <= 1:
+        results = [_fuzz_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_fuzz_chunk, tasks))
+    elapsed = perf_counter() - started
+    total = sum(played for played, _ in results)
+    return {
+        "games": len(seeds),
+        "ticks": total,
+        "ticks_per_s": total / elapsed if elapsed else 0.0,
+        "failures": [failure for _, failures in results for failure in failures],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fuzz the game engine against its invariants.")
+    parser.add_argument("--seeds", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=10000, help="at most, per game")
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--turn-rate", type=float, default=.2)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default=".", help="where to save the reproducers")
+    parser.add_argument("--reproduce", help="replay a saved reproducer instead")
+    args = parser.parse_args(argv)
+
+    if args.reproduce:
+        error = Failure.load(args.reproduce).replay()
+        print(error if error is not None else "no failure")
+        return 1 if error is not None else 0
+
+    report = fuzz_many(range(args.seeds), args.ticks, args.size, args.turn_rate, args.workers)
+    failures: List[Failure] = report.pop("failures")
+    if failures:
+        os.makedirs(args.out, exist_ok=True)
+    for failure in failures:
+        path = os.path.join(args.out, "seed-{}.json".format(failure.seed))
+        failure.save(path)
+        print("{}: {} ({} ticks)".format(path, failure.message, len(failure.directions)))
+    report["failures"] = len(failures)
+    print(json.dumps(report))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,64 +1,154 @@
-from dataclasses import dataclass
-from random import randint
-from typing import Tuple, List, Optional, Protocol, Iterator
+import inspect
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from random import Random, randint
+from typing import TYPE_CHECKING, Callable, Deque, Iterable, Tuple, List, Optional, Protocol, Iterator
 from enum import Enum
+from functools import partial
+from time import perf_counter_ns, sleep
 from .types import Position
-from .direction import Direction
+from .direction import OPPOSITES, TURNS, Direction
+from .free_cells import FreeCells
+from .instrumentation import Instrumentation, Phase
+from .timestep import Timestep, TimestepStats
+from .topology import Topology
 from .ui.protocol import UiProtocol
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .state import GameState
+
 
 class EggCreator(Protocol):
+    # create may also take the free cells of the board, to pick among them:
+    # create(free_cells). Creators without it still work, their picks are
+    # drawn again until one lands on a free cell.
     def create(self) -> Position:
         raise NotImplementedError()
 
 
+def egg_picker(egg_creator: EggCreator) -> Callable[[FreeCells], Position]:
+    # egg_creator.create, given the free cells only when it takes them
+    create: Callable[..., Position] = egg_creator.create
+    try:
+        takes_free_cells = bool(inspect.signature(create).parameters)
+    except (TypeError, ValueError):
+        takes_free_cells = True
+    if takes_free_cells:
+        return create
+    return lambda free_cells: create()
+
+
 class RandomEggCreator():
-    def __init__(self, size: int):
-        self._size = size
+    def __init__(self, width: int, rng: Optional[Random] = None, height: Optional[int] = None):
+        self._width = width
+        self._height = height or width
+        self._rng = rng
 
-    def create(self) -> Position:
-        return (randint(0, self._size - 1), randint(0, self._size - 1))
+    def create(self, free_cells: Optional[FreeCells] = None) -> Position:
+        if free_cells is not None:
+            return free_cells.choice(self._rng)
+        if self._rng:
+            return (self._rng.randint(0, self._width - 1), self._rng.randint(0, self._height - 1))
+        return (randint(0, self._width - 1), randint(0, self._height - 1))
 
 
 @dataclass(frozen=True)
 class Board:
     width: int
     height: int
+    # None is a plain torus, computed without tables
+    topology: Optional[Topology] = None
 
     @property
     def size(self) -> int:
         return self.width * self.height
 
+    @property
+    def playable(self) -> int:
+        return self.topology.playable if self.topology is not None else self.size
+
+    def free_cells(self) -> FreeCells:
+        # All the cells a snake can be on, obstacles excluded
+        free_cells = FreeCells(self.width, self.height)
+        if self.topology is not None:
+            for position in self.topology.obstacles:
+                free_cells.remove(position)
+        return free_cells
+
+
+class DrawMode(Enum):
+    COPY = 1  # ui.draw gets a fresh list of the snake positions
+    VIEW = 2  # ui.draw gets a read-only, live SnakeView: no per-frame copy
+    SKIP = 3  # ui.draw is never called, only ui.direction
+    DELTA = 4  # one full ui.draw with a SnakeView, then ui.draw_delta (VIEW without it)
+
+
+def draw_mode_for(ui: object, draw_mode: DrawMode) -> DrawMode:
+    # The draw mode a UI gets: a UI matching the protocol without
+    # subclassing it may have no draw_delta at all, it gets full draws
+    if draw_mode is DrawMode.DELTA and getattr(ui, "draw_delta", None) is None:
+        return DrawMode.VIEW
+    return draw_mode
+
 
 class Snake:
-    _positions: List[Position]
+    __slots__ = ('_positions', '_free_cells', '_direction', '_board', '_next',
+                 '_undo_directions', '_undo_tails')
+    _positions: Deque[Position]
+    _free_cells: FreeCells
     _direction: Direction
     _board: Board
+    # Next-cell table of the board topology for the current direction
+    _next: Optional[List[Optional[Position]]]
+    # make_move history: direction before each move, and the tail it freed
+    _undo_directions: List[Direction]
+    _undo_tails: List[Optional[Position]]
 
-    def __init__(self, board: Board, positions: List[Position] = [(1, 0), (0, 0)]):
+    def __init__(self,
+                 board: Board,
+                 positions: List[Position] = [(1, 0), (0, 0)],
+                 free_cells: Optional[FreeCells] = None):
+        # Several snakes can share one board occupancy through free_cells
+        # (see Arena): then cells taken by any of them count as taken.
         if len(positions) < 2:
             raise Exception("snake should have a length of at least 2")
-        self._positions = positions
-        head = positions[0]
-        previous_head = positions[1]
-        # TODO: make a neat little function ?
-        delta_x = head[0] - previous_head[0]
-        delta_y = head[1] - previous_head[1]
-        if delta_x == board.width - 1:
-            delta_x = -1
-        elif delta_x == 1 - board.width:
-            delta_x = 1
-        if delta_y == board.height - 1:
-            delta_y = -1
-        elif delta_y == 1 - board.height:
-            delta_y = 1
-
-        self._direction = Direction.from_delta(delta_x, delta_y)
         self._board = board
+        if any(not (0 <= x < board.width and 0 <= y < board.height) for x, y in positions):
+            raise Exception("snake should fit on the board")
+        # Head is on the left: growing the head and dropping the tail are
+        # both O(1), and the free cells bitset makes collision tests O(1).
+        self._positions = deque(positions)
+        self._free_cells = free_cells if free_cells is not None else board.free_cells()
+        cells = [self._cell(position) for position in positions]
+        if any(not self._free_cells.is_free(cell) for cell in cells):
+            raise Exception("snake should be on free cells")
+        for cell in cells:
+            self._free_cells.take(cell)
+        self._next = None
+        self._set_direction(self._initial_direction(positions[0], positions[1]))
+        self._undo_directions = []
+        self._undo_tails = []
+
+    def clone(self) -> 'Snake':
+        # Copies the body and the occupancy, not the make_move history
+        clone = Snake.__new__(Snake)
+        clone._board = self._board
+        clone._positions = self._positions.copy()
+        clone._free_cells = self._free_cells.clone()
+        clone._direction = self._direction
+        clone._next = self._next
+        clone._undo_directions = []
+        clone._undo_tails = []
+        return clone
 
     @property
     def positions(self) -> List[Position]:
-        return self._positions
+        return list(self._positions)
+
+    @property
+    def free_cells(self) -> FreeCells:
+        return self._free_cells
 
     @property
     def direction(self) -> Direction:
@@ -66,41 +156,238 @@ class Snake:
 
     @direction.setter
     def direction(self, direction: Direction) -> None:
+        turned = self.turned(direction)
+        if turned is not self._direction:
+            self._set_direction(turned)
+
+    def _set_direction(self, direction: Direction) -> None:
+        self._direction = direction
+        if self._board.topology is not None:
+            self._next = self._board.topology.tables[direction]
+
+    def _initial_direction(self, head: Position, neck: Position) -> Direction:
+        for turn in TURNS:
+            if self._neighbour(neck, turn) == head:
+                return turn
+        raise ValueError("the head of the snake should be next to the rest of its body")
+
+    def _neighbour(self, position: Position, direction: Direction) -> Optional[Position]:
+        if self._board.topology is not None:
+            return self._board.topology.neighbour(position, direction)
+        return ((position[0] + direction.x) % self._board.width,
+                (position[1] + direction.y) % self._board.height)
+
+    def turned(self, direction: Direction) -> Direction:
+        # The direction the snake takes when asked to go towards direction
         if (direction is not None and direction is not Direction.DEFAULT
-                and not (direction == Direction.UP and self._direction == Direction.DOWN)
-                and not (direction == Direction.DOWN and self._direction == Direction.UP)
-                and not (direction == Direction.RIGHT and self._direction == Direction.LEFT)
-                and not (direction == Direction.LEFT and self._direction == Direction.RIGHT)):
-            self._direction = direction
+                and direction is not OPPOSITES[self._direction]):
+            return direction
+        return self._direction
+
+    def move(self, keep_tail: bool = False) -> Optional[Position]:
+        # Returns the cell freed by the tail, None when the snake grew
+        new_head = self._compute_new_head()
+        if new_head is None:
+            raise Snake.HitsWallError()
 
-    def move(self, keep_tail: bool = False) -> None:
+        tail = None
         if not keep_tail:
-            self._positions.pop()
+            tail = self._positions.pop()
+            self._free_cells.release(self._cell(tail))
 
-        new_head = self._compute_new_head()
+        if not self._free_cells.take(self._cell(new_head)):
+            raise Snake.BitesItselfError()
+
+        self._positions.appendleft(new_head)
+        return tail
 
-        if new_head in self.positions:
+    def make_move(self, direction: Direction, egg: Optional[Position] = None) -> bool:
+        # Turns towards direction and moves, eating egg if it is on the way;
+        # returns whether it did. Undo with unmake_move. On a bite, the snake
+        # is left as it was before the call.
+        previous = self._direction
+        self._set_direction(self.turned(direction))
+        new_head = self._compute_new_head()
+        if new_head is None:
+            self._set_direction(previous)
+            raise Snake.HitsWallError()
+        eaten = new_head == egg
+        tail = None
+        if not eaten:
+            tail = self._positions.pop()
+            self._free_cells.release(self._cell(tail))
+
+        if not self._free_cells.take(self._cell(new_head)):
+            if tail is not None:
+                self._positions.append(tail)
+                self._free_cells.take(self._cell(tail))
+            self._set_direction(previous)
             raise Snake.BitesItselfError()
 
-        self._positions.insert(0, new_head)
+        self._positions.appendleft(new_head)
+        self._undo_directions.append(previous)
+        self._undo_tails.append(tail)
+        return eaten
+
+    def unmake_move(self) -> None:
+        tail = self._undo_tails.pop()
+        head = self._positions.popleft()
+        self._free_cells.release(self._cell(head))
+        if tail is not None:
+            self._positions.append(tail)
+            self._free_cells.take(self._cell(tail))
+        self._set_direction(self._undo_directions.pop())
 
     def will_eat_egg(self, egg: Position) -> bool:
         return egg == self._compute_new_head()
 
-    def _compute_new_head(self) -> Position:
+    # move in separate steps, for engines moving several snakes at once:
+    # all tails first, then all heads
+
+    def next_head(self) -> Optional[Position]:
+        # None when the snake is about to hit a wall
+        return self._compute_new_head()
+
+    def drop_tail(self) -> Position:
+        tail = self._positions.pop()
+        self._free_cells.release(self._cell(tail))
+        return tail
+
+    def push_head(self, head: Position) -> None:
+        self._free_cells.take(self._cell(head))
+        self._positions.appendleft(head)
+
+    def clear(self) -> None:
+        # Frees all the cells of the snake, which is left empty
+        for position in self._positions:
+            self._free_cells.release(self._cell(position))
+        self._positions.clear()
+
+    def _compute_new_head(self) -> Optional[Position]:
         head = self._positions[0]
+        if self._next is not None:
+            return self._next[head[1] * self._board.width + head[0]]
         return ((head[0] + self._direction.x) % self._board.width,
                 (head[1] + self._direction.y) % self._board.height)
 
+    def _cell(self, position: Position) -> int:
+        return position[1] * self._board.width + position[0]
+
     def fills_board(self) -> bool:
-        return len(self._positions) == self._board.size
+        return len(self._positions) == self._board.playable
+
+    def view(self) -> 'SnakeView':
+        return SnakeView(self)
 
     def __iter__(self) -> Iterator[Position]:
-        return iter(self.positions)
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, position: object) -> bool:
+        if not isinstance(position, (tuple, list)) or len(position) != 2:
+            return False
+        x, y = position
+        if not (0 <= x < self._board.width and 0 <= y < self._board.height):
+            return False
+        if self._board.topology is not None and position in self._board.topology.obstacles:
+            return False
+        return not self._free_cells.is_free(y * self._board.width + x)
 
     class BitesItselfError(Exception):
         pass
 
+    # Also a BitesItselfError, so that a wall ends the game the same way
+    class HitsWallError(BitesItselfError):
+        pass
+
+
+class SnakeView:
+    # Read-only window on a snake body. It is live: it reflects the moves
+    # made after it was handed out, so copy it to keep a frame around.
+    __slots__ = ('_snake',)
+
+    def __init__(self, snake: Snake):
+        self._snake = snake
+
+    @property
+    def head(self) -> Position:
+        return self._snake._positions[0]
+
+    @property
+    def tail(self) -> Position:
+        return self._snake._positions[-1]
+
+    @property
+    def direction(self) -> Direction:
+        return self._snake.direction
+
+    def turned(self, direction: Direction) -> Direction:
+        return self._snake.turned(direction)
+
+    def is_free(self, cell: int) -> bool:
+        # cell is y * width + x
+        return self._snake._free_cells.is_free(cell)
+
+    def clone(self) -> Snake:
+        return self._snake.clone()
+
+    def __iter__(self) -> Iterator[Position]:
+        return iter(self._snake)
+
+    def __len__(self) -> int:
+        return len(self._snake)
+
+    def __contains__(self, position: object) -> bool:
+        return position in self._snake
+
+
+# Why a game ended, see GameResult
+WON = "won"
+BIT_ITSELF = "bit-itself"
+HIT_WALL = "hit-wall"
+STOPPED = "stopped"
+
+
+@dataclass(frozen=True)
+class GameResult:
+    # What a game came to. egg_ticks holds, for every egg eaten, the ticks
+    # it took since the previous one (or since the start). A game that did
+    # not end by itself (tick limit, or still going) is STOPPED.
+    ticks: int
+    length: int
+    eggs: int
+    cause: str
+    egg_ticks: Tuple[int, ...]
+
+    @property
+    def won(self) -> bool:
+        return self.cause == WON
+
+    @property
+    def lost(self) -> bool:
+        return self.cause in (BIT_ITSELF, HIT_WALL)
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    # The body is packed as cells (y * width + x), head first. free_cells is
+    # the order of the free-cell index, when the game built one: eggs picked
+    # after a restore are then the same as the first time through.
+    width: int
+    body: array = field(hash=False)
+    direction: Direction
+    egg: Position
+    ticks: int
+    lost: bool
+    cause: Optional[str] = None
+    free_cells: Optional[array] = field(default=None, compare=False, repr=False)
+
+    @property
+    def positions(self) -> Tuple[Position, ...]:
+        return tuple((cell % self.width, cell // self.width) for cell in self.body)
+
 
 class Game:
     DEFAULT_SNAKE = [(7, 5), (6, 5), (5, 5)]
@@ -109,44 +396,91 @@ class Game:
     _iterations: Optional[int]
     _lost: bool
     _egg_creator: EggCreator
+    _pick_egg: Callable[[FreeCells], Position]
     _ui: UiProtocol
+    _draw_mode: DrawMode
+    _vacated: Optional[Position]
+    _ticks: int
+    _full_draw: bool
+    _instrumentation: Optional[Instrumentation]
+    _timestep: Optional[Timestep]
+    _timestep_stats: TimestepStats
+    _egg_ns: int
+    _cause: Optional[str]
+    _egg_ticks: List[int]
+    _last_egg: int
 
     def __init__(self,
                  ui: UiProtocol,
                  iterations: Optional[int] = None,
                  size: int = 20,
-                 egg_creator: EggCreator = None,
-                 snake: List[Position] = DEFAULT_SNAKE):
-        self._board = Board(size, size)
+                 egg_creator: Optional[EggCreator] = None,
+                 snake: List[Position] = DEFAULT_SNAKE,
+                 draw_mode: DrawMode = DrawMode.COPY,
+                 instrumentation: Optional[Instrumentation] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None,
+                 topology: Optional[Topology] = None,
+                 timestep: Optional[Timestep] = None):
+        # size is the side of a square board, width and height override it,
+        # and a topology overrides them all. Without a timestep, run goes as
+        # fast as the UI lets it: one draw, one tick.
+        if topology is not None:
+            self._board = Board(topology.width, topology.height, topology)
+        else:
+            self._board = Board(width or size, height or size)
         self._snake = Snake(self._board, [x for x in snake])
         self._iterations = iterations
         self._ui = ui
         self._lost = False
+        self._draw_mode = draw_mode_for(ui, draw_mode)
+        self._vacated = None
+        self._ticks = 0
+        self._full_draw = True
+        self._instrumentation = instrumentation
+        self._timestep = timestep
+        self._timestep_stats = TimestepStats()
+        self._egg_ns = 0
+        self._cause = None
+        self._egg_ticks = []
+        self._last_egg = 0
         if egg_creator:
             self._egg_creator = egg_creator
         else:
-            self._egg_creator = RandomEggCreator(size)
+            self._egg_creator = RandomEggCreator(
+                self._board.width, height=self._board.height)
+        self._pick_egg = egg_picker(self._egg_creator)
 
     def run(self) -> bool:
-        self._place_egg()
-        while not self._lost:
-            self._ui.draw(
-                snake=[position for position in self._snake],
-                egg=self._egg
-            )
+        self.start()
+        if self._timestep is not None:
+            return self._run_timed(self._timestep)
+        if self._instrumentation is not None:
+            return self._run_instrumented(self._instrumentation)
 
-            try:
-                self._snake.direction = self._ui.direction()
-                egg_eaten = self._snake.will_eat_egg(self._egg)
-                self._snake.move(egg_eaten)
-                if self._snake.fills_board():
-                    self._lost = False
-                    break
-
-                if egg_eaten:
-                    self._place_egg()
-            except Snake.BitesItselfError:
-                self._lost = True
+        view = self._snake.view()
+        while True:
+            self._draw(view)
+
+            if not self.step(self._ui.direction()):
+                break
+
+            if self._iterations:
+                self._iterations -= 1
+
+            if self._iterations == 0:
+                break
+
+        return not self._lost
+
+    def _run_instrumented(self, instrumentation: Instrumentation) -> bool:
+        # Same loop as run, timing each phase on sampled ticks
+        view = self._snake.view()
+        while True:
+            self._draw_instrumented(view, instrumentation)
+            playing = self._tick_instrumented(instrumentation)
+
+            if not playing:
                 break
 
             if self._iterations:
@@ -157,9 +491,252 @@ class Game:
 
         return not self._lost
 
+    def _draw_instrumented(self, view: SnakeView, instrumentation: Instrumentation) -> None:
+        if self._ticks % instrumentation.sample_every:
+            self._draw(view)
+            return
+        start = perf_counter_ns()
+        self._draw(view)
+        instrumentation.record(Phase.DRAW, perf_counter_ns() - start)
+
+    def _tick_instrumented(self, instrumentation: Instrumentation) -> bool:
+        instrumentation.count("ticks")
+        if self._ticks % instrumentation.sample_every:
+            return self.step(self._ui.direction())
+        start = perf_counter_ns()
+        direction = self._ui.direction()
+        directed = perf_counter_ns()
+        self._egg_ns = 0
+        playing = self.step(direction)
+        moved = perf_counter_ns()
+        instrumentation.record(Phase.DIRECTION, directed - start)
+        instrumentation.record(Phase.MOVE, moved - directed - self._egg_ns)
+        return playing
+
+    def _run_timed(self, timestep: Timestep) -> bool:
+        # Ticks on the timestep's schedule, draws at its own rate in
+        # between, waits for whichever comes first; see Timestep. With an
+        # instrumentation, the phases are timed like in _run_instrumented.
+        view = self._snake.view()
+        stats = self._timestep_stats = TimestepStats()
+        clock = timestep.clock
+        tick_ns = timestep.tick_ns
+        frame_ns = timestep.frame_ns
+        renders = timestep.renders
+        wait: Callable[[float], None]
+        if timestep.sleep is not None:
+            wait = timestep.sleep
+        else:
+            wait = getattr(self._ui, "wait", sleep)
+        instrumentation = self._instrumentation
+        draw: Callable[[], None]
+        tick: Callable[[], bool]
+        if instrumentation is not None:
+            draw = partial(self._draw_instrumented, view, instrumentation)
+            tick = partial(self._tick_instrumented, instrumentation)
+        else:
+            draw = partial(self._draw, view)
+            tick = lambda: self.step(self._ui.direction())
+
+        now = clock()
+        next_tick = now
+        next_frame = now
+        drawn_at = self._ticks
+        if renders:
+            draw()
+            stats.frames += 1
+            next_frame = now + frame_ns
+        while True:
+            due = 1
+            if tick_ns:
+                now = clock()
+                due = (now - next_tick) // tick_ns + 1 if now >= next_tick else 0
+                if due > timestep.max_catch_up:
+                    # Too far behind: skip the rest, back on schedule
+                    stats.dropped += due - timestep.max_catch_up
+                    next_tick += (due - timestep.max_catch_up) * tick_ns
+                    due = timestep.max_catch_up
+                next_tick += due * tick_ns
+
+            for _ in range(due):
+                playing = tick()
+                stats.ticks += 1
+                if self._iterations:
+                    self._iterations -= 1
+                if not playing or self._iterations == 0:
+                    return not self._lost
+
+            if renders and self._ticks != drawn_at:
+                now = clock()
+                if now >= next_frame:
+                    if self._ticks - drawn_at > 1:
+                        # Deltas only span one tick
+                        self._full_draw = True
+                    draw()
+                    stats.frames += 1
+                    drawn_at = self._ticks
+                    next_frame = max(next_frame + frame_ns, now)
+
+            if tick_ns:
+                target = next_tick
+                if renders and self._ticks != drawn_at:
+                    target = min(target, next_frame)
+                left = target - clock()
+                if left > 0:
+                    wait(left / 1e9)
+
+    def _draw(self, view: SnakeView) -> None:
+        snake = self._frame(view)
+        if snake is not None:
+            self._ui.draw(snake=snake, egg=self._egg)
+        elif self._draw_mode is DrawMode.DELTA:
+            try:
+                self._ui.draw_delta(
+                    head=view.head, tail=self._vacated, egg=self._egg)
+            except NotImplementedError:
+                self._deltas_unsupported()
+                self._ui.draw(snake=view, egg=self._egg)
+
+    def _frame(self, view: SnakeView) -> Optional[Iterable[Position]]:
+        # The snake the next frame draws in full; None for a delta, or for
+        # no frame at all with DrawMode.SKIP. Shared with AsyncGame.
+        if self._draw_mode is DrawMode.COPY:
+            return [position for position in self._snake]
+        if self._draw_mode is DrawMode.VIEW:
+            return view
+        if self._draw_mode is DrawMode.DELTA and self._full_draw:
+            self._full_draw = False
+            return view
+        return None
+
+    def _deltas_unsupported(self) -> None:
+        # The UI only draws full frames: it gets one, of the live view, on
+        # every tick from now on
+        self._draw_mode = DrawMode.VIEW
+
+    def start(self) -> None:
+        # Places the first egg; run does it, call it before driving step
+        self._full_draw = True
+        self._place_egg()
+
+    def state(self) -> 'GameState':
+        # Detached copy of the game, to search ahead without touching it
+        from .state import GameState
+        return GameState(self._snake.clone(), self._egg, self._lost)
+
+    def snapshot(self) -> GameSnapshot:
+        width = self._board.width
+        return GameSnapshot(width=width,
+                            body=array('i', (y * width + x for x, y in self._snake)),
+                            direction=self._snake.direction,
+                            egg=self._egg,
+                            ticks=self._ticks,
+                            lost=self._lost,
+                            cause=self._cause,
+                            free_cells=self._snake.free_cells.index_order())
+
+    def result(self) -> GameResult:
+        return GameResult(ticks=self._ticks,
+                          length=len(self._snake),
+                          eggs=len(self._egg_ticks),
+                          cause=self._cause or STOPPED,
+                          egg_ticks=tuple(self._egg_ticks))
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        # Views handed out before a restore keep showing the old snake; the
+        # result starts over from the snapshot, but for its ticks
+        self._snake = Snake(self._board, list(snapshot.positions))
+        self._snake._set_direction(snapshot.direction)
+        if snapshot.free_cells is not None:
+            self._snake.free_cells.restore_index(snapshot.free_cells)
+        self._egg = snapshot.egg
+        self._ticks = snapshot.ticks
+        self._lost = snapshot.lost
+        self._vacated = None
+        self._cause = snapshot.cause
+        self._egg_ticks = []
+        self._last_egg = snapshot.ticks
+
+    @property
+    def board(self) -> Board:
+        return self._board
+
+    @property
+    def egg(self) -> Position:
+        return self._egg
+
+    @property
+    def ticks(self) -> int:
+        return self._ticks
+
+    @property
+    def timestep_stats(self) -> TimestepStats:
+        # Ticks, frames and dropped ticks of the last run on a Timestep
+        return self._timestep_stats
+
+    @property
+    def snake(self) -> SnakeView:
+        return self._snake.view()
+
+    @property
+    def vacated(self) -> Optional[Position]:
+        # Cell the tail left on the last tick, None when the snake grew
+        return self._vacated
+
+    @property
+    def won(self) -> bool:
+        return self._snake.fills_board()
+
+    @property
+    def lost(self) -> bool:
+        return self._lost
+
+    def step(self, direction: Direction) -> bool:
+        # Plays one tick, returns False when the game is over
+        self._ticks += 1
+        try:
+            self._snake.direction = direction
+            egg_eaten = self._snake.will_eat_egg(self._egg)
+            self._vacated = self._snake.move(egg_eaten)
+            if egg_eaten:
+                self._egg_ticks.append(self._ticks - self._last_egg)
+                self._last_egg = self._ticks
+            if self._snake.fills_board():
+                self._lost = False
+                self._cause = WON
+                return False
+
+            if egg_eaten:
+                self._place_egg()
+        except Snake.HitsWallError:
+            self._lost = True
+            self._cause = HIT_WALL
+            return False
+        except Snake.BitesItselfError:
+            self._lost = True
+            self._cause = BIT_ITSELF
+            return False
+        return True
+
     def _place_egg(self) -> None:
+        if self._instrumentation is not None:
+            return self._place_egg_instrumented(self._instrumentation)
+        while True:
+            new_egg = self._pick_egg(self._snake.free_cells)
+            if new_egg in self._snake.free_cells:
+                self._egg = new_egg
+                break
+
+    def _place_egg_instrumented(self, instrumentation: Instrumentation) -> None:
+        start = perf_counter_ns()
+        retries = 0
         while True:
-            new_egg = self._egg_creator.create()
-            if not new_egg in self._snake:
+            new_egg = self._pick_egg(self._snake.free_cells)
+            if new_egg in self._snake.free_cells:
                 self._egg = new_egg
                 break
+            retries += 1
+        self._egg_ns = perf_counter_ns() - start
+        instrumentation.count("eggs_placed")
+        instrumentation.count("egg_retries", retries)
+        instrumentation.record(Phase.PLACE_EGG, self._egg_ns)
@@ -0,0 +1,95 @@
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Opt-in timings and counters for Game.run. A Game built without an
+# Instrumentation runs its plain loop and pays nothing for any of this.
+
+
+class Phase(Enum):
+    DRAW = "draw"
+    DIRECTION = "direction"
+    MOVE = "move"
+    PLACE_EGG = "place_egg"
+
+
+# Called with every timing sample, e.g. to feed an external histogram or profiler
+Hook = Callable[[Phase, int], None]
+
+
+class PhaseStats:
+    # Constant-memory summary of the samples of one phase, with a log2
+    # histogram: bucket i counts the samples taking [2 ** (i - 1), 2 ** i) ns.
+    __slots__ = ('count', 'total_ns', 'min_ns', 'max_ns', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * 64
+
+    def add(self, ns: int) -> None:
+        if self.count == 0 or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.count += 1
+        self.total_ns += ns
+        self.buckets[min(ns.bit_length(), 63)] += 1
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> int:
+        # Upper bound of the bucket holding the q-th quantile
+        rank = q * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(2 ** bucket, self.max_ns)
+        return self.max_ns
+
+
+class Instrumentation:
+    # Times one tick out of sample_every (counters are always exact), and
+    # forwards every sample to the hooks.
+    COUNTERS = ("ticks", "eggs_placed", "egg_retries")
+
+    phases: Dict[Phase, PhaseStats]
+    counters: Dict[str, int]
+    sample_every: int
+    _hooks: List[Hook]
+
+    def __init__(self, sample_every: int = 1, hooks: Iterable[Hook] = ()):
+        if sample_every < 1:
+            raise ValueError("sample_every should be at least 1")
+        self.sample_every = sample_every
+        self.phases = {phase: PhaseStats() for phase in Phase}
+        self.counters = {counter: 0 for counter in self.COUNTERS}
+        self._hooks = list(hooks)
+
+    def add_hook(self, hook: Hook) -> None:
+        self._hooks.append(hook)
+
+    def record(self, phase: Phase, ns: int) -> None:
+        self.phases[phase].add(ns)
+        for hook in self._hooks:
+            hook(phase, ns)
+
+    def count(self, counter: str, increment: int = 1) -> None:
+        self.counters[counter] += increment
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        summary: Dict[str, Dict[str, float]] = {
+            phase.value: {
+                "samples": stats.count,
+                "mean_ns": stats.mean_ns,
+                "min_ns": stats.min_ns,
+                "p50_ns": stats.quantile(.5),
+                "p99_ns": stats.quantile(.99),
+                "max_ns": stats.max_ns,
+            } for phase, stats in self.phases.items()}
+        summary["counters"] = dict(self.counters)
+        return summary
@@ -0,0 +1,169 @@
+import argparse
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+from .direction import Direction
+from .replay import Replay, Replayer
+from .types import Position
+from .ui.protocol import UiProtocol
+from .ui.style import BLACK, CELL_SIZE, WHITE, YELLOW
+
+# Offscreen rendering, with the look of PygameUi but no display, no pygame
+# and no frame rate: frames are drawn into one NumPy buffer, reused from
+# frame to frame, and handed to a sink, e.g. a PngSequence writing them
+# to disk as they come.
+#
+#   python -m snake.render games/*.snkr --out frames --workers 8
+
+PALETTE = [BLACK, WHITE, YELLOW]
+EMPTY, SNAKE, EGG = range(len(PALETTE))
+
+# Called with every frame as PNG scanlines (see OffscreenUi), only valid
+# until the next frame is drawn
+Sink = Callable[['np.ndarray'], None]
+
+
+class OffscreenUi(UiProtocol):
+    # Frames are palette images, one byte per pixel, stored as PNG rows:
+    # a filter byte (always 0) then the pixels, so that encoding a frame
+    # is compressing the buffer as it is. Delta draws only repaint the
+    # cells that changed. Input is never asked for: direction keeps going.
+    _rows: 'np.ndarray'
+    _pixels: 'np.ndarray'
+    _sink: Optional[Sink]
+    _egg: Optional[Position]
+    frames: int
+
+    def __init__(self, width: int, height: Optional[int] = None, sink: Optional[Sink] = None):
+        self._width = width
+        self._height = height or width
+        self._rows = np.zeros((self._height * CELL_SIZE, 1 + width * CELL_SIZE), dtype=np.uint8)
+        self._pixels = self._rows[:, 1:]
+        self._sink = sink
+        self._egg = None
+        self.frames = 0
+
+    @property
+    def frame(self) -> 'np.ndarray':
+        # (height, width) palette indices into PALETTE
+        return self._pixels
+
+    def draw_cell(self, position: Position, color: int) -> None:
+        x = position[0] * CELL_SIZE
+        y = position[1] * CELL_SIZE
+        self._pixels[y:y + CELL_SIZE, x:x + CELL_SIZE] = color
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        self._pixels[:] = EMPTY
+        for position in snake:
+            self.draw_cell(position, SNAKE)
+        self.draw_cell(egg, EGG)
+        self._egg = egg
+        self._emit()
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        if tail is not None:
+            self.draw_cell(tail, EMPTY)
+        self.draw_cell(head, SNAKE)
+        if egg != self._egg:
+            self.draw_cell(egg, EGG)
+            self._egg = egg
+        self._emit()
+
+    def direction(self) -> Direction:
+        return Direction.DEFAULT
+
+    def _emit(self) -> None:
+        self.frames += 1
+        if self._sink is not None:
+            self._sink(self._rows)
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(
+        ">I", zlib.crc32(data, zlib.crc32(kind)))
+
+
+def encode_png(rows: 'np.ndarray', level: int = 1) -> bytes:
+    # rows: (height, 1 + width) uint8, a filter byte then palette indices
+    height, width = rows.shape[0], rows.shape[1] - 1
+    header = struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+    palette = bytes(channel for color in PALETTE for channel in color)
+    return (b"\x89PNG\r\n\x1a\n"
+            + _chunk(b"IHDR", header)
+            + _chunk(b"PLTE", palette)
+            + _chunk(b"IDAT", zlib.compress(np.ascontiguousarray(rows).data, level))
+            + _chunk(b"IEND", b""))
+
+
+class PngSequence:
+    # Sink writing frame_000000.png, frame_000001.png... into directory
+    def __init__(self, directory: str, level: int = 1):
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._level = level
+        self.written = 0
+
+    def __call__(self, rows: 'np.ndarray') -> None:
+        path = os.path.join(self._directory, "frame_{:06d}.png".format(self.written))
+        with open(path, "wb") as out:
+            out.write(encode_png(rows, self._level))
+        self.written += 1
+
+
+def render_replay(replay: Replay, directory: str, level: int = 1) -> int:
+    # Writes one PNG per tick of the replay, plus the first frame;
+    # returns the number of frames
+    ui = OffscreenUi(replay.width, replay.height, PngSequence(directory, level))
+    # Never seeks back: no need for keyframes on the way
+    replayer = Replayer(replay, keyframe_interval=replay.ticks + 1)
+    game = replayer.game
+    ui.draw(game.snake, game.egg)
+    while replayer.step():
+        if game.lost:
+            # The losing move leaves no clean delta behind: redraw it all
+            ui.draw(game.snake, game.egg)
+        else:
+            ui.draw_delta(game.snake.head, game.vacated, game.egg)
+    return ui.frames
+
+
+def _render_file(args: Tuple[str, str, int]) -> Tuple[str, int]:
+    path, directory, level = args
+    with open(path, "rb") as source:
+        replay = Replay.load(source)
+    return path, render_replay(replay, directory, level)
+
+
+def render_replays(paths: Iterable[str],
+                   out: str,
+                   workers: int = 1,
+                   level: int = 1) -> List[Tuple[str, int]]:
+    # Renders every replay file into its own directory under out, named
+    # after the file; returns (path, frames) in the order of paths
+    tasks = [(path, os.path.join(out, os.path.splitext(os.path.basename(path))[0]), level)
+             for path in paths]
+    if workers <= 1:
+        return [_render_file(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_file, tasks))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Render replays to PNG sequences.")
+    parser.add_argument("replays", nargs="+")
+    parser.add_argument("--out", default="frames")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--level", type=int, default=1, help="zlib compression level")
+    args = parser.parse_args(argv)
+    for path, frames in render_replays(args.replays, args.out, args.workers, args.level):
+        print("{}: {} frames".format(path, frames))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import struct
+from array import array
+from dataclasses import dataclass
+from random import Random
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from .direction import Direction
+from .game import DrawMode, Game, GameSnapshot, RandomEggCreator
+from .types import Position
+from .ui.headless import HeadlessUi
+from .ui.protocol import UiProtocol
+
+# Binary replay log:
+#   header:  magic, version, width, height, egg seed, snake length (<4sBHHqI)
+#   snake:   one cell (y * width + x) per position, head first (<I each)
+#   ticks:   the direction the snake took on each tick, 2 bits per tick,
+#            4 ticks per byte, first tick in the low bits
+#   trailer: number of ticks (<I)
+# Eggs are not stored: they come from RandomEggCreator with Random(seed).
+
+MAGIC = b"SNKR"
+VERSION = 1
+_HEADER = struct.Struct("<4sBHHqI")
+_CELL = struct.Struct("<I")
+_TRAILER = struct.Struct("<I")
+
+_CODES = [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]
+_CODE_OF = {direction: code for code, direction in enumerate(_CODES)}
+# All four directions packed in each possible byte
+_UNPACKED = [tuple(_CODES[(byte >> shift) & 3] for shift in (0, 2, 4, 6))
+             for byte in range(256)]
+
+
+class InvalidReplayError(Exception):
+    pass
+
+
+class Recorder:
+    # Streams a replay log: header first, then a byte every 4 ticks.
+    _out: BinaryIO
+    _ticks: int
+    _pending: int
+
+    def __init__(self, out: BinaryIO, width: int, height: int, seed: int, snake: List[Position]):
+        self._out = out
+        self._ticks = 0
+        self._pending = 0
+        out.write(_HEADER.pack(MAGIC, VERSION, width, height, seed, len(snake)))
+        for x, y in snake:
+            out.write(_CELL.pack(y * width + x))
+
+    def record(self, direction: Direction) -> None:
+        self._pending |= _CODE_OF[direction] << (2 * (self._ticks & 3))
+        self._ticks += 1
+        if self._ticks & 3 == 0:
+            self._out.write(bytes((self._pending,)))
+            self._pending = 0
+
+    def close(self) -> None:
+        if self._ticks & 3:
+            self._out.write(bytes((self._pending,)))
+        self._out.write(_TRAILER.pack(self._ticks))
+        self._out.flush()
+
+
+class RecordingUi(UiProtocol):
+    # Forwards everything to ui, and records the direction the snake
+    # actually takes for the input ui returns.
+    def __init__(self, ui: UiProtocol, recorder: Recorder, game: Optional[Game] = None):
+        self._ui = ui
+        self._recorder = recorder
+        self.game = game
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        self._ui.draw(snake=snake, egg=egg)
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        self._ui.draw_delta(head=head, tail=tail, egg=egg)
+
+    def direction(self) -> Direction:
+        direction = self._ui.direction()
+        assert self.game is not None
+        self._recorder.record(self.game.snake.turned(direction))
+        return direction
+
+
+def record_game(out: BinaryIO,
+                ui: UiProtocol,
+                seed: int,
+                iterations: Optional[int] = None,
+                size: int = 20,
+                snake: List[Position] = Game.DEFAULT_SNAKE,
+                draw_mode: DrawMode = DrawMode.COPY,
+                width: Optional[int] = None,
+                height: Optional[int] = None) -> bool:
+    width = width or size
+    height = height or size
+    recorder = Recorder(out, width, height, seed, snake)
+    recording_ui = RecordingUi(ui, recorder)
+    game = Game(ui=recording_ui,
+                iterations=iterations,
+                egg_creator=RandomEggCreator(width, Random(seed), height),
+                snake=snake,
+                draw_mode=draw_mode,
+                width=width,
+                height=height)
+    recording_ui.game = game
+    try:
+        return game.run()
+    finally:
+        recorder.close()
+
+
+@dataclass(frozen=True)
+class Replay:
+    width: int
+    height: int
+    seed: int
+    snake: List[Position]
+    ticks: int
+    moves: bytes
+
+    @staticmethod
+    def load(source: BinaryIO) -> 'Replay':
+        return Replay.from_bytes(source.read())
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Replay':
+        if len(data) < _HEADER.size + _TRAILER.size:
+            raise InvalidReplayError("replay is truncated")
+        magic, version, width, height, seed, length = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise InvalidReplayError("not a snake replay, or an unknown version")
+        offset = _HEADER.size
+        snake = []
+        for _ in range(length):
+            cell, = _CELL.unpack_from(data, offset)
+            snake.append((cell % width, cell // width))
+            offset += _CELL.size
+        ticks, = _TRAILER.unpack_from(data, len(data) - _TRAILER.size)
+        moves = data[offset:len(data) - _TRAILER.size]
+        if len(moves) != (ticks + 3) // 4:
+            raise InvalidReplayError("replay is truncated")
+        return Replay(width, height, seed, snake, ticks, moves)
+
+    def direction(self, tick: int) -> Direction:
+        return _UNPACKED[self.moves[tick >> 2]][tick & 3]
+
+
+class Replayer:
+    # Replays a log on a headless Game, never calling any UI.
+    # A keyframe is kept every keyframe_interval ticks on the way, so that
+    # seeking back only replays the ticks since the closest keyframe. It
+    # holds the egg RNG state and the order of the free-cell index, packed
+    # in arrays, so the eggs replayed from it are the recorded ones.
+    # Past max_keyframes, the interval doubles and every other keyframe is
+    # dropped: memory stays bounded however long the replay, seeks get
+    # longer instead.
+    _replay: Replay
+    _game: Game
+    _rng: Random
+    _keyframes: Dict[int, Tuple[GameSnapshot, Tuple[int, array, Optional[float]]]]
+
+    def __init__(self, replay: Replay, keyframe_interval: int = 1024, max_keyframes: int = 64):
+        self._replay = replay
+        self._interval = keyframe_interval
+        self._max_keyframes = max_keyframes
+        self._rng = Random(replay.seed)
+        self._game = Game(ui=HeadlessUi(),
+                          egg_creator=RandomEggCreator(replay.width, self._rng, replay.height),
+                          snake=replay.snake,
+                          draw_mode=DrawMode.SKIP,
+                          width=replay.width,
+                          height=replay.height)
+        self._game.start()
+        self._keyframes = {}
+        self._keep_keyframe()
+
+    @property
+    def game(self) -> Game:
+        return self._game
+
+    @property
+    def tick(self) -> int:
+        return self._game.ticks
+
+    def step(self) -> bool:
+        # Plays the next recorded tick, returns False at the end of the log
+        tick = self._game.ticks
+        if tick >= self._replay.ticks:
+            return False
+        self._game.step(self._replay.direction(tick))
+        if self._game.ticks % self._interval == 0:
+            self._keep_keyframe()
+        return True
+
+    def run(self) -> Game:
+        game = self._game
+        replay = self._replay
+        interval = self._interval
+        unpacked = _UNPACKED
+        moves = replay.moves
+        for tick in range(game.ticks, replay.ticks):
+            game.step(unpacked[moves[tick >> 2]][tick & 3])
+            if (tick + 1) % interval == 0:
+                self._keep_keyframe()
+                interval = self._interval
+        return game
+
+    def seek(self, tick: int) -> Game:
+        if not 0 <= tick <= self._replay.ticks:
+            raise IndexError("tick out of the replay")
+        keyframe = max(frame for frame in self._keyframes if frame <= tick)
+        if tick < self._game.ticks or keyframe > self._game.ticks:
+            snapshot, (version, state, gauss) = self._keyframes[keyframe]
+            self._game.restore(snapshot)
+            self._rng.setstate((version, tuple(state), gauss))
+        while self._game.ticks < tick:
+            self.step()
+        return self._game
+
+    def _keep_keyframe(self) -> None:
+        version, state, gauss = self._rng.getstate()
+        self._keyframes[self._game.ticks] = (self._game.snapshot(), (version, array('I', state), gauss))
+        if len(self._keyframes) > self._max_keyframes:
+            self._interval *= 2
+            self._keyframes = {tick: keyframe for tick, keyframe in self._keyframes.items()
+                               if tick % self._interval == 0}
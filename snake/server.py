@@ -0,0 +1,257 @@
+import argparse
+import asyncio
+import struct
+from dataclasses import dataclass
+from random import Random
+from typing import Callable, Iterable, List, Optional, Union
+
+from .async_game import AsyncGame
+from .direction import Direction
+from .game import DrawMode, RandomEggCreator
+from .instrumentation import PhaseStats
+from .types import Position
+from .ui.protocol import AsyncUiProtocol
+
+# TCP game server: every connection plays its own headless game.
+#
+# Client to server: one byte per input, a Direction value (UP=1 ... RIGHT=4),
+# other bytes are ignored. The latest input wins on each tick.
+# Server to client, cells being y * width + x:
+#   full frame, once:  type 0, width, height, length (<BHHI), then the
+#                      snake, head first (<I each), then the egg (<I)
+#   delta, every tick: type 1, head, tail left or NO_CELL, egg (<BIII)
+#   end:               type 2, won, lost, ticks (<BBBI), then the server closes
+#
+# Tick lateness is how much later than interval after the previous tick
+# a tick went out: it stays near 0 until the process runs out of CPU.
+
+FULL = 0
+DELTA = 1
+END = 2
+NO_CELL = 0xFFFFFFFF
+
+_FULL = struct.Struct("<BHHI")
+_CELL = struct.Struct("<I")
+_DELTA = struct.Struct("<BIII")
+_END = struct.Struct("<BBBI")
+
+
+@dataclass(frozen=True)
+class Full:
+    width: int
+    height: int
+    snake: List[Position]
+    egg: Position
+
+
+@dataclass(frozen=True)
+class Delta:
+    head: Position
+    tail: Optional[Position]
+    egg: Position
+
+
+@dataclass(frozen=True)
+class End:
+    won: bool
+    lost: bool
+    ticks: int
+
+
+Message = Union[Full, Delta, End]
+
+
+async def read_message(reader: asyncio.StreamReader, width: int = 0) -> Message:
+    # width is needed to decode deltas, it comes with the full frame
+    kind = (await reader.readexactly(1))[0]
+    if kind == FULL:
+        _, width, height, length = _FULL.unpack(
+            bytes((kind,)) + await reader.readexactly(_FULL.size - 1))
+        cells = struct.unpack("<{}I".format(length + 1),
+                              await reader.readexactly(_CELL.size * (length + 1)))
+        return Full(width, height, [_position(cell, width) for cell in cells[:-1]],
+                    _position(cells[-1], width))
+    if kind == DELTA:
+        _, head, tail, egg = _DELTA.unpack(
+            bytes((kind,)) + await reader.readexactly(_DELTA.size - 1))
+        return Delta(_position(head, width),
+                     None if tail == NO_CELL else _position(tail, width),
+                     _position(egg, width))
+    if kind == END:
+        _, won, lost, ticks = _END.unpack(bytes((kind,)) + await reader.readexactly(_END.size - 1))
+        return End(bool(won), bool(lost), ticks)
+    raise ValueError("unknown message type {}".format(kind))
+
+
+def _position(cell: int, width: int) -> Position:
+    return (cell % width, cell // width)
+
+
+class SessionUi(AsyncUiProtocol):
+    # Plays a game over one connection, see the protocol above
+    _writer: asyncio.StreamWriter
+    _width: int
+    _height: int
+    _interval: float
+    _on_tick: Callable[[int], None]
+    _direction: Direction
+    _last_tick: Optional[float]
+
+    def __init__(self,
+                 writer: asyncio.StreamWriter,
+                 width: int,
+                 height: int,
+                 interval: float,
+                 on_tick: Callable[[int], None]):
+        # on_tick gets the lateness of every tick, in ns
+        self._writer = writer
+        self._width = width
+        self._height = height
+        self._interval = interval
+        self._on_tick = on_tick
+        self._direction = Direction.DEFAULT
+        self._last_tick = None
+
+    def put_direction(self, direction: Direction) -> None:
+        self._direction = direction
+
+    async def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        cells = [self._cell(position) for position in snake]
+        self._writer.write(_FULL.pack(FULL, self._width, self._height, len(cells))
+                           + struct.pack("<{}I".format(len(cells) + 1), *cells, self._cell(egg)))
+        await self._flush()
+
+    async def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        self._writer.write(_DELTA.pack(DELTA, self._cell(head),
+                                       NO_CELL if tail is None else self._cell(tail),
+                                       self._cell(egg)))
+        await self._flush()
+
+    async def direction(self) -> Direction:
+        direction, self._direction = self._direction, Direction.DEFAULT
+        return direction
+
+    async def end(self, won: bool, lost: bool, ticks: int) -> None:
+        self._writer.write(_END.pack(END, won, lost, ticks))
+        await self._writer.drain()
+
+    async def _flush(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._last_tick is not None:
+            late = now - self._last_tick - self._interval
+            self._on_tick(max(0, int(late * 1e9)))
+        self._last_tick = now
+        # Only waits when the client does not keep up, slowing its own game
+        await self._writer.drain()
+
+    def _cell(self, position: Position) -> int:
+        return position[1] * self._width + position[0]
+
+
+class GameServer:
+    # Hosts any number of sessions in one event loop. One process uses one
+    # core: for more, run a server per core with reuse_port on the same port.
+    sessions: int
+    games: int
+    ticks: int
+    lateness: PhaseStats
+
+    def __init__(self,
+                 size: int = 20,
+                 interval: float = .2,
+                 max_ticks: Optional[int] = None,
+                 seed: Optional[int] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None):
+        self._width = width or size
+        self._height = height or size
+        self._interval = interval
+        self._max_ticks = max_ticks
+        self._seed = seed
+        self.sessions = 0
+        self.games = 0
+        self.ticks = 0
+        self.lateness = PhaseStats()
+
+    async def start(self,
+                    host: str = "127.0.0.1",
+                    port: int = 0,
+                    reuse_port: bool = False) -> asyncio.Server:
+        return await asyncio.start_server(self._session, host, port,
+                                          reuse_port=reuse_port or None, backlog=4096)
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        # Sessions are seeded in connection order when the server is seeded
+        rng = Random(self._seed + self.games) if self._seed is not None else None
+        self.games += 1
+        ui = SessionUi(writer, self._width, self._height, self._interval, self._tick)
+        game = AsyncGame(ui=ui,
+                         interval=self._interval,
+                         iterations=self._max_ticks,
+                         egg_creator=RandomEggCreator(self._width, rng, self._height),
+                         draw_mode=DrawMode.DELTA,
+                         width=self._width,
+                         height=self._height)
+        playing = asyncio.ensure_future(game.run())
+        inputs = asyncio.ensure_future(self._read_inputs(reader, ui))
+        try:
+            await asyncio.wait((playing, inputs), return_when=asyncio.FIRST_COMPLETED)
+            if playing.done() and not playing.exception():
+                await ui.end(game.game.won, game.game.lost, game.game.ticks)
+        except ConnectionError:
+            pass
+        finally:
+            for task in (playing, inputs):
+                task.cancel()
+            self.sessions -= 1
+            writer.close()
+
+    def _tick(self, lateness_ns: int) -> None:
+        self.ticks += 1
+        self.lateness.add(lateness_ns)
+
+    async def _read_inputs(self, reader: asyncio.StreamReader, ui: SessionUi) -> None:
+        # Returns when the client disconnects
+        while True:
+            data = await reader.read(64)
+            if not data:
+                return
+            for byte in data:
+                if 1 <= byte <= 4:
+                    ui.put_direction(Direction(byte))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve headless snake games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=.2, help="seconds per tick")
+    parser.add_argument("--max-ticks", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--reuse-port", action="store_true",
+                        help="share the port with other server processes")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds")
+    args = parser.parse_args(argv)
+
+    async def serve() -> None:
+        server = GameServer(args.size, args.interval, args.max_ticks, args.seed)
+        await server.start(args.host, args.port, args.reuse_port)
+        print("serving on {}:{}".format(args.host, args.port), flush=True)
+        while True:
+            await asyncio.sleep(args.report_every)
+            lateness = server.lateness
+            print("sessions {} games {} ticks/s {:.0f} lateness p50 {:.1f}ms p99 {:.1f}ms".format(
+                server.sessions, server.games, lateness.count / args.report_every,
+                lateness.quantile(.5) / 1e6, lateness.quantile(.99) / 1e6), flush=True)
+            server.lateness = PhaseStats()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
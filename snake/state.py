@@ -0,0 +1,56 @@
+from typing import List, Optional
+
+from .direction import Direction
+from .game import Snake
+from .types import Position
+
+
+class GameState:
+    # Bare game state for look-ahead search: a snake, the current egg and
+    # whether the game is lost, without UI nor egg creator. clone copies
+    # the packed body and occupancy; make_move / unmake_move play and
+    # revert a tick in place. Once eaten, the egg is gone (None): where
+    # the next one lands is not known in advance.
+    __slots__ = ('snake', 'egg', 'lost', '_undo_eggs')
+    snake: Snake
+    egg: Optional[Position]
+    lost: bool
+    _undo_eggs: List[Optional[Position]]
+
+    def __init__(self, snake: Snake, egg: Optional[Position] = None, lost: bool = False):
+        self.snake = snake
+        self.egg = egg
+        self.lost = lost
+        self._undo_eggs = []
+
+    @property
+    def won(self) -> bool:
+        return self.snake.fills_board()
+
+    @property
+    def over(self) -> bool:
+        return self.lost or self.snake.fills_board()
+
+    def clone(self) -> 'GameState':
+        return GameState(self.snake.clone(), self.egg, self.lost)
+
+    def make_move(self, direction: Direction) -> bool:
+        # Plays one tick, returns False when the game is over after it
+        if self.over:
+            raise ValueError("the game is over")
+        self._undo_eggs.append(self.egg)
+        try:
+            if self.snake.make_move(direction, self.egg):
+                self.egg = None
+        except Snake.BitesItselfError:
+            self.lost = True
+            return False
+        return not self.snake.fills_board()
+
+    def unmake_move(self) -> None:
+        # The snake is untouched by a bite, only revert its move otherwise
+        if self.lost:
+            self.lost = False
+        else:
+            self.snake.unmake_move()
+        self.egg = self._undo_eggs.pop()
@@ -0,0 +1,236 @@
+import json
+import math
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .game import BIT_ITSELF, HIT_WALL, WON, GameResult
+
+# Streaming statistics over game results, in constant memory whatever the
+# number of games: feed GameResult records to an Aggregator, merge the
+# aggregators of parallel workers, checkpoint to disk as it goes.
+
+# Relative error of the quantiles, see Distribution
+ACCURACY = .01
+_GAMMA = (1 + ACCURACY) / (1 - ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+
+class Distribution:
+    # Summary of a stream of non-negative numbers: exact count, mean,
+    # variance (Welford), min and max, plus a sketch of log buckets for
+    # the quantiles and histogram. Bucket i counts the values in
+    # (GAMMA ** (i - 1), GAMMA ** i], so a quantile is within ACCURACY of
+    # the true one, relatively; zeros are counted apart. Memory grows with
+    # the log of the range of the values, not with their number.
+    # Distributions merge exactly: the buckets add up, the moments combine
+    # with Chan's formula.
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'zeros', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.zeros = 0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if self.count == 0 or value > self.max:
+            self.max = value
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value <= 0:
+            self.zeros += 1
+        else:
+            bucket = math.ceil(math.log(value) / _LOG_GAMMA)
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: 'Distribution') -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.min, self.max = other.min, other.max
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.zeros += other.zeros
+        for bucket, hits in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + hits
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if seen > rank:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                # Middle of the bucket, relatively: within ACCURACY of it all
+                value = 2 * _GAMMA ** bucket / (_GAMMA + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def histogram(self) -> List[Tuple[float, float, int]]:
+        # (low, high, count) for every bucket hit, lowest first
+        bins = [(0.0, 0.0, self.zeros)] if self.zeros else []
+        bins.extend((_GAMMA ** (bucket - 1), _GAMMA ** bucket, self.buckets[bucket])
+                    for bucket in sorted(self.buckets))
+        return bins
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "mean": self.mean,
+            "std": math.sqrt(self.variance),
+            "min": self.min,
+            "p50": self.quantile(.5),
+            "p90": self.quantile(.9),
+            "p99": self.quantile(.99),
+            "max": self.max,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "zeros": self.zeros,
+            "buckets": {str(bucket): hits for bucket, hits in self.buckets.items()},
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'Distribution':
+        distribution = Distribution()
+        for field in ("count", "mean", "m2", "min", "max", "zeros"):
+            setattr(distribution, field, data[field])
+        distribution.buckets = {int(bucket): hits for bucket, hits in data["buckets"].items()}
+        return distribution
+
+
+class Aggregator:
+    # Counts of the causes of the games' ends, and a Distribution of each
+    # of METRICS; ticks_per_egg gets one value per egg, the others one per
+    # game. With a checkpoint path, the aggregator saves itself there every
+    # checkpoint_every games (added or merged): load it back to resume.
+    METRICS = ("ticks", "length", "eggs", "ticks_per_egg")
+
+    games: int
+    causes: Counter
+    metrics: Dict[str, Distribution]
+    checkpoint: Optional[str]
+    checkpoint_every: int
+    _saved_at: int
+
+    def __init__(self, checkpoint: Optional[str] = None, checkpoint_every: int = 10000):
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every should be at least 1")
+        self.games = 0
+        self.causes = Counter()
+        self.metrics = {metric: Distribution() for metric in self.METRICS}
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self._saved_at = 0
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        self.causes[result.cause] += 1
+        metrics = self.metrics
+        metrics["ticks"].add(result.ticks)
+        metrics["length"].add(result.length)
+        metrics["eggs"].add(result.eggs)
+        ticks_per_egg = metrics["ticks_per_egg"]
+        for ticks in result.egg_ticks:
+            ticks_per_egg.add(ticks)
+        self._maybe_save()
+
+    def add_all(self, results: Iterable[GameResult]) -> 'Aggregator':
+        for result in results:
+            self.add(result)
+        return self
+
+    def merge(self, other: 'Aggregator') -> None:
+        self.games += other.games
+        self.causes.update(other.causes)
+        for metric, distribution in other.metrics.items():
+            self.metrics[metric].merge(distribution)
+        self._maybe_save()
+
+    @property
+    def won(self) -> int:
+        return self.causes[WON]
+
+    @property
+    def lost(self) -> int:
+        return self.causes[BIT_ITSELF] + self.causes[HIT_WALL]
+
+    def summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "games": self.games,
+            "won": self.won,
+            "lost": self.lost,
+            "causes": dict(self.causes),
+        }
+        for metric, distribution in self.metrics.items():
+            summary[metric] = distribution.summary()
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "games": self.games,
+            "causes": dict(self.causes),
+            "metrics": {metric: distribution.to_dict()
+                        for metric, distribution in self.metrics.items()},
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'Aggregator':
+        aggregator = Aggregator()
+        aggregator.games = data["games"]
+        aggregator.causes = Counter(data["causes"])
+        for metric, distribution in data["metrics"].items():
+            aggregator.metrics[metric] = Distribution.from_dict(distribution)
+        return aggregator
+
+    def save(self, path: Optional[str] = None) -> None:
+        # Written next to the target then renamed over it: a crash while
+        # saving leaves the previous checkpoint whole
+        path = path or self.checkpoint
+        if path is None:
+            raise ValueError("no checkpoint path")
+        partial = path + ".partial"
+        with open(partial, "w") as out:
+            json.dump(self.to_dict(), out)
+        os.replace(partial, path)
+        self._saved_at = self.games
+
+    @staticmethod
+    def load(path: str, checkpoint_every: int = 10000) -> 'Aggregator':
+        # Resumes from a checkpoint, saving back to it
+        with open(path) as source:
+            aggregator = Aggregator.from_dict(json.load(source))
+        aggregator.checkpoint = path
+        aggregator.checkpoint_every = checkpoint_every
+        aggregator._saved_at = aggregator.games
+        return aggregator
+
+    def _maybe_save(self) -> None:
+        if self.checkpoint is not None and self.games - self._saved_at >= self.checkpoint_every:
+            self.save()
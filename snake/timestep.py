@@ -0,0 +1,70 @@
+from time import perf_counter_ns
+from typing import Callable, Optional
+
+# Pacing of Game.run, apart from the UI: the game logic ticks on a fixed
+# timestep of wall time, frames are drawn at their own, capped rate.
+#
+#   Game(ui, timestep=Timestep(tick_rate=5, fps=60))     # a game to play
+#   Game(ui, timestep=Timestep(tick_rate=15, fps=60))    # a harder one
+#   Game(ui, timestep=Timestep(tick_rate=None, fps=30))  # flat out, watched
+#   Game(ui, timestep=Timestep(tick_rate=None, fps=0))   # flat out, unseen
+
+
+class Timestep:
+    # tick_rate: logic ticks per second, None for as fast as possible.
+    # fps: frames per second at most, None for a frame after every tick
+    # (or batch of ticks), 0 for none at all. A frame is only drawn when
+    # the game moved since the last one.
+    # A game falling behind (a slow frame, a busy machine) catches up by
+    # running late ticks back to back, max_catch_up at most: past that, the
+    # time is given up and counted in the game's TimestepStats, instead of
+    # the game racing.
+    # Between ticks and frames the game waits through the UI's wait, so
+    # that it can take input in, or through sleep when given (tests).
+    # A Timestep is only configuration: several games can share one.
+    tick_rate: Optional[float]
+    fps: Optional[float]
+    max_catch_up: int
+    clock: Callable[[], int]
+    sleep: Optional[Callable[[float], None]]
+
+    def __init__(self,
+                 tick_rate: Optional[float] = 5,
+                 fps: Optional[float] = None,
+                 max_catch_up: int = 5,
+                 clock: Callable[[], int] = perf_counter_ns,
+                 sleep: Optional[Callable[[float], None]] = None):
+        if tick_rate is not None and tick_rate <= 0:
+            raise ValueError("tick_rate should be positive, or None")
+        if fps is not None and fps < 0:
+            raise ValueError("fps should be positive, 0 or None")
+        if max_catch_up < 1:
+            raise ValueError("max_catch_up should be at least 1")
+        self.tick_rate = tick_rate
+        self.fps = fps
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.sleep = sleep
+
+    @property
+    def tick_ns(self) -> int:
+        return int(1e9 / self.tick_rate) if self.tick_rate else 0
+
+    @property
+    def frame_ns(self) -> int:
+        return int(1e9 / self.fps) if self.fps else 0
+
+    @property
+    def renders(self) -> bool:
+        return self.fps != 0
+
+
+class TimestepStats:
+    # What a game run on a Timestep did: the ticks it played, the frames
+    # it drew, and the ticks it dropped to get back on schedule.
+    __slots__ = ('ticks', 'frames', 'dropped')
+
+    def __init__(self) -> None:
+        self.ticks = 0
+        self.frames = 0
+        self.dropped = 0
@@ -0,0 +1,84 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from .direction import TURNS, Direction
+from .types import Position
+
+# Where a move leads: WALL when it hits a solid edge or an obstacle
+WALL = None
+
+OBSTACLE = "#"
+
+
+class Topology:
+    # Board shape compiled into next-cell tables, built once: for every
+    # direction, table[y * width + x] is the position a move from (x, y)
+    # leads to, or WALL. Moving is then one lookup, whatever the shape.
+    # Obstacles are never free: moving into one is hitting a wall, and
+    # eggs are not placed on them.
+    # Tables hold one reference per cell and direction, e.g. 3MB for a
+    # 100x100 board: boards without a topology use torus arithmetic.
+    __slots__ = ('width', 'height', 'wrap', 'obstacles', 'tables')
+    width: int
+    height: int
+    wrap: bool
+    obstacles: FrozenSet[Position]
+    tables: Dict[Direction, List[Optional[Position]]]
+
+    def __init__(self, width: int, height: int, wrap: bool = True,
+                 obstacles: Iterable[Position] = ()):
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.obstacles = frozenset(obstacles)
+        if any(not (0 <= x < width and 0 <= y < height) for x, y in self.obstacles):
+            raise ValueError("obstacles should be on the board")
+
+        # One tuple per cell, shared by all the tables
+        cells: List[Optional[Position]] = [
+            None if (x, y) in self.obstacles else (x, y)
+            for y in range(height) for x in range(width)]
+        self.tables = {}
+        for turn in TURNS:
+            table: List[Optional[Position]] = []
+            for y in range(height):
+                for x in range(width):
+                    next_x, next_y = x + turn.x, y + turn.y
+                    if not (0 <= next_x < width and 0 <= next_y < height):
+                        if not wrap:
+                            table.append(WALL)
+                            continue
+                        next_x %= width
+                        next_y %= height
+                    table.append(cells[next_y * width + next_x])
+            self.tables[turn] = table
+
+    @staticmethod
+    def walls(width: int, height: int, obstacles: Iterable[Position] = ()) -> 'Topology':
+        return Topology(width, height, wrap=False, obstacles=obstacles)
+
+    @staticmethod
+    def parse(text: str, wrap: bool = False) -> 'Topology':
+        # One line per row, '#' for an obstacle, any other character for a
+        # free cell; blank lines are skipped. Rows should have equal lengths.
+        rows = [line.rstrip("\n") for line in text.splitlines() if line.strip()]
+        if not rows:
+            raise ValueError("empty obstacle map")
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError("all the rows of an obstacle map should have the same length")
+        return Topology(width, len(rows), wrap=wrap,
+                        obstacles=[(x, y) for y, row in enumerate(rows)
+                                   for x, char in enumerate(row) if char == OBSTACLE])
+
+    @staticmethod
+    def load(path: str, wrap: bool = False) -> 'Topology':
+        with open(path) as map_file:
+            return Topology.parse(map_file.read(), wrap)
+
+    @property
+    def playable(self) -> int:
+        # Number of cells a snake can be on
+        return self.width * self.height - len(self.obstacles)
+
+    def neighbour(self, position: Position, direction: Direction) -> Optional[Position]:
+        return self.tables[direction][position[1] * self.width + position[0]]
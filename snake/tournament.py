@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from importlib import import_module
+from itertools import islice
+from random import Random
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .game import STOPPED, DrawMode, Game, GameResult, RandomEggCreator
+from .stats import Aggregator
+from .ui.headless import HeadlessUi, Policy
+
+# Plays many seeded headless games, possibly across processes.
+# A game only depends on its seed: eggs come from Random(2 * seed), and
+# when no policy is given the input is random turns from Random(2 * seed + 1).
+# Results come back in seed order, whatever the number of workers.
+# For millions of games, aggregate keeps only running statistics: each
+# worker aggregates its chunk, the chunks merge as they come back.
+
+
+@dataclass(frozen=True)
+class SeedResult:
+    seed: int
+    won: bool
+    lost: bool
+    ticks: int
+    length: int
+    eggs: int
+    cause: str = STOPPED
+
+
+def play_game(seed: int,
+              policy: Optional[Policy] = None,
+              size: int = 20,
+              max_ticks: Optional[int] = None) -> GameResult:
+    if policy is not None:
+        ui = HeadlessUi(policy=policy)
+    else:
+        ui = HeadlessUi(rng=Random(2 * seed + 1))
+    game = Game(ui=ui,
+                iterations=max_ticks,
+                size=size,
+                egg_creator=RandomEggCreator(size, Random(2 * seed)),
+                draw_mode=DrawMode.VIEW)
+    game.run()
+    return game.result()
+
+
+def play(seed: int,
+         policy: Optional[Policy] = None,
+         size: int = 20,
+         max_ticks: Optional[int] = None) -> SeedResult:
+    result = play_game(seed, policy, size, max_ticks)
+    return SeedResult(seed=seed,
+                      won=result.won,
+                      lost=result.lost,
+                      ticks=result.ticks,
+                      length=result.length,
+                      eggs=result.eggs,
+                      cause=result.cause)
+
+
+def _play_chunk(args: Tuple[List[int], Optional[Policy], int, Optional[int]]) -> List[SeedResult]:
+    seeds, policy, size, max_ticks = args
+    return [play(seed, policy, size, max_ticks) for seed in seeds]
+
+
+def _aggregate_chunk(args: Tuple[List[int], Optional[Policy], int, Optional[int]]) -> Aggregator:
+    seeds, policy, size, max_ticks = args
+    return Aggregator().add_all(play_game(seed, policy, size, max_ticks) for seed in seeds)
+
+
+def _chunks(seeds: Iterable[int], chunk_size: int) -> Iterator[List[int]]:
+    iterator = iter(seeds)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_tournament(seeds: Iterable[int],
+                   policy: Optional[Policy] = None,
+                   size: int = 20,
+                   max_ticks: Optional[int] = None,
+                   workers: int = 1,
+                   chunk_size: int = 64) -> Iterator[SeedResult]:
+    # Seeds are sent in chunks so that a worker plays many games per
+    # round-trip; the policy must be picklable (a module-level function).
+    tasks = ((chunk, policy, size, max_ticks) for chunk in _chunks(seeds, chunk_size))
+    if workers <= 1:
+        for task in tasks:
+            yield from _play_chunk(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(_play_chunk, tasks):
+            yield from results
+
+
+def aggregate(seeds: Iterable[int],
+              policy: Optional[Policy] = None,
+              size: int = 20,
+              max_ticks: Optional[int] = None,
+              workers: int = 1,
+              chunk_size: int = 64,
+              aggregator: Optional[Aggregator] = None) -> Aggregator:
+    # Merges into aggregator when given, e.g. one with a checkpoint.
+    # Chunks merge in seed order: after n games, the first n seeds are in.
+    aggregator = aggregator or Aggregator()
+    tasks = ((chunk, policy, size, max_ticks) for chunk in _chunks(seeds, chunk_size))
+    if workers <= 1:
+        for task in tasks:
+            aggregator.merge(_aggregate_chunk(task))
+        return aggregator
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in executor.map(_aggregate_chunk, tasks):
+            aggregator.merge(chunk)
+    return aggregator
+
+
+def summarize(results: Iterable[SeedResult]) -> Dict[str, Any]:
+    games = won = lost = ticks = length = eggs = 0
+    for result in results:
+        games += 1
+        won += result.won
+        lost += result.lost
+        ticks += result.ticks
+        length += result.length
+        eggs += result.eggs
+    return {
+        "games": games,
+        "won": won,
+        "lost": lost,
+        "mean_ticks": ticks / games if games else 0.0,
+        "mean_length": length / games if games else 0.0,
+        "mean_eggs": eggs / games if games else 0.0,
+    }
+
+
+def load_policy(path: str) -> Policy:
+    module, _, name = path.partition(":")
+    policy: Policy = getattr(import_module(module), name)
+    return policy
+
+
+def _seed_range(value: str) -> range:
+    start, _, stop = value.partition(":")
+    return range(int(start), int(stop)) if stop else range(int(start))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Play many seeded headless snake games.")
+    parser.add_argument("--policy", help="module:function, random turns when omitted")
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--seeds", type=_seed_range, default=range(100),
+                        help="N or START:STOP (default: 100)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--max-ticks", type=int, default=None)
+    parser.add_argument("--results", action="store_true",
+                        help="stream one JSON line per game before the summary")
+    parser.add_argument("--checkpoint", help="save the statistics there as the games go")
+    parser.add_argument("--checkpoint-every", type=int, default=10000)
+    parser.add_argument("--resume", action="store_true",
+                        help="start from the checkpoint, skipping the seeds it has")
+    args = parser.parse_args(argv)
+
+    policy = load_policy(args.policy) if args.policy else None
+    if not args.results:
+        seeds = args.seeds
+        if args.resume and args.checkpoint and os.path.exists(args.checkpoint):
+            aggregator = Aggregator.load(args.checkpoint, args.checkpoint_every)
+            seeds = seeds[aggregator.games:]
+        else:
+            aggregator = Aggregator(args.checkpoint, args.checkpoint_every)
+        aggregate(seeds, policy, args.size, args.max_ticks, args.workers, args.chunk_size,
+                  aggregator)
+        if args.checkpoint:
+            aggregator.save()
+        print(json.dumps(aggregator.summary()))
+        return
+
+    results = run_tournament(args.seeds, policy, args.size, args.max_ticks,
+                             args.workers, args.chunk_size)
+
+    def stream() -> Iterator[SeedResult]:
+        for result in results:
+            print(json.dumps(asdict(result)))
+            yield result
+
+    print(json.dumps(summarize(stream())))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main(sys.argv[1:])
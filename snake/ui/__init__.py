@@ -0,0 +1,34 @@
+from importlib import import_module
+from typing import Any, Dict, Tuple
+
+# Registry of the UI backends, by name. Backends are only imported when
+# asked for, so that optional dependencies such as pygame stay optional.
+_BACKENDS: Dict[str, Tuple[str, str]] = {
+    "headless": ("snake.ui.headless", "HeadlessUi"),
+    "pygame": ("snake.ui.pygame", "PygameUi"),
+    "term": ("snake.ui.term", "TermUi"),
+}
+
+
+def register_backend(name: str, module: str, attribute: str) -> None:
+    _BACKENDS[name] = (module, attribute)
+
+
+def backends() -> Tuple[str, ...]:
+    return tuple(_BACKENDS)
+
+
+def get_backend(name: str) -> Any:
+    try:
+        module, attribute = _BACKENDS[name]
+    except KeyError:
+        raise ValueError("unknown UI backend {!r}, pick one of {}".format(
+            name, ", ".join(_BACKENDS))) from None
+    return getattr(import_module(module), attribute)
+
+
+def __getattr__(name: str) -> Any:
+    for module, attribute in _BACKENDS.values():
+        if attribute == name:
+            return getattr(import_module(module), attribute)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
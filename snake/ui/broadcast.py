@@ -0,0 +1,291 @@
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+from ..direction import Direction
+from ..types import Position
+from .protocol import UiProtocol
+
+# One game, any number of spectator processes: BroadcastUi publishes every
+# frame into shared memory once, readers attach by name and never talk to
+# the game. Shared memory layout:
+#   header:   magic, width, height, slots, closed (<4sHHII), then the
+#             begin and end counters (2 x uint64): frame number being
+#             written, and last frame fully written
+#   ring:     slots records of (seq, head, tail, egg, flags) (<QIIII),
+#             frame seq in slot seq % slots; cells are y * width + x
+#   grid:     the board as of the end counter, one byte per cell
+# The game never waits for readers: a reader falling more than a ring
+# behind loses frames, and catches up from the grid.
+#
+#   game:       ui = BroadcastUi(20, name="snake-live"); Game(ui, draw_mode=DrawMode.DELTA)
+#   spectator:  spectate(BroadcastReader("snake-live"), PygameUi(20))
+
+MAGIC = b"SNKB"
+_HEADER = struct.Struct("<4sHHII")
+_COUNTERS = 16
+_RING = 32
+_SLOT = struct.Struct("<QIIII")
+NO_CELL = 0xFFFFFFFF
+FULL = 1
+
+# Cell codes in the grid, the same as snake.env observations
+EMPTY, BODY, HEAD, EGG = range(4)
+
+
+@dataclass(frozen=True)
+class Frame:
+    # full: the whole board was redrawn, only the grid has it
+    seq: int
+    head: Position
+    tail: Optional[Position]
+    egg: Position
+    full: bool
+
+
+def _attach(name: str) -> SharedMemory:
+    # Before Python 3.13 (and its track=False), attaching registers the
+    # memory with this process' resource tracker, which would destroy it
+    # on exit, under the game's feet
+    if sys.version_info >= (3, 13):  # pragma: no cover
+        return SharedMemory(name, track=False)  # type: ignore
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None  # type: ignore
+    try:
+        return SharedMemory(name)
+    finally:
+        resource_tracker.register = register  # type: ignore
+
+
+class BroadcastUi(UiProtocol):
+    # Use DrawMode.DELTA: then a tick writes one ring slot and three grid
+    # cells, whatever the number of readers and the length of the snake.
+    # Input comes from ui when given (which also gets every draw, e.g. the
+    # player's own window), the snake keeps going otherwise.
+    _memory: SharedMemory
+    _buffer: memoryview
+    _counters: 'np.ndarray'
+    _grid: 'np.ndarray'
+    _ui: Optional[UiProtocol]
+    _head: Optional[int]
+    _egg: Optional[int]
+    seq: int
+
+    def __init__(self,
+                 width: int,
+                 height: Optional[int] = None,
+                 slots: int = 256,
+                 name: Optional[str] = None,
+                 ui: Optional[UiProtocol] = None):
+        if slots < 2:
+            raise ValueError("slots should be at least 2")
+        self._width = width
+        self._height = height or width
+        self._slots = slots
+        grid_offset = _RING + slots * _SLOT.size
+        self._memory = SharedMemory(name=name, create=True,
+                                    size=grid_offset + self._width * self._height)
+        self._buffer = self._memory.buf  # type: ignore
+        buffer = self._buffer
+        _HEADER.pack_into(buffer, 0, MAGIC, self._width, self._height, slots, 0)
+        self._counters = np.ndarray((2,), dtype=np.uint64, buffer=buffer, offset=_COUNTERS)
+        self._counters[:] = 0
+        self._grid = np.ndarray((self._width * self._height,), dtype=np.uint8,
+                                buffer=buffer, offset=grid_offset)
+        self._grid[:] = EMPTY
+        self._ui = ui
+        self._head = None
+        self._egg = None
+        self.seq = 0
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        seq = self._begin()
+        grid = self._grid
+        grid[:] = EMPTY
+        width = self._width
+        head = None
+        for x, y in snake:
+            cell = y * width + x
+            if head is None:
+                head = cell
+            grid[cell] = BODY
+        if head is not None:
+            grid[head] = HEAD
+        self._head = head
+        self._egg = egg[1] * width + egg[0]
+        grid[self._egg] = EGG
+        self._end(seq, NO_CELL if head is None else head, NO_CELL, FULL)
+        if self._ui is not None:
+            self._ui.draw(snake, egg)
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        seq = self._begin()
+        grid = self._grid
+        width = self._width
+        tail_cell = NO_CELL
+        if tail is not None:
+            tail_cell = tail[1] * width + tail[0]
+            grid[tail_cell] = EMPTY
+        if self._head is not None:
+            grid[self._head] = BODY
+        head_cell = head[1] * width + head[0]
+        grid[head_cell] = HEAD
+        egg_cell = egg[1] * width + egg[0]
+        if egg_cell != self._egg:
+            grid[egg_cell] = EGG
+            self._egg = egg_cell
+        self._head = head_cell
+        self._end(seq, head_cell, tail_cell, 0)
+        if self._ui is not None:
+            self._ui.draw_delta(head, tail, egg)
+
+    def direction(self) -> Direction:
+        if self._ui is not None:
+            return self._ui.direction()
+        return Direction.DEFAULT
+
+    def close(self) -> None:
+        # Tells the readers, then frees the memory: readers still attached
+        # keep their mapping until they close
+        _HEADER.pack_into(self._buffer, 0, MAGIC, self._width, self._height, self._slots, 1)
+        del self._counters
+        del self._grid
+        del self._buffer
+        self._memory.close()
+        self._memory.unlink()
+
+    def _begin(self) -> int:
+        self.seq += 1
+        self._counters[0] = self.seq
+        return self.seq
+
+    def _end(self, seq: int, head: int, tail: int, flags: int) -> None:
+        # The slot is marked invalid while being written, then stamped
+        buffer = self._buffer
+        offset = _RING + (seq % self._slots) * _SLOT.size
+        _SLOT.pack_into(buffer, offset, 0, head, tail, self._egg or 0, flags)
+        struct.pack_into("<Q", buffer, offset, seq)
+        self._counters[1] = seq
+
+
+class BroadcastReader:
+    # Attaches to a BroadcastUi by name. grid is a live, read-only view of
+    # the shared board (no copy, may change while being read); snapshot is
+    # a consistent copy. poll returns the frames published since the last
+    # poll; when some were overwritten before being read, they are counted
+    # in skipped and the reader jumps to the oldest frame still there.
+    # Views of the memory must be gone before close.
+    skipped: int
+    _memory: SharedMemory
+    _buffer: memoryview
+    _last: int
+
+    def __init__(self, name: str, from_start: bool = False):
+        self._memory = _attach(name)
+        self._buffer = self._memory.buf  # type: ignore
+        buffer = self._buffer
+        magic, self.width, self.height, self.slots, _ = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            del buffer, self._buffer
+            self._memory.close()
+            raise ValueError("not a snake broadcast: {}".format(name))
+        self._counters = np.ndarray((2,), dtype=np.uint64, buffer=buffer, offset=_COUNTERS)
+        grid = np.ndarray((self.height, self.width), dtype=np.uint8, buffer=buffer,
+                          offset=_RING + self.slots * _SLOT.size)
+        grid.flags.writeable = False
+        self.grid = grid
+        self.skipped = 0
+        self._last = 0 if from_start else self.seq
+
+    @property
+    def seq(self) -> int:
+        # Last frame published
+        return int(self._counters[1])
+
+    @property
+    def closed(self) -> bool:
+        return bool(_HEADER.unpack_from(self._buffer)[4])
+
+    def snapshot(self) -> Tuple[int, 'np.ndarray']:
+        # (seq, grid copy) of a frame no write was in the middle of
+        while True:
+            seq = int(self._counters[1])
+            grid = self.grid.copy()
+            if int(self._counters[0]) == seq:
+                return seq, grid
+
+    def poll(self) -> List[Frame]:
+        end = self.seq
+        # The writer may be writing slot end + 1 already: one slot less
+        oldest = end - self.slots + 2
+        if self._last + 1 < oldest:
+            self.skipped += oldest - self._last - 1
+            self._last = oldest - 1
+        frames = []
+        buffer = self._buffer
+        width = self.width
+        for seq in range(self._last + 1, end + 1):
+            offset = _RING + (seq % self.slots) * _SLOT.size
+            stamp, head, tail, egg, flags = _SLOT.unpack_from(buffer, offset)
+            if stamp != seq or struct.unpack_from("<Q", buffer, offset)[0] != seq:
+                # Overwritten while reading: lapped by the writer
+                self.skipped += 1
+                continue
+            frames.append(Frame(seq,
+                                (head % width, head // width),
+                                None if tail == NO_CELL else (tail % width, tail // width),
+                                (egg % width, egg // width),
+                                bool(flags & FULL)))
+        self._last = end
+        return frames
+
+    def close(self) -> None:
+        del self._counters
+        del self.grid
+        del self._buffer
+        self._memory.close()
+
+
+def board(grid: 'np.ndarray') -> Tuple[List[Position], Optional[Position]]:
+    # Snake cells (head first, the rest in no particular order) and egg of
+    # a grid from BroadcastReader
+    heads = np.argwhere(grid == HEAD)
+    body = np.argwhere(grid == BODY)
+    eggs = np.argwhere(grid == EGG)
+    snake = [(int(x), int(y)) for y, x in heads] + [(int(x), int(y)) for y, x in body]
+    egg = (int(eggs[0][1]), int(eggs[0][0])) if len(eggs) else None
+    return snake, egg
+
+
+def spectate(reader: BroadcastReader, ui: UiProtocol, interval: float = .005) -> None:
+    # Plays a broadcast on ui until the game closes it: full draws from a
+    # snapshot at first, after full frames and after skipping frames, then
+    # the deltas since
+    shown = 0
+    skipped = -1
+    while True:
+        closed = reader.closed
+        frames = reader.poll()
+        if reader.skipped != skipped or any(frame.full for frame in frames):
+            skipped = reader.skipped
+            shown, grid = reader.snapshot()
+            snake, egg = board(grid)
+            if egg is not None:
+                ui.draw(snake, egg)
+        for frame in frames:
+            if frame.seq > shown:
+                ui.draw_delta(frame.head, frame.tail, frame.egg)
+                shown = frame.seq
+        if closed:
+            return
+        time.sleep(interval)
@@ -0,0 +1,52 @@
+from random import Random
+from typing import Callable, Iterable, Iterator, Optional
+
+from ..direction import TURNS, Direction
+from ..types import Position
+from .protocol import UiProtocol
+
+Policy = Callable[[Iterable[Position], Position], Direction]
+
+
+class HeadlessUi(UiProtocol):
+    # UI that renders nothing, for simulations and tests.
+    # Input comes from one of:
+    # - script: a fixed sequence of directions, then DEFAULT forever
+    # - policy: a callable given the last drawn snake and egg
+    #   (use DrawMode.VIEW so that the game does not copy the snake for it)
+    # - rng: a uniformly random turn every tick
+    # With none of them, the snake just keeps going.
+    _script: Optional[Iterator[Direction]]
+    _policy: Optional[Policy]
+    _rng: Optional[Random]
+    _snake: Iterable[Position]
+    _egg: Position
+
+    def __init__(self,
+                 script: Optional[Iterable[Direction]] = None,
+                 policy: Optional[Policy] = None,
+                 rng: Optional[Random] = None):
+        if sum(source is not None for source in (script, policy, rng)) > 1:
+            raise ValueError("pick at most one of script, policy and rng")
+        self._script = iter(script) if script is not None else None
+        self._policy = policy
+        self._rng = rng
+        self._snake = []
+        self._egg = (0, 0)
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        self._snake = snake
+        self._egg = egg
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        # With DrawMode.DELTA the first draw got a live view of the snake
+        self._egg = egg
+
+    def direction(self) -> Direction:
+        if self._script is not None:
+            return next(self._script, Direction.DEFAULT)
+        if self._policy is not None:
+            return self._policy(self._snake, self._egg)
+        if self._rng is not None:
+            return self._rng.choice(TURNS)
+        return Direction.DEFAULT
@@ -0,0 +1,90 @@
+from collections import deque
+from time import perf_counter_ns
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from ..direction import OPPOSITES, TURNS, Direction
+from ..instrumentation import PhaseStats
+from ..types import Position
+
+
+def step_direction(start: Position, end: Position, width: int, height: int) -> Optional[Direction]:
+    # Direction from a cell to its neighbour, across the edges too, e.g. to
+    # track the heading of the snake from what is drawn
+    for direction in TURNS:
+        if ((start[0] + direction.x) % width, (start[1] + direction.y) % height) == end:
+            return direction
+    return None
+
+
+class InputBuffer:
+    # Bounded queue of timestamped turns, between the UI events and the
+    # game ticks. Every turn pressed is kept, in order, and each tick takes
+    # at most one: a quick UP then LEFT plays over two ticks instead of the
+    # LEFT being lost. Turns that would do nothing when their tick comes
+    # (same as, or opposite to the current heading) are skipped then.
+    # When full, new turns are dropped: the oldest intent wins.
+    #
+    # Latency is from the key press to the frame showing its effect: call
+    # rendered once that frame is on screen.
+    capacity: int
+    dropped: int
+    skipped: int
+    applied: int
+    latency: PhaseStats
+    _turns: Deque[Tuple[Direction, int]]
+    _applied_at: Optional[int]
+    _clock: Callable[[], int]
+
+    def __init__(self, capacity: int = 4, clock: Callable[[], int] = perf_counter_ns):
+        if capacity < 1:
+            raise ValueError("capacity should be at least 1")
+        self.capacity = capacity
+        self.dropped = 0
+        self.skipped = 0
+        self.applied = 0
+        self.latency = PhaseStats()
+        self._turns = deque()
+        self._applied_at = None
+        self._clock = clock
+
+    def push(self, direction: Direction, timestamp_ns: Optional[int] = None) -> bool:
+        # Returns False when the turn is dropped
+        if len(self._turns) >= self.capacity:
+            self.dropped += 1
+            return False
+        self._turns.append((direction, self._clock() if timestamp_ns is None else timestamp_ns))
+        return True
+
+    def pop(self, heading: Optional[Direction]) -> Direction:
+        # The next turn to play when going towards heading, DEFAULT if none
+        while self._turns:
+            direction, timestamp = self._turns.popleft()
+            if heading is not None and (direction is heading or OPPOSITES.get(heading) is direction):
+                self.skipped += 1
+                continue
+            self.applied += 1
+            self._applied_at = timestamp
+            return direction
+        return Direction.DEFAULT
+
+    def rendered(self) -> None:
+        if self._applied_at is not None:
+            self.latency.add(self._clock() - self._applied_at)
+            self._applied_at = None
+
+    def clear(self) -> None:
+        self._turns.clear()
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "pending": len(self._turns),
+            "applied": self.applied,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+            "latency_mean_ns": self.latency.mean_ns,
+            "latency_p50_ns": self.latency.quantile(.5),
+            "latency_p99_ns": self.latency.quantile(.99),
+        }
+
+    def __len__(self) -> int:
+        return len(self._turns)
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from time import sleep
 from typing import Iterable, Optional, Protocol
 
 from ..direction import Direction
@@ -13,3 +14,31 @@ class UiProtocol(Protocol):
     @abstractmethod
     def direction(self) -> Direction:  # pragma: no cover
         raise NotImplementedError
+
+    # Optional, used with DrawMode.DELTA: after a first full draw, only the
+    # cells that changed are sent. tail is the cell the snake left, None
+    # when it grew; egg is sent every tick, it may not have moved. A UI
+    # without it gets a full draw on every tick instead.
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        raise NotImplementedError
+
+    # Optional, used by games paced by a Timestep: called while the game
+    # waits for its next tick or frame, for timeout seconds. A UI can take
+    # its input in meanwhile.
+    def wait(self, timeout: float) -> None:
+        sleep(timeout)
+
+
+class AsyncUiProtocol(Protocol):
+    # UiProtocol for AsyncGame: same calls, awaited, so that a UI can do
+    # I/O (network, queues) without blocking the event loop.
+    @abstractmethod
+    async def draw(self, snake: Iterable[Position], egg: Position) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+    @abstractmethod
+    async def direction(self) -> Direction:  # pragma: no cover
+        raise NotImplementedError
+
+    async def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:  # pragma: no cover
+        raise NotImplementedError
@@ -1,6 +1,7 @@
 import random
 import sys
 from itertools import product
+from time import perf_counter_ns
 from typing import Iterable, Optional, Tuple, Type
 
 import pygame  # type: ignore
@@ -8,52 +9,122 @@ from pygame import constants  # type: ignore
 
 from ..direction import Direction
 from ..types import Position
+from .input import InputBuffer, step_direction
 from .protocol import UiProtocol
+from .style import BLACK, CELL_SIZE, WHITE, YELLOW, Color
 
-CELL_SIZE = 20
-BLACK = (0, 0, 0)
-WHITE = (255, 255, 255)
-YELLOW = (255, 255, 0)
-Color = Tuple[int, int, int]
+KEYS = {
+    constants.K_UP: Direction.UP,
+    constants.K_DOWN: Direction.DOWN,
+    constants.K_LEFT: Direction.LEFT,
+    constants.K_RIGHT: Direction.RIGHT,
+}
+# How often input is polled while waiting for the next frame
+POLL_MS = 2
 
 
 class PygameUi(UiProtocol):
-    def __init__(self, size: int):
+    # Arrow keys go to an InputBuffer (see ui.input), which the game takes
+    # one turn per tick from. While waiting, instead of sleeping, the UI
+    # keeps polling events, so that key presses are timestamped within
+    # POLL_MS of happening: pygame events carry no timestamp of their own.
+    # fps caps the frames of games run without a Timestep; give fps=None
+    # to a game paced by one, the Timestep caps its frames itself.
+    input: InputBuffer
+    _heading: Optional[Direction]
+    _head: Optional[Position]
+
+    def __init__(self,
+                 width: int,
+                 height: Optional[int] = None,
+                 fps: Optional[float] = 5,
+                 input_capacity: int = 4):
         pygame.init()
+        self._width = width
+        self._height = height or width
         self.screen = pygame.display.set_mode(
-            (size * CELL_SIZE, size * CELL_SIZE))
-        self.clock = pygame.time.Clock()
+            (self._width * CELL_SIZE, self._height * CELL_SIZE))
         self.screen.fill(BLACK)
+        self.input = InputBuffer(input_capacity)
+        self._frame_ns = int(1e9 / fps) if fps else 0
+        self._next_frame = perf_counter_ns()
+        self._egg: Optional[Position] = None
+        self._heading = None
+        self._head = None
 
-    def draw_cell(self, position: Position, color: Color) -> None:
+    def draw_cell(self, position: Position, color: Color) -> 'pygame.Rect':
         x = position[0] * CELL_SIZE
         y = position[1] * CELL_SIZE
-        pygame.draw.rect(self.screen, color, pygame.Rect(
-            x, y, CELL_SIZE, CELL_SIZE))
+        rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
+        self.screen.fill(color, rect)
+        return rect
 
-    def direction(self) -> Direction:
+    def poll(self) -> None:
+        # Moves the pending key presses to the input buffer
+        now = perf_counter_ns()
         for event in pygame.event.get():
             if event.type == constants.KEYDOWN:
                 if event.key == constants.K_q:
                     pygame.display.quit()
                     pygame.quit()
                     sys.exit()
-                elif event.key == constants.K_UP:
-                    return Direction.UP
-                elif event.key == constants.K_DOWN:
-                    return Direction.DOWN
-                elif event.key == constants.K_LEFT:
-                    return Direction.LEFT
-                elif event.key == constants.K_RIGHT:
-                    return Direction.RIGHT
-        return Direction.DEFAULT
+                elif event.key in KEYS:
+                    self.input.push(KEYS[event.key], now)
+
+    def direction(self) -> Direction:
+        self.poll()
+        direction = self.input.pop(self._heading)
+        if direction is not Direction.DEFAULT:
+            self._heading = direction
+        return direction
 
     def draw(self, snake: Iterable[Position], egg: Position) -> None:
         self.screen.fill(BLACK)
 
+        head = neck = None
         for position in snake:
+            if head is None:
+                head = position
+            elif neck is None:
+                neck = position
             self.draw_cell(position, WHITE)
         self.draw_cell(egg, YELLOW)
+        self._egg = egg
+        if head is not None and neck is not None:
+            self._heading = step_direction(neck, head, self._width, self._height)
+        self._head = head
 
         pygame.display.update()
-        self.clock.tick(5)
+        self._end_frame()
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        # Only the (at most three) changed cells are painted and pushed to
+        # the display, instead of the whole window
+        dirty = []
+        if tail is not None:
+            dirty.append(self.draw_cell(tail, BLACK))
+        dirty.append(self.draw_cell(head, WHITE))
+        if egg != self._egg:
+            dirty.append(self.draw_cell(egg, YELLOW))
+            self._egg = egg
+        if self._head is not None and self._head != head:
+            self._heading = step_direction(self._head, head, self._width, self._height)
+        self._head = head
+
+        pygame.display.update(dirty)
+        self._end_frame()
+
+    def wait(self, timeout: float) -> None:
+        deadline = perf_counter_ns() + int(timeout * 1e9)
+        while True:
+            self.poll()
+            left_ms = (deadline - perf_counter_ns()) // 1_000_000
+            if left_ms <= 0:
+                break
+            pygame.time.wait(min(left_ms, POLL_MS))
+
+    def _end_frame(self) -> None:
+        # The frame is on screen: the turn played last is now visible
+        self.input.rendered()
+        self.wait(max(self._next_frame - perf_counter_ns(), 0) / 1e9)
+        self._next_frame = max(self._next_frame, perf_counter_ns()) + self._frame_ns
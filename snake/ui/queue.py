@@ -0,0 +1,55 @@
+import asyncio
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from ..direction import Direction
+from ..types import Position
+from .protocol import AsyncUiProtocol
+
+Frame = Tuple[List[Position], Position]
+
+
+class QueueUi(AsyncUiProtocol):
+    # AsyncUiProtocol backed by asyncio queues, decoupling input from ticks:
+    # - producers (keyboard handlers, network readers...) put directions
+    #   on inputs whenever they arrive; each tick takes the latest one,
+    #   or keeps going when none came in
+    # - every frame is put on frames as a copy of the snake and the egg,
+    #   deltas included: they are applied to the body of the last frame.
+    # When a queue is full, its oldest item is dropped: the latest input
+    # wins, and the game never waits for its viewers.
+    inputs: 'asyncio.Queue[Direction]'
+    frames: 'asyncio.Queue[Frame]'
+    _body: Deque[Position]
+
+    def __init__(self, max_inputs: int = 16, max_frames: int = 1):
+        self.inputs = asyncio.Queue(max_inputs)
+        self.frames = asyncio.Queue(max_frames)
+        self._body = deque()
+
+    def put_direction(self, direction: Direction) -> None:
+        # Like inputs.put_nowait, dropping the oldest input when full
+        if self.inputs.full():
+            self.inputs.get_nowait()
+        self.inputs.put_nowait(direction)
+
+    async def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        self._body = deque(snake)
+        self._put((list(self._body), egg))
+
+    async def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        self._body.appendleft(head)
+        if tail is not None:
+            self._body.pop()
+        self._put((list(self._body), egg))
+
+    def _put(self, frame: Frame) -> None:
+        if self.frames.full():
+            self.frames.get_nowait()
+        self.frames.put_nowait(frame)
+
+    async def direction(self) -> Direction:
+        direction = Direction.DEFAULT
+        while not self.inputs.empty():
+            direction = self.inputs.get_nowait()
+        return direction
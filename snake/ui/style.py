@@ -0,0 +1,8 @@
+from typing import Tuple
+
+# Look of the graphical UIs, shared by PygameUi and the offscreen renderer
+CELL_SIZE = 20
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+YELLOW = (255, 255, 0)
+Color = Tuple[int, int, int]
@@ -0,0 +1,234 @@
+import atexit
+import os
+import select
+import sys
+import time
+from time import perf_counter_ns
+from typing import BinaryIO, Iterable, Optional
+
+from ..direction import Direction
+from ..types import Position
+from .input import InputBuffer, step_direction
+from .protocol import UiProtocol
+
+# ANSI terminal UI, e.g. to watch games over SSH. A cell is two columns
+# wide, painted with a background color; the board is framed by a border.
+# Only the cells that differ from what is on screen are written, each with
+# a cursor move and a color change when needed, all in one write per
+# frame: a tick costs tens of bytes, whatever the size of the board.
+
+KEYS = {
+    b"\x1b[A": Direction.UP,
+    b"\x1b[B": Direction.DOWN,
+    b"\x1b[C": Direction.RIGHT,
+    b"\x1b[D": Direction.LEFT,
+    # Same keys, in the terminal's application mode
+    b"\x1bOA": Direction.UP,
+    b"\x1bOB": Direction.DOWN,
+    b"\x1bOC": Direction.RIGHT,
+    b"\x1bOD": Direction.LEFT,
+}
+QUIT = b"q"
+
+EMPTY, SNAKE, EGG = range(3)
+# Background colors: terminal default, white, yellow
+COLORS = [b"\x1b[49m", b"\x1b[47m", b"\x1b[43m"]
+CELL = b"  "
+
+CLEAR = b"\x1b[2J"
+HIDE_CURSOR = b"\x1b[?25l"
+SHOW_CURSOR = b"\x1b[?25h"
+RESET = b"\x1b[0m"
+
+
+class TermUi(UiProtocol):
+    # The shadow frame holds the color of every cell as it is on screen.
+    # Arrow keys are read from stdin without blocking (the terminal is put
+    # in cbreak mode, and restored on close or exit) into an InputBuffer,
+    # like PygameUi. While waiting the UI waits on stdin, so that key
+    # presses are timestamped as they come. fps caps the frames of games
+    # run without a Timestep; give fps=None to a game paced by one, the
+    # Timestep caps its frames itself. out and stdin default to the
+    # process' own.
+    input: InputBuffer
+    _shadow: bytearray
+    _out: BinaryIO
+    _pending: bytearray
+    _color: Optional[int]
+    _cursor: Optional[int]
+    _termios: Optional[list]
+    _heading: Optional[Direction]
+    _head: Optional[Position]
+    _egg: Optional[Position]
+
+    def __init__(self,
+                 width: int,
+                 height: Optional[int] = None,
+                 fps: Optional[float] = 5,
+                 input_capacity: int = 4,
+                 out: Optional[BinaryIO] = None,
+                 stdin: Optional[int] = None):
+        self._width = width
+        self._height = height or width
+        self._out = out if out is not None else sys.stdout.buffer
+        self._stdin = stdin if stdin is not None else sys.stdin.fileno()
+        self._shadow = bytearray(self._width * self._height)
+        self._pending = bytearray()
+        self._color = None
+        self._cursor = None
+        self._keys = b""
+        self.input = InputBuffer(input_capacity)
+        self._frame_ns = int(1e9 / fps) if fps else 0
+        self._next_frame = perf_counter_ns()
+        self._heading = None
+        self._head = None
+        self._egg = None
+        self.bytes_written = 0
+        self._eof = False
+        self._closed = False
+        self._termios = None
+        if os.isatty(self._stdin):
+            import termios
+            import tty
+            self._termios = termios.tcgetattr(self._stdin)
+            tty.setcbreak(self._stdin)
+            atexit.register(self.close)
+        self._write_border()
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        # Diffed against the shadow frame like the deltas, so a full draw
+        # also only writes what changed
+        frame = bytearray(len(self._shadow))
+        width = self._width
+        head = neck = None
+        for position in snake:
+            if head is None:
+                head = position
+            elif neck is None:
+                neck = position
+            frame[position[1] * width + position[0]] = SNAKE
+        frame[egg[1] * width + egg[0]] = EGG
+        shadow = self._shadow
+        if frame != shadow:
+            for cell, color in enumerate(frame):
+                if shadow[cell] != color:
+                    self._paint(cell, color)
+        self._egg = egg
+        if head is not None and neck is not None:
+            self._heading = step_direction(neck, head, self._width, self._height)
+        self._head = head
+        self._end_frame()
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        width = self._width
+        if tail is not None:
+            self._set(tail[1] * width + tail[0], EMPTY)
+        self._set(head[1] * width + head[0], SNAKE)
+        if egg != self._egg:
+            self._set(egg[1] * width + egg[0], EGG)
+            self._egg = egg
+        if self._head is not None and self._head != head:
+            self._heading = step_direction(self._head, head, self._width, self._height)
+        self._head = head
+        self._end_frame()
+
+    def direction(self) -> Direction:
+        self.poll()
+        direction = self.input.pop(self._heading)
+        if direction is not Direction.DEFAULT:
+            self._heading = direction
+        return direction
+
+    def poll(self, timeout: float = 0) -> None:
+        # Moves the pending key presses to the input buffer, waiting up to
+        # timeout seconds for some
+        if self._eof:
+            # Nothing more will come (stdin closed, or /dev/null)
+            time.sleep(timeout)
+            return
+        if not select.select([self._stdin], [], [], timeout)[0]:
+            return
+        now = perf_counter_ns()
+        data = os.read(self._stdin, 1024)
+        if not data:
+            self._eof = True
+            return
+        keys = self._keys + data
+        index = 0
+        while index < len(keys):
+            if keys[index:index + 1] == QUIT:
+                self.close()
+                sys.exit()
+            sequence = keys[index:index + 3]
+            if sequence in KEYS:
+                self.input.push(KEYS[sequence], now)
+                index += 3
+            elif keys[index:index + 1] == b"\x1b" and len(sequence) < 3:
+                # Split across reads: keep it for the next one
+                break
+            else:
+                index += 1
+        self._keys = keys[index:]
+
+    def close(self) -> None:
+        # Leaves the cursor below the board, and the terminal as it was
+        if self._closed:
+            return
+        self._closed = True
+        self._pending += RESET + self._move(self._height + 3, 1) + SHOW_CURSOR
+        self._flush()
+        if self._termios is not None:
+            import termios
+            termios.tcsetattr(self._stdin, termios.TCSADRAIN, self._termios)
+            self._termios = None
+
+    def _set(self, cell: int, color: int) -> None:
+        if self._shadow[cell] != color:
+            self._paint(cell, color)
+
+    def _paint(self, cell: int, color: int) -> None:
+        self._shadow[cell] = color
+        pending = self._pending
+        if self._cursor != cell:
+            # Rows and columns are 1-based, and the border takes one of each
+            pending += self._move(cell // self._width + 2, 2 * (cell % self._width) + 2)
+        if self._color != color:
+            pending += COLORS[color]
+            self._color = color
+        pending += CELL
+        self._cursor = cell + 1 if (cell + 1) % self._width else None
+
+    @staticmethod
+    def _move(row: int, column: int) -> bytes:
+        return b"\x1b[%d;%dH" % (row, column)
+
+    def _write_border(self) -> None:
+        line = b"+" + b"-" * (2 * self._width) + b"+"
+        pending = self._pending
+        pending += HIDE_CURSOR + RESET + CLEAR + self._move(1, 1) + line
+        for row in range(self._height):
+            pending += self._move(row + 2, 1) + b"|" + self._move(row + 2, 2 * self._width + 2) + b"|"
+        pending += self._move(self._height + 2, 1) + line
+        self._cursor = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            self._out.write(self._pending)
+            self._out.flush()
+            self.bytes_written += len(self._pending)
+            self._pending = bytearray()
+
+    def wait(self, timeout: float) -> None:
+        deadline = perf_counter_ns() + int(timeout * 1e9)
+        while True:
+            left_ns = deadline - perf_counter_ns()
+            self.poll(max(left_ns, 0) / 1e9)
+            if left_ns <= 0:
+                break
+
+    def _end_frame(self) -> None:
+        self._flush()
+        self.input.rendered()
+        self.wait(max(self._next_frame - perf_counter_ns(), 0) / 1e9)
+        self._next_frame = max(self._next_frame, perf_counter_ns()) + self._frame_ns
@@ -0,0 +1,97 @@
+from random import Random
+from typing import List, Optional
+
+import pytest
+
+from snake.arena import COLLISION, HEAD_TO_HEAD, Arena
+from snake.direction import Direction
+from snake.free_cells import FreeCells
+from snake.types import Position
+
+R = Direction.RIGHT
+L = Direction.LEFT
+U = Direction.UP
+D = Direction.DOWN
+
+
+class FixedEggCreator:
+    def __init__(self, eggs: List[Position]):
+        self._eggs = iter(eggs)
+
+    def create(self, free_cells: Optional[FreeCells] = None) -> Position:
+        return next(self._eggs)
+
+
+class TestArena():
+
+    def test_shared_occupancy(self) -> None:
+        arena = Arena([[(2, 0), (1, 0)], [(2, 5), (1, 5)]], size=10, rng=Random(0))
+        assert len(arena.free_cells) == 96
+        assert not arena.free_cells.is_free(5 * 10 + 1)
+        assert len(arena.eggs) == 1
+
+    def test_snakes_cannot_overlap(self) -> None:
+        with pytest.raises(Exception):
+            Arena([[(2, 0), (1, 0)], [(2, 1), (2, 0)]], size=10)
+
+    def test_simultaneous_moves(self) -> None:
+        arena = Arena([[(2, 0), (1, 0)], [(2, 5), (1, 5)]], size=10,
+                      egg_creator=FixedEggCreator([(9, 9)]))
+        assert arena.step([D, U])
+        assert arena.snakes[0].positions == [(2, 1), (2, 0)]
+        assert arena.snakes[1].positions == [(2, 4), (2, 5)]
+        assert len(arena.free_cells) == 96
+
+    def test_head_to_head(self) -> None:
+        arena = Arena([[(2, 0), (1, 0)], [(4, 0), (5, 0)], [(0, 5), (0, 6)]], size=10,
+                      egg_creator=FixedEggCreator([(9, 9)]))
+        assert not arena.step([R, L, U])
+        assert arena.alive == [False, False, True]
+        assert arena.causes == [HEAD_TO_HEAD, HEAD_TO_HEAD, None]
+        # Dead snakes leave the board
+        assert len(arena.free_cells) == 98
+
+    def test_head_into_body(self) -> None:
+        arena = Arena([[(2, 1), (1, 1)], [(3, 0), (3, 1), (3, 2)]], size=10,
+                      egg_creator=FixedEggCreator([(9, 9)]))
+        assert not arena.step([R, U])
+        assert arena.alive == [False, True]
+        assert arena.causes == [COLLISION, None]
+
+    def test_passing_heads_collide(self) -> None:
+        # Moving onto the cell the other head leaves: it is a neck by then
+        arena = Arena([[(2, 0), (1, 0)], [(3, 0), (4, 0)]], size=10,
+                      egg_creator=FixedEggCreator([(9, 9)]))
+        arena.step([R, L])
+        assert arena.alive == [False, False]
+
+    def test_following_a_tail(self) -> None:
+        arena = Arena([[(2, 0), (1, 0)], [(4, 0), (3, 0)]], size=10,
+                      egg_creator=FixedEggCreator([(9, 9)]))
+        assert arena.step([R, R])
+        assert arena.alive == [True, True]
+        assert arena.snakes[0].positions == [(3, 0), (2, 0)]
+
+    def test_tail_stays_when_eating(self) -> None:
+        # Snake 0 goes where snake 1's tail is, but snake 1 eats and keeps it
+        arena = Arena([[(3, 0), (2, 0)], [(5, 0), (4, 0)]], size=10,
+                      egg_creator=FixedEggCreator([(6, 0), (9, 9)]))
+        assert not arena.step([R, R])
+        assert arena.alive == [False, True]
+        assert arena.scores == [0, 1]
+        assert arena.eggs == {(9, 9)}
+        assert arena.snakes[1].positions == [(6, 0), (5, 0), (4, 0)]
+
+    def test_egg_pool(self) -> None:
+        arena = Arena([[(2, 0), (1, 0)], [(2, 5), (1, 5)]], size=10, eggs=5, rng=Random(1))
+        assert len(arena.eggs) == 5
+        assert all(arena.free_cells.is_free(y * 10 + x) for x, y in arena.eggs)
+
+    def test_play(self) -> None:
+        def straight(arena: Arena, index: int) -> Direction:
+            return Direction.DEFAULT
+
+        arena = Arena([[(2, 0), (1, 0)], [(2, 5), (1, 5)]], size=10, rng=Random(0))
+        scores = arena.play([straight, straight], iterations=30)
+        assert arena.ticks == 30
+        assert scores == arena.scores
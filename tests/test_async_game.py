@@ -0,0 +1,125 @@
+import asyncio
+from random import Random
+from typing import Iterable, List, Optional, Tuple
+
+from snake.async_game import AsyncGame, run_games
+from snake.direction import Direction
+from snake.game import DrawMode, Game, RandomEggCreator
+from snake.types import Position
+from snake.ui.headless import HeadlessUi
+from snake.ui.queue import QueueUi
+
+
+class ScriptedAsyncUi:
+    def __init__(self, script: Iterable[Direction]):
+        self.frames: List[List[Position]] = []
+        self.deltas: List[Optional[Position]] = []
+        self._script = iter(script)
+
+    async def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        self.frames.append(list(snake))
+
+    async def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        self.deltas.append(tail)
+
+    async def direction(self) -> Direction:
+        await asyncio.sleep(0)
+        return next(self._script, Direction.DEFAULT)
+
+
+class TestAsyncGame():
+
+    def test_plays_like_game(self) -> None:
+        script = [Direction.UP, Direction.LEFT, Direction.DOWN, Direction.DOWN] * 5
+        ui = ScriptedAsyncUi(script)
+        won = asyncio.run(AsyncGame(ui=ui, interval=None, iterations=20,
+                                    egg_creator=RandomEggCreator(20, Random(1))).run())
+
+        expected = HeadlessUi(script=script)
+        frames: List[List[Position]] = []
+        expected.draw = lambda snake, egg: frames.append(list(snake))  # type: ignore
+        assert won == Game(ui=expected, iterations=20,
+                           egg_creator=RandomEggCreator(20, Random(1))).run()
+        assert ui.frames == frames
+
+    def test_delta_draw(self) -> None:
+        ui = ScriptedAsyncUi([])
+        asyncio.run(AsyncGame(ui=ui, interval=None, iterations=3, draw_mode=DrawMode.DELTA,
+                              egg_creator=RandomEggCreator(20, Random(0))).run())
+        assert len(ui.frames) == 1
+        assert ui.deltas == [(5, 5), (6, 5)]
+
+    def test_full_draws_without_deltas(self) -> None:
+        class FullFramesUi(ScriptedAsyncUi):
+            async def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+                raise NotImplementedError
+
+        ui = FullFramesUi([])
+        asyncio.run(AsyncGame(ui=ui, interval=None, iterations=3, draw_mode=DrawMode.DELTA,
+                              egg_creator=RandomEggCreator(20, Random(0))).run())
+        assert len(ui.frames) == 3
+
+    def test_ticks_follow_the_interval(self) -> None:
+        async def timed() -> float:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await AsyncGame(ui=ScriptedAsyncUi([]), interval=.01, iterations=5).run()
+            return loop.time() - start
+
+        assert .035 <= asyncio.run(timed()) < .5
+
+    def test_many_games_in_one_loop(self) -> None:
+        games = [AsyncGame(ui=ScriptedAsyncUi([Direction.UP, Direction.DOWN]), interval=.001,
+                           iterations=30, egg_creator=RandomEggCreator(20, Random(seed)))
+                 for seed in range(200)]
+        assert asyncio.run(run_games(games)) == [True] * 200
+        assert all(game.game.ticks == 30 for game in games)
+
+
+class TestQueueUi():
+
+    def test_input_between_ticks(self) -> None:
+        async def play() -> List[List[Position]]:
+            ui = QueueUi(max_frames=10)
+            game = AsyncGame(ui=ui, interval=.01, iterations=3, snake=[(1, 0), (0, 0)],
+                             egg_creator=RandomEggCreator(20, Random(0)))
+            task = asyncio.create_task(game.run())
+            # Only the latest input counts on the next tick
+            ui.put_direction(Direction.UP)
+            ui.put_direction(Direction.DOWN)
+            await task
+            return [ui.frames.get_nowait()[0] for _ in range(ui.frames.qsize())]
+
+        frames = asyncio.run(play())
+        assert [frame[0] for frame in frames] == [(1, 0), (1, 1), (1, 2)]
+
+    def test_drops_old_frames(self) -> None:
+        async def play() -> QueueUi:
+            ui = QueueUi(max_frames=2)
+            await AsyncGame(ui=ui, interval=None, iterations=5, snake=[(1, 0), (0, 0)],
+                            egg_creator=RandomEggCreator(20, Random(0))).run()
+            return ui
+
+        ui = asyncio.run(play())
+        assert [ui.frames.get_nowait()[0][0] for _ in range(2)] == [(4, 0), (5, 0)]
+
+    def test_drops_old_inputs_when_full(self) -> None:
+        async def fill() -> Direction:
+            ui = QueueUi(max_inputs=1)
+            ui.put_direction(Direction.UP)
+            ui.put_direction(Direction.DOWN)
+            return await ui.direction()
+
+        assert asyncio.run(fill()) is Direction.DOWN
+
+    def test_delta_frames(self) -> None:
+        async def play(draw_mode: DrawMode) -> List[Tuple[List[Position], Position]]:
+            ui = QueueUi(max_frames=10)
+            await AsyncGame(ui=ui, interval=None, iterations=8, snake=[(1, 0), (0, 0)],
+                            egg_creator=RandomEggCreator(4, Random(2)), size=4,
+                            draw_mode=draw_mode).run()
+            return [ui.frames.get_nowait() for _ in range(ui.frames.qsize())]
+
+        frames = asyncio.run(play(DrawMode.DELTA))
+        assert frames == asyncio.run(play(DrawMode.COPY))
+        assert max(len(snake) for snake, _ in frames) > 2
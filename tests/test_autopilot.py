@@ -0,0 +1,121 @@
+from random import Random
+from typing import Iterable, List
+
+import pytest
+
+from snake.autopilot import Autopilot
+from snake.direction import Direction
+from snake.game import DrawMode, Game, RandomEggCreator
+from snake.types import Position
+from snake.ui.headless import HeadlessUi
+
+
+class TestAutopilot():
+
+    def test_cycle_covers_the_board(self) -> None:
+        for width, height in ((6, 6), (5, 4), (4, 7), (5, 7), (3, 3)):
+            autopilot = Autopilot(width, height)
+            forward, backward = autopilot._orders
+            assert sorted(forward) == list(range(width * height))
+            # Consecutive ranks are neighbours on the board
+            cells = {rank: cell for cell, rank in enumerate(forward)}
+            for rank in range(width * height):
+                following = cells[(rank + 1) % (width * height)]
+                assert any(neighbours[cells[rank]] == following
+                           for neighbours in autopilot._neighbours)
+            assert all(b == width * height - 1 - f for f, b in zip(forward, backward))
+
+    def test_no_cycle_on_a_single_column(self) -> None:
+        assert Autopilot(1, 7)._orders == []
+
+    def test_tracks_the_body_along_the_cycle(self) -> None:
+        autopilot = Autopilot(7)
+        game = Game(ui=autopilot, size=7, egg_creator=RandomEggCreator(7, Random(1)),
+                    snake=[(2, 1), (1, 1), (0, 1)], draw_mode=DrawMode.VIEW)
+        game.start()
+        for _ in range(10_000):
+            game._draw(game.snake)
+            direction = autopilot.direction()
+            # Kept up to date tick by tick, same as walking the whole body
+            gaps = list(autopilot._gaps)
+            assert autopilot._tracked is not None
+            head, tail = autopilot._tracked
+            autopilot._tracked = None
+            autopilot._track(head, tail)
+            assert autopilot._gaps == gaps
+            if not game.step(direction):
+                break
+        assert game.won
+
+    def test_goes_for_the_egg(self) -> None:
+        # Without the cycle: straight to the egg, by a shortest path
+        autopilot = Autopilot(5)
+        autopilot._orders = []
+        game = Game(ui=autopilot, size=5, snake=[(1, 2), (0, 2)],
+                    draw_mode=DrawMode.VIEW, iterations=1)
+        game.start()
+        game._egg = (1, 4)
+        autopilot.draw(game.snake, game.egg)
+        assert autopilot.direction() is Direction.DOWN
+
+    def test_never_goes_back(self) -> None:
+        autopilot = Autopilot(10)
+        game = Game(ui=autopilot, size=10, egg_creator=RandomEggCreator(10, Random(0)),
+                    snake=[(2, 1), (1, 1), (0, 1)], draw_mode=DrawMode.VIEW)
+        game.start()
+        for _ in range(500):
+            game._draw(game.snake)
+            direction = autopilot.direction()
+            current = game.snake.direction
+            assert (direction.x, direction.y) != (-current.x, -current.y)
+            if not game.step(direction):
+                break
+
+    @pytest.mark.parametrize("width,height", [(6, 6), (10, 10), (8, 5), (7, 7), (9, 9), (9, 5)])
+    def test_wins(self, width: int, height: int) -> None:
+        for seed in range(20):
+            game = Game(ui=Autopilot(width, height),
+                        width=width, height=height,
+                        egg_creator=RandomEggCreator(width, Random(seed), height),
+                        snake=[(2, 1), (1, 1), (0, 1)],
+                        draw_mode=DrawMode.VIEW,
+                        iterations=100_000)
+            assert game.run()
+            assert game.won
+
+    def test_forwards_to_the_wrapped_ui(self) -> None:
+        eggs: List[Position] = []
+
+        def policy(snake: Iterable[Position], egg: Position) -> Direction:
+            eggs.append(egg)
+            return Direction.LEFT
+
+        game = Game(ui=Autopilot(10, ui=HeadlessUi(policy=policy)), size=10,
+                    egg_creator=RandomEggCreator(10, Random(0)),
+                    draw_mode=DrawMode.DELTA, iterations=5)
+        first_egg = RandomEggCreator(10, Random(0)).create(game.snake.clone().free_cells)
+        game.run()
+        # The wrapped ui still gets every frame and is polled every tick.
+        # Seeded: no egg is eaten on the last tick, after the last draw
+        assert len(eggs) == 5
+        assert eggs[0] == first_egg
+        assert sum(game.result().egg_ticks) < 5
+        assert eggs[-1] == game.egg
+
+    def test_gets_back_onto_the_cycle(self) -> None:
+        # Across rows 1 to 3, against the cycle both ways
+        autopilot = Autopilot(6)
+        game = Game(ui=autopilot, size=6, egg_creator=RandomEggCreator(6, Random(0)),
+                    snake=[(2, 3), (2, 2), (3, 2), (3, 1)], draw_mode=DrawMode.VIEW)
+        game.start()
+        game._draw(game.snake)
+        autopilot.direction()
+        assert autopilot._order is None and autopilot._realign is not None
+        for _ in range(4):
+            assert game.step(autopilot.direction())
+        assert autopilot._aligned_order() is not None
+
+    def test_needs_a_live_view(self) -> None:
+        game = Game(ui=Autopilot(10), size=10, iterations=5)
+        with pytest.raises(TypeError):
+            game.run()
@@ -0,0 +1,127 @@
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+from snake.batch import BatchGame
+from snake.direction import Direction
+from snake.free_cells import FreeCells
+from snake.game import Game
+from snake.types import Position
+
+
+class RecordingUi:
+    def __init__(self, actions: List[int]):
+        self.frames: List[Tuple[List[Position], Position]] = []
+        self._actions = iter(actions)
+
+    def draw(self, snake: Any, egg: Position) -> None:
+        self.frames.append((list(snake), egg))
+
+    def direction(self) -> Direction:
+        action = next(self._actions)
+        return Direction(action) if action else None  # type: ignore
+
+
+class ScriptedEggCreator:
+    def __init__(self, eggs: List[Position]):
+        self._eggs: Iterator[Position] = iter(eggs)
+
+    def create(self, free_cells: Optional[FreeCells] = None) -> Position:
+        return next(self._eggs)
+
+
+class TestBatchGame():
+
+    def test_initial_state(self) -> None:
+        batch = BatchGame(3, size=20, seed=0)
+        for game in range(3):
+            assert batch.positions(game) == Game.DEFAULT_SNAKE
+            assert batch.egg_position(game) not in Game.DEFAULT_SNAKE
+        assert list(batch.direction) == [Direction.RIGHT.value] * 3
+        assert batch.running.all()
+
+    def test_moves_and_wraps(self) -> None:
+        batch = BatchGame(2, size=4, snake=[(3, 0), (2, 0)], seed=0)
+        batch.egg[:] = 15
+        batch.step([Direction.DEFAULT.value, Direction.DOWN.value])
+        assert batch.positions(0) == [(0, 0), (3, 0)]
+        assert batch.positions(1) == [(3, 1), (3, 0)]
+
+    def test_rectangular_board(self) -> None:
+        batch = BatchGame(1, width=5, height=2, snake=[(1, 1), (0, 1)], seed=0)
+        batch.egg[:] = 0
+        batch.step([Direction.DOWN.value])
+        assert batch.positions(0) == [(1, 0), (1, 1)]
+        assert batch.grid.shape == (1, 2, 5)
+
+    def test_cannot_go_back(self) -> None:
+        batch = BatchGame(1, size=4, snake=[(1, 0), (0, 0)], seed=0)
+        batch.egg[:] = 15
+        batch.step([Direction.LEFT.value])
+        assert batch.positions(0) == [(2, 0), (1, 0)]
+
+    def test_bites_itself(self) -> None:
+        batch = BatchGame(1, size=20, snake=[
+            (0, 1), (0, 0), (1, 0), (1, 1), (1, 2)], seed=0)
+        ended = batch.step([Direction.RIGHT.value])
+        assert ended[0]
+        assert not batch.alive[0]
+
+    def test_eats_last_egg(self) -> None:
+        batch = BatchGame(1, size=2, snake=[(0, 1), (0, 0), (1, 0)], seed=0)
+        assert batch.egg_position(0) == (1, 1)
+        ended = batch.step([Direction.RIGHT.value])
+        assert ended[0]
+        assert batch.won[0]
+        assert batch.positions(0) == [(1, 1), (0, 1), (0, 0), (1, 0)]
+
+    def test_reset_some_games(self) -> None:
+        batch = BatchGame(2, size=20, seed=0)
+        batch.step([Direction.UP.value, Direction.UP.value])
+        batch.reset([1])
+        assert batch.positions(0) == [(7, 4), (7, 5), (6, 5)]
+        assert batch.positions(1) == Game.DEFAULT_SNAKE
+        assert list(batch.ticks) == [1, 0]
+
+    def test_grid_is_a_view(self) -> None:
+        batch = BatchGame(1, size=4, snake=[(1, 0), (0, 0)], seed=0)
+        grid = batch.grid
+        batch.egg[:] = 15
+        batch.step([Direction.DOWN.value])
+        assert grid[0, 1, 1]
+        assert not grid[0, 0, 0]
+
+
+class TestConformance():
+    # Plays the same seeded inputs on BatchGame and on the scalar Game,
+    # feeding the eggs picked by the batch engine to the scalar game, and
+    # compares every drawn frame cell for cell.
+
+    def test_matches_scalar_game(self) -> None:
+        games, ticks, size = 64, 300, 5
+        snake = [(2, 0), (1, 0), (0, 0)]
+        rng = np.random.default_rng(1234)
+        batch = BatchGame(games, size=size, snake=snake, seed=99)
+
+        actions = rng.integers(0, 6, size=(ticks, games))
+        frames: List[List[Tuple[List[Position], Position]]] = [[] for _ in range(games)]
+        eggs: List[List[Position]] = [[batch.egg_position(g)] for g in range(games)]
+        for tick in range(ticks):
+            running = batch.running.copy()
+            length = batch.length.copy()
+            for game in np.flatnonzero(running):
+                frames[game].append((batch.positions(game), batch.egg_position(game)))
+            batch.step(actions[tick])
+            for game in np.flatnonzero(running & (batch.length > length) & ~batch.won):
+                eggs[game].append(batch.egg_position(game))
+
+        assert not batch.alive.all()
+        for game in range(games):
+            ui = RecordingUi([int(action) for action in actions[:, game]])
+            won = Game(ui=ui,
+                       iterations=ticks,
+                       size=size,
+                       snake=snake,
+                       egg_creator=ScriptedEggCreator(eggs[game])).run()
+            assert ui.frames == frames[game]
+            assert won == bool(batch.alive[game])
@@ -0,0 +1,149 @@
+import multiprocessing
+from multiprocessing.queues import Queue
+from typing import Iterable, List, Optional, Tuple
+
+import pytest
+
+from snake.direction import Direction
+from snake.game import DrawMode, Game
+from snake.types import Position
+from snake.ui.broadcast import BODY, EGG, EMPTY, HEAD, BroadcastReader, BroadcastUi, board, spectate
+from snake.ui.headless import HeadlessUi
+from snake.ui.protocol import UiProtocol
+
+
+class Recorder(UiProtocol):
+    def __init__(self) -> None:
+        self.calls: List[Tuple] = []
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        self.calls.append(("draw", sorted(snake), egg))
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        self.calls.append(("delta", head, tail, egg))
+
+    def direction(self) -> Direction:
+        return Direction.DEFAULT
+
+
+def read_in_process(name: str, frames: int, results: Queue) -> None:
+    reader = BroadcastReader(name, from_start=True)
+    seen: List[int] = []
+    while len(seen) < frames:
+        seen.extend(frame.seq for frame in reader.poll())
+    seq, grid = reader.snapshot()
+    results.put((seen, seq, board(grid)))
+    reader.close()
+
+
+class TestBroadcast():
+
+    def setup_method(self) -> None:
+        self.ui = BroadcastUi(4, 3, slots=8)
+        self.reader = BroadcastReader(self.ui.name)
+
+    def teardown_method(self) -> None:
+        self.reader.close()
+        self.ui.close()
+
+    def test_full_then_deltas(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 2))
+        assert self.reader.grid[0].tolist() == [BODY, HEAD, EMPTY, EMPTY]
+        assert self.reader.grid[2, 3] == EGG
+        self.ui.draw_delta((2, 0), (0, 0), (3, 2))
+        assert self.reader.grid[0].tolist() == [EMPTY, BODY, HEAD, EMPTY]
+        frames = self.reader.poll()
+        assert [frame.seq for frame in frames] == [1, 2]
+        assert frames[0].full and not frames[1].full
+        assert (frames[1].head, frames[1].tail, frames[1].egg) == ((2, 0), (0, 0), (3, 2))
+        assert self.reader.poll() == []
+
+    def test_grid_is_read_only(self) -> None:
+        with pytest.raises(ValueError):
+            self.reader.grid[0, 0] = HEAD
+
+    def test_slow_reader_skips_ahead(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 2))
+        for _ in range(20):
+            self.ui.draw_delta((2, 0), None, (3, 2))
+        frames = self.reader.poll()
+        assert frames[-1].seq == 21
+        assert len(frames) == 7
+        assert self.reader.skipped == 14
+        seq, grid = self.reader.snapshot()
+        assert seq == 21
+        assert board(grid) == ([(2, 0), (0, 0), (1, 0)], (3, 2))
+
+    def test_late_reader_starts_at_the_latest_frame(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 2))
+        late = BroadcastReader(self.ui.name)
+        self.ui.draw_delta((2, 0), (0, 0), (3, 2))
+        assert [frame.seq for frame in late.poll()] == [2]
+        late.close()
+
+    def test_forwards_to_the_wrapped_ui(self) -> None:
+        recorder = Recorder()
+        ui = BroadcastUi(4, ui=recorder)
+        ui.draw([(1, 0), (0, 0)], (3, 3))
+        ui.draw_delta((2, 0), (0, 0), (3, 3))
+        assert [call[0] for call in recorder.calls] == ["draw", "delta"]
+        ui.close()
+
+    def test_not_a_broadcast(self) -> None:
+        from multiprocessing.shared_memory import SharedMemory
+        memory = SharedMemory(create=True, size=64)
+        try:
+            with pytest.raises(ValueError):
+                BroadcastReader(memory.name)
+        finally:
+            memory.close()
+            memory.unlink()
+
+
+class TestGameBroadcast():
+
+    def test_reader_process_follows_a_game(self) -> None:
+        ui = BroadcastUi(10, slots=1024)
+        game = Game(ui=ui, iterations=30, size=10, draw_mode=DrawMode.DELTA,
+                    snake=[(2, 0), (1, 0), (0, 0)])
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=read_in_process, args=(ui.name, 31, results))
+        process.start()
+        game.run()
+        # The game draws before each tick: publish the state after the last
+        ui.draw_delta(game.snake.head, game.vacated, game.egg)
+        seen, seq, (snake, egg) = results.get(timeout=30)
+        process.join(timeout=30)
+        assert seen == list(range(1, 32))
+        assert seq == 31
+        assert sorted(snake) == sorted(game.snake)
+        assert snake[0] == game.snake.head
+        assert egg == game.egg
+        ui.close()
+
+    def test_spectate_draws_then_deltas(self) -> None:
+        ui = BroadcastUi(10)
+        reader = BroadcastReader(ui.name, from_start=True)
+        game = Game(ui=HeadlessUi(), size=10, draw_mode=DrawMode.DELTA,
+                    snake=[(2, 0), (1, 0), (0, 0)])
+        game.start()
+        ui.draw(game.snake, game.egg)
+        recorder = Recorder()
+
+        class Closing(Recorder):
+            def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+                recorder.draw_delta(head, tail, egg)
+
+            def draw(self, snake: Iterable[Position], egg: Position) -> None:
+                recorder.draw(snake, egg)
+                # The game goes on while the spectator is drawing
+                for _ in range(3):
+                    game.step(Direction.DEFAULT)
+                    ui.draw_delta(game.snake.head, game.vacated, game.egg)
+                ui.close()
+
+        spectate(reader, Closing())
+        assert [call[0] for call in recorder.calls] == ["draw", "delta", "delta", "delta"]
+        assert recorder.calls[-1][1] == game.snake.head
+        reader.close()
@@ -0,0 +1,110 @@
+import numpy as np  # type: ignore
+import pytest
+
+from snake.direction import Direction
+from snake.env import BODY, EGG, EMPTY, HEAD, SnakeEnv, VectorEnv
+
+
+def expected_grids(env: VectorEnv) -> 'np.ndarray':
+    # Observations rebuilt from scratch, to check the incremental updates
+    batch = env.batch
+    grids = np.zeros(env.observations.shape, dtype=np.int8)
+    for game in range(env.envs):
+        for x, y in batch.positions(game):
+            grids[game, y, x] = BODY
+        x, y = batch.positions(game)[0]
+        grids[game, y, x] = HEAD
+        if batch.running[game]:
+            x, y = batch.egg_position(game)
+            grids[game, y, x] = EGG
+    return grids
+
+
+class TestSnakeEnv():
+
+    def test_reset(self) -> None:
+        env = SnakeEnv(size=5, snake=[(2, 1), (1, 1), (0, 1)])
+        observation = env.reset(seed=1)
+        assert observation.shape == (5, 5)
+        assert list(observation[1]) == [BODY, BODY, HEAD, EMPTY, EMPTY]
+        assert (observation == EGG).sum() == 1
+        assert not observation.flags.writeable
+
+    def test_reset_is_seeded(self) -> None:
+        env = SnakeEnv(size=10)
+        first = env.reset(seed=3).copy()
+        assert (env.reset(seed=3) == first).all()
+
+    def test_observation_is_updated_in_place(self) -> None:
+        env = SnakeEnv(size=5, snake=[(2, 1), (1, 1), (0, 1)])
+        observation = env.reset(seed=1)
+        after, reward, done, _ = env.step(Direction.DOWN.value)
+        assert after is observation
+        assert (reward, done) == (0.0, False)
+        assert list(observation[1]) == [EMPTY, BODY, BODY, EMPTY, EMPTY]
+        assert observation[2, 2] == HEAD
+        assert observation[0, 4] == EGG
+
+    def test_eating_an_egg(self) -> None:
+        env = SnakeEnv(size=5, snake=[(2, 1), (1, 1), (0, 1)])
+        observation = env.reset(seed=0)
+        assert observation[2, 2] == EGG
+        _, reward, done, info = env.step(Direction.DOWN.value)
+        assert (reward, done, info["length"]) == (1.0, False, 4)
+        assert observation[2, 2] == HEAD
+        assert observation[1, 0] == BODY
+        assert (observation == EGG).sum() == 1
+
+    def test_eating_the_last_egg_wins(self) -> None:
+        env = SnakeEnv(size=2, snake=[(0, 1), (0, 0), (1, 0)])
+        assert env.observation[1, 1] == EGG
+        observation, reward, done, info = env.step(Direction.RIGHT.value)
+        assert (reward, done, info["won"]) == (1.0, True, True)
+        assert observation[1, 1] == HEAD
+        assert (observation != EMPTY).all()
+        with pytest.raises(ValueError):
+            env.step(Direction.UP.value)
+
+    def test_biting_itself(self) -> None:
+        env = SnakeEnv(size=20, snake=[(0, 1), (0, 0), (1, 0), (1, 1), (1, 2)])
+        _, reward, done, info = env.step(Direction.RIGHT.value)
+        assert (reward, done, info["won"]) == (-1.0, True, False)
+
+    def test_truncation(self) -> None:
+        env = SnakeEnv(size=20, max_ticks=3)
+        dones = [env.step(0)[2] for _ in range(3)]
+        assert dones == [False, False, True]
+
+
+class TestVectorEnv():
+
+    def test_incremental_observations(self) -> None:
+        env = VectorEnv(32, size=5, snake=[(2, 0), (1, 0), (0, 0)], seed=7)
+        observations = env.observations
+        rng = np.random.default_rng(0)
+        for _ in range(300):
+            returned, _, _, _ = env.step(rng.integers(0, 6, size=env.envs))
+            assert returned is observations
+            assert (observations == expected_grids(env)).all()
+
+    def test_auto_reset(self) -> None:
+        env = VectorEnv(2, size=20, snake=[(0, 1), (0, 0), (1, 0), (1, 1), (1, 2)], seed=0)
+        observations, rewards, dones, info = env.step([Direction.RIGHT.value, Direction.UP.value])
+        assert list(dones) == [True, False]
+        assert list(rewards) == [-1.0, 0.0]
+        assert list(info["lost"]) == [True, False]
+        assert list(info["ticks"]) == [1, 0]
+        assert list(env.batch.ticks) == [0, 1]
+        assert (observations == expected_grids(env)).all()
+
+    def test_truncation(self) -> None:
+        env = VectorEnv(3, size=20, seed=0, max_ticks=2)
+        assert not env.step([0, 0, 0])[2].any()
+        assert env.step([0, 0, 0])[2].all()
+        assert list(env.batch.ticks) == [0, 0, 0]
+
+    def test_reset_is_seeded(self) -> None:
+        env = VectorEnv(4, size=10, seed=0)
+        first = env.reset(seed=5).copy()
+        env.step([1, 2, 3, 4])
+        assert (env.reset(seed=5) == first).all()
@@ -0,0 +1,80 @@
+from random import Random
+from snake.free_cells import FreeCells
+import pytest
+
+
+class TestFreeCells():
+
+    def test_starts_with_every_cell(self) -> None:
+        cells = FreeCells(3, 2)
+        assert len(cells) == 6
+        assert sorted(cells) == [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0), (2, 1)]
+
+    def test_remove(self) -> None:
+        cells = FreeCells(3, 2)
+        cells.remove((1, 1))
+        assert len(cells) == 5
+        assert (1, 1) not in cells
+        assert (2, 1) in cells
+
+    def test_remove_twice_is_noop(self) -> None:
+        cells = FreeCells(3, 2)
+        cells.remove((0, 0))
+        cells.remove((0, 0))
+        assert len(cells) == 5
+
+    def test_add_back(self) -> None:
+        cells = FreeCells(3, 2)
+        cells.remove((0, 0))
+        cells.add((0, 0))
+        cells.add((0, 0))
+        assert len(cells) == 6
+        assert (0, 0) in cells
+
+    def test_contains_out_of_board(self) -> None:
+        cells = FreeCells(3, 2)
+        assert (3, 0) not in cells
+        assert (0, -1) not in cells
+        assert "foo" not in cells
+
+    def test_choice_only_returns_free_cells(self) -> None:
+        cells = FreeCells(4, 4)
+        for position in [(x, y) for x in range(4) for y in range(4) if (x, y) != (2, 3)]:
+            cells.remove(position)
+        rng = Random(42)
+        for _ in range(100):
+            assert cells.choice(rng) == (2, 3)
+
+    def test_take_and_release(self) -> None:
+        cells = FreeCells(3, 2)
+        assert cells.take(4) is True
+        assert cells.take(4) is False
+        assert cells.is_free(4) is False
+        cells.release(4)
+        assert cells.is_free(4) is True
+
+    def test_bitset(self) -> None:
+        cells = FreeCells(4096, 4096)
+        assert len(cells._taken) == 2 * 1024 * 1024
+        cells.remove((4095, 4095))
+        assert (4095, 4095) not in cells
+        assert cells.choice(Random(0)) != (4095, 4095)
+        assert cells._cells is None
+
+    def test_index_built_past_half_full(self) -> None:
+        cells = FreeCells(4, 4)
+        for position in [(x, y) for x in range(4) for y in range(3)]:
+            cells.remove(position)
+        rng = Random(0)
+        assert cells.choice(rng)[1] == 3
+        assert cells._cells is not None
+        cells.remove((0, 3))
+        cells.add((0, 0))
+        assert sorted(cells) == [(0, 0), (1, 3), (2, 3), (3, 3)]
+        assert {cells.choice(rng) for _ in range(200)} == {(0, 0), (1, 3), (2, 3), (3, 3)}
+
+    def test_choice_on_full_board(self) -> None:
+        cells = FreeCells(1, 1)
+        cells.remove((0, 0))
+        with pytest.raises(IndexError):
+            cells.choice()
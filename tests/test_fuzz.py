@@ -0,0 +1,97 @@
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from snake.direction import Direction
+from snake.fuzz import Checker, Failure, InvariantError, fuzz, fuzz_many, main, minimize, run_case
+from snake.game import DrawMode, Game, RandomEggCreator, Snake
+from snake.topology import Topology
+from snake.ui.headless import HeadlessUi
+
+
+def allow_reverse(self: Snake, direction: Direction) -> Direction:
+    return self.direction if direction is Direction.DEFAULT else direction
+
+
+def egg_anywhere(self: Game) -> None:
+    self._egg = self._egg_creator.create()
+
+
+class TestChecker():
+
+    def test_engine_holds(self) -> None:
+        report = fuzz_many(range(20), ticks=2000, size=8)
+        assert report["failures"] == []
+        assert report["ticks"] > 0
+
+    def test_plays_to_a_win(self) -> None:
+        game = Game(ui=HeadlessUi(), snake=[(0, 1), (0, 0), (1, 0)], size=2,
+                    draw_mode=DrawMode.SKIP)
+        game.start()
+        checker = Checker(game)
+        assert not checker.step(Direction.RIGHT)
+        assert game.won
+
+    def test_walls(self) -> None:
+        game = Game(ui=HeadlessUi(), topology=Topology.walls(10, 10),
+                    egg_creator=RandomEggCreator(10, Random(0)), draw_mode=DrawMode.SKIP)
+        game.start()
+        checker = Checker(game)
+        assert checker.step(Direction.DEFAULT)
+        assert checker.step(Direction.DEFAULT)
+        assert not checker.step(Direction.DEFAULT)
+
+    def test_catches_reverse_turns(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Snake, "turned", allow_reverse)
+        ticks, error = run_case(0, [Direction.DEFAULT, Direction.LEFT], 10, 10)
+        assert error is not None
+        assert (error.kind, error.tick) == ("reverse-turn", 2)
+
+    def test_catches_eggs_on_the_body(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Game, "_place_egg", egg_anywhere)
+        report = fuzz_many(range(6), ticks=3000, size=8)
+        assert report["failures"]
+        assert {failure.kind for failure in report["failures"]} == {"egg"}
+
+    def test_engine_errors_are_failures(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def broken(self: Snake, direction: Direction) -> Direction:
+            raise RuntimeError("boom")
+        monkeypatch.setattr(Snake, "turned", broken)
+        _, error = run_case(0, [Direction.UP], 10, 10)
+        assert error is not None and error.kind == "crash"
+
+
+class TestMinimize():
+
+    def test_shrinks_to_the_failing_turn(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Snake, "turned", allow_reverse)
+        ticks, failure = fuzz(0, ticks=2000)
+        assert failure is not None
+        minimized = minimize(failure)
+        assert minimized.kind == "reverse-turn"
+        assert minimized.directions == (Direction.LEFT,)
+        assert minimized.replay() is not None
+
+    def test_reproducer_round_trip(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(Snake, "turned", allow_reverse)
+        failure = minimize(fuzz(3, ticks=2000)[1])  # type: ignore
+        path = str(tmp_path / "failure.json")
+        failure.save(path)
+        assert Failure.load(path) == failure
+        assert main(["--reproduce", path]) == 1
+        monkeypatch.undo()
+        assert Failure.load(path).replay() is None
+        assert main(["--reproduce", path]) == 0
+
+    def test_nothing_to_minimize(self) -> None:
+        failure = Failure(0, 10, 10, tuple(Game.DEFAULT_SNAKE), (Direction.UP,), "egg", "")
+        assert minimize(failure) is failure
+
+
+class TestCli():
+
+    def test_parallel(self, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+        assert main(["--seeds", "8", "--ticks", "500", "--workers", "2",
+                     "--out", str(tmp_path)]) == 0
+        assert '"games": 8' in capsys.readouterr().out
@@ -1,11 +1,12 @@
 import pytest
 import signal
 from snake.types import Position
-from snake.game import Game, RandomEggCreator, EggCreator
+from snake.game import BIT_ITSELF, STOPPED, WON, DrawMode, Game, GameResult, RandomEggCreator, EggCreator
 from snake.direction import Direction
+from snake.free_cells import FreeCells
 from unittest.mock import Mock, call, DEFAULT
 from snake.ui.protocol import UiProtocol
-from typing import Callable, Any, List, Union, Generator
+from typing import Callable, Any, Iterable, List, Union, Generator
 
 
 class BaseTestCase:
@@ -107,6 +108,24 @@ class TestGame(BaseTestCase):
         game.run()
         assert [(0, 0), (3, 0)] in self.get_drawn_snakes()
 
+    def test_rectangular_board(self) -> None:
+        self.ui.direction = mock_direction([Direction.DOWN])
+        self.egg_creator.create.return_value = (0, 2)
+        game = Game(snake=[(5, 0), (4, 0)], iterations=4,
+                    width=6, height=3, ui=self.ui, egg_creator=self.egg_creator)
+        game.run()
+        assert self.get_drawn_snakes() == [
+            [(5, 0), (4, 0)],
+            [(5, 1), (5, 0)],
+            [(5, 2), (5, 1)],
+            [(5, 0), (5, 2)],
+        ]
+
+    def test_huge_board(self) -> None:
+        game = Game(ui=self.ui, iterations=10, width=4096, height=4096)
+        with Timeout(1):
+            assert game.run() is True
+
     def test_infinite_iterations(self) -> None:
         try:
             with Timeout():
@@ -127,6 +146,52 @@ class TestGame(BaseTestCase):
             assert game.run() is False
 
 
+class TestDeltaDraw(BaseTestCase):
+    def setup_method(self) -> None:
+        self.ui = Mock()
+        self.ui.direction = mock_direction(Direction.RIGHT)
+
+    def test_full_draw_then_deltas(self) -> None:
+        egg_creator = Mock()
+        egg_creator.create.side_effect = [(3, 0), (10, 10)]
+        game = Game(iterations=3, egg_creator=egg_creator, ui=self.ui,
+                    snake=[(1, 0), (0, 0)], draw_mode=DrawMode.DELTA)
+        game.run()
+        assert self.ui.draw.call_count == 1
+        assert self.ui.draw_delta.call_args_list == [
+            call(head=(2, 0), tail=(0, 0), egg=(3, 0)),
+            call(head=(3, 0), tail=None, egg=(10, 10)),
+        ]
+
+    def test_full_draws_without_deltas(self) -> None:
+        self.ui.draw_delta.side_effect = NotImplementedError
+        egg_creator = Mock()
+        egg_creator.create.return_value = (10, 10)
+        game = Game(iterations=3, egg_creator=egg_creator, ui=self.ui,
+                    snake=[(1, 0), (0, 0)], draw_mode=DrawMode.DELTA)
+        game.run()
+        assert self.ui.draw_delta.call_count == 1
+        assert self.ui.draw.call_count == 3
+
+    def test_full_draws_without_draw_delta(self) -> None:
+        # Matches UiProtocol without subclassing it: no draw_delta at all
+        drawn: List[List[Position]] = []
+
+        class FullFramesUi:
+            def draw(self, snake: Iterable[Position], egg: Position) -> None:
+                drawn.append(list(snake))
+
+            def direction(self) -> Direction:
+                return Direction.DEFAULT
+
+        egg_creator = Mock()
+        egg_creator.create.return_value = (10, 10)
+        game = Game(iterations=3, egg_creator=egg_creator, ui=FullFramesUi(),  # type: ignore[arg-type]
+                    snake=[(1, 0), (0, 0)], draw_mode=DrawMode.DELTA)
+        game.run()
+        assert drawn == [[(1, 0), (0, 0)], [(2, 0), (1, 0)], [(3, 0), (2, 0)]]
+
+
 class TestEggInteraction(BaseTestCase):
     def get_drawn_eggs(self) -> List[Position]:
         call_args = [call.kwargs for call in self.ui.draw.call_args_list]
@@ -183,6 +248,19 @@ class TestEggInteraction(BaseTestCase):
             (15, 15)
         ]
 
+    def test_creator_without_free_cells(self) -> None:
+        # Written to the first EggCreator protocol: create takes nothing
+        class Creator:
+            def __init__(self) -> None:
+                self.eggs = iter([(0, 0), (2, 0), (15, 15)])
+
+            def create(self) -> Position:
+                return next(self.eggs)
+
+        game = Game(iterations=2, egg_creator=Creator(), ui=self.ui, snake=[(1, 0), (0, 0)])
+        game.run()
+        assert self.get_drawn_eggs() == [(2, 0), (15, 15)]
+
     def test_eat_last_egg(self) -> None:
         egg_creator = Mock()
         egg_creator.create.return_value = (1, 1)
@@ -196,6 +274,50 @@ class TestEggInteraction(BaseTestCase):
             result = game.run()
             assert result is True
 
+    def test_random_egg_on_last_free_cell(self) -> None:
+        game = Game(iterations=1, ui=self.ui,
+                    snake=[(0, 1), (0, 0), (1, 0)],
+                    size=2)
+        with Timeout():
+            game.run()
+        assert self.get_drawn_eggs() == [(1, 1)]
+
+
+class TestGameResult(BaseTestCase):
+    def setup_method(self) -> None:
+        self.ui = Mock()
+        self.ui.direction = mock_direction(Direction.RIGHT)
+
+    def test_stopped_with_eggs(self) -> None:
+        egg_creator = Mock()
+        egg_creator.create.side_effect = [(2, 0), (5, 0), (10, 10)]
+        game = Game(iterations=5, egg_creator=egg_creator, ui=self.ui, snake=[(1, 0), (0, 0)])
+        game.run()
+        result = game.result()
+        assert result == GameResult(ticks=5, length=4, eggs=2, cause=STOPPED, egg_ticks=(1, 3))
+        assert not result.won and not result.lost
+
+    def test_won(self) -> None:
+        egg_creator = Mock()
+        egg_creator.create.return_value = (1, 1)
+        game = Game(egg_creator=egg_creator, ui=self.ui, snake=[(0, 1), (0, 0), (1, 0)], size=2)
+        game.run()
+        assert game.result().cause == WON
+        assert game.result().won
+
+    def test_bit_itself(self) -> None:
+        game = Game(size=20, ui=self.ui, snake=[(0, 1), (0, 0), (1, 0), (1, 1), (1, 2)])
+        game.run()
+        assert game.result().cause == BIT_ITSELF
+        assert game.result().lost
+
+    def test_restore_keeps_the_cause(self) -> None:
+        game = Game(size=20, ui=self.ui, snake=[(0, 1), (0, 0), (1, 0), (1, 1), (1, 2)])
+        game.run()
+        snapshot = game.snapshot()
+        game.restore(snapshot)
+        assert game.result().cause == BIT_ITSELF
+
 
 class TestRandomEggCreator():
     def test_create_in_bounds(self) -> None:
@@ -220,6 +342,29 @@ class TestRandomEggCreator():
                     expected_positions.remove(egg)
 
 
+    def test_create_in_rectangle(self) -> None:
+        creator = RandomEggCreator(3, height=40)
+        eggs = [creator.create() for _ in range(1000)]
+        assert max(egg[0] for egg in eggs) == 2
+        assert max(egg[1] for egg in eggs) > 2
+
+    def test_create_in_free_cells(self) -> None:
+        creator = RandomEggCreator(4)
+        free_cells = FreeCells(4, 4)
+        for position in [(x, y) for x in range(4) for y in range(4) if x != 3]:
+            free_cells.remove(position)
+        for _ in range(100):
+            assert creator.create(free_cells)[0] == 3
+
+    def test_create_in_no_free_cells(self) -> None:
+        # An empty set of free cells is still given: there is no egg to pick
+        free_cells = FreeCells(2, 2)
+        for position in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            free_cells.remove(position)
+        with pytest.raises(IndexError):
+            RandomEggCreator(2).create(free_cells)
+
+
 def mock_direction(directions: Union[Direction, List[Direction]] = None) -> Callable[[], Direction]:
     if directions is None:
         return Mock(return_value=None)
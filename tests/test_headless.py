@@ -0,0 +1,76 @@
+from random import Random
+from typing import Iterable, List
+
+import pytest
+
+from snake.direction import Direction
+from snake.game import DrawMode, Game
+from snake.types import Position
+from snake.ui.headless import HeadlessUi
+
+
+class TestHeadlessUi():
+
+    def test_keeps_going_by_default(self) -> None:
+        ui = HeadlessUi()
+        assert ui.direction() is Direction.DEFAULT
+
+    def test_script(self) -> None:
+        ui = HeadlessUi(script=[Direction.UP, Direction.LEFT])
+        assert [ui.direction() for _ in range(3)] == [
+            Direction.UP, Direction.LEFT, Direction.DEFAULT]
+
+    def test_policy_sees_last_frame(self) -> None:
+        seen: List[Position] = []
+
+        def policy(snake: Iterable[Position], egg: Position) -> Direction:
+            seen.append(egg)
+            return Direction.DOWN
+
+        ui = HeadlessUi(policy=policy)
+        ui.draw([(1, 0), (0, 0)], (4, 4))
+        assert ui.direction() is Direction.DOWN
+        assert seen == [(4, 4)]
+
+    def test_random_is_seeded(self) -> None:
+        first = HeadlessUi(rng=Random(3))
+        second = HeadlessUi(rng=Random(3))
+        directions = [first.direction() for _ in range(20)]
+        assert directions == [second.direction() for _ in range(20)]
+        assert Direction.DEFAULT not in directions
+
+    def test_single_input_source(self) -> None:
+        with pytest.raises(ValueError):
+            HeadlessUi(script=[], rng=Random())
+
+
+class TestDrawModes():
+
+    def test_skip_never_draws(self) -> None:
+        ui = HeadlessUi(script=[Direction.UP])
+        ui.draw = None  # type: ignore
+        game = Game(ui=ui, iterations=3, snake=[(1, 0), (0, 0)],
+                    draw_mode=DrawMode.SKIP)
+        assert game.run() is True
+
+    def test_view_is_live(self) -> None:
+        heads: List[Position] = []
+
+        def policy(snake: Iterable[Position], egg: Position) -> Direction:
+            heads.append(next(iter(snake)))
+            return Direction.DOWN
+
+        game = Game(ui=HeadlessUi(policy=policy), iterations=3,
+                    snake=[(1, 0), (0, 0)], draw_mode=DrawMode.VIEW)
+        game.run()
+        assert heads == [(1, 0), (1, 1), (1, 2)]
+
+    def test_view_is_read_only(self) -> None:
+        ui = HeadlessUi()
+        Game(ui=ui, iterations=1, snake=[(1, 0), (0, 0)],
+             draw_mode=DrawMode.VIEW).run()
+        assert not isinstance(ui._snake, list)
+        assert not hasattr(ui._snake, "move")
+        assert list(ui._snake) == [(2, 0), (1, 0)]
+        assert len(ui._snake) == 2  # type: ignore
+        assert (1, 0) in ui._snake
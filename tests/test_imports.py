@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+import pytest
+
+import snake
+import snake.ui
+
+
+def imported_modules(statement: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", statement + "; import sys; print(sorted(sys.modules))"],
+        check=True, capture_output=True, text=True).stdout
+
+
+class TestLazyImports():
+
+    def test_import_snake_does_not_load_pygame(self) -> None:
+        modules = imported_modules("import snake")
+        assert "'snake.game'" in modules
+        assert "pygame" not in modules
+
+    def test_headless_game_does_not_load_pygame(self) -> None:
+        modules = imported_modules(
+            "from snake.game import Game; from snake.ui.headless import HeadlessUi; "
+            "Game(ui=HeadlessUi(), iterations=10).run()")
+        assert "pygame" not in modules
+
+    def test_pygame_ui_on_first_use(self) -> None:
+        modules = imported_modules("from snake import PygameUi")
+        assert "'pygame'" in modules
+
+    def test_unknown_attribute(self) -> None:
+        with pytest.raises(AttributeError):
+            snake.NotAThing  # type: ignore
+        with pytest.raises(AttributeError):
+            snake.ui.NotAThing  # type: ignore
+
+
+class TestBackendRegistry():
+
+    def test_get_backend(self) -> None:
+        from snake.ui.headless import HeadlessUi
+        assert snake.ui.get_backend("headless") is HeadlessUi
+        assert "pygame" in snake.ui.backends()
+
+    def test_unknown_backend(self) -> None:
+        with pytest.raises(ValueError):
+            snake.ui.get_backend("nope")
+
+    def test_register_backend(self) -> None:
+        snake.ui.register_backend("other-headless", "snake.ui.headless", "HeadlessUi")
+        try:
+            assert snake.ui.get_backend("other-headless") is snake.ui.get_backend("headless")
+        finally:
+            snake.ui._BACKENDS.pop("other-headless")
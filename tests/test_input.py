@@ -0,0 +1,63 @@
+from typing import List
+
+import pytest
+
+from snake.direction import Direction
+from snake.ui.input import InputBuffer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+class TestInputBuffer():
+
+    def test_one_turn_per_tick(self) -> None:
+        buffer = InputBuffer()
+        buffer.push(Direction.UP)
+        buffer.push(Direction.LEFT)
+        assert buffer.pop(Direction.RIGHT) is Direction.UP
+        assert buffer.pop(Direction.UP) is Direction.LEFT
+        assert buffer.pop(Direction.LEFT) is Direction.DEFAULT
+
+    def test_skips_useless_turns(self) -> None:
+        buffer = InputBuffer()
+        for direction in (Direction.RIGHT, Direction.LEFT, Direction.DOWN):
+            buffer.push(direction)
+        assert buffer.pop(Direction.RIGHT) is Direction.DOWN
+        assert buffer.skipped == 2
+        assert buffer.applied == 1
+
+    def test_unknown_heading(self) -> None:
+        buffer = InputBuffer()
+        buffer.push(Direction.LEFT)
+        assert buffer.pop(None) is Direction.LEFT
+
+    def test_bounded(self) -> None:
+        buffer = InputBuffer(capacity=2)
+        pushed: List[bool] = [buffer.push(direction) for direction in
+                              (Direction.UP, Direction.LEFT, Direction.DOWN)]
+        assert pushed == [True, True, False]
+        assert buffer.dropped == 1
+        assert len(buffer) == 2
+        with pytest.raises(ValueError):
+            InputBuffer(capacity=0)
+
+    def test_latency(self) -> None:
+        clock = FakeClock()
+        buffer = InputBuffer(clock=clock)
+        buffer.push(Direction.UP)
+        clock.now = 1_000
+        buffer.rendered()
+        assert buffer.latency.count == 0
+        assert buffer.pop(Direction.RIGHT) is Direction.UP
+        clock.now = 5_000
+        buffer.rendered()
+        buffer.rendered()
+        assert buffer.latency.count == 1
+        assert buffer.latency.max_ns == 5_000
+        assert buffer.summary()["latency_p99_ns"] == 5_000
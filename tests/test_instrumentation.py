@@ -0,0 +1,84 @@
+from typing import List, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from snake.direction import Direction
+from snake.game import DrawMode, Game
+from snake.instrumentation import Instrumentation, Phase, PhaseStats
+from snake.ui.headless import HeadlessUi
+
+
+class TestPhaseStats():
+
+    def test_add(self) -> None:
+        stats = PhaseStats()
+        for ns in [100, 300, 200]:
+            stats.add(ns)
+        assert (stats.count, stats.min_ns, stats.max_ns) == (3, 100, 300)
+        assert stats.mean_ns == 200
+        assert sum(stats.buckets) == 3
+
+    def test_quantile(self) -> None:
+        stats = PhaseStats()
+        for ns in [10] * 99 + [5000]:
+            stats.add(ns)
+        assert stats.quantile(.5) == 16
+        assert stats.quantile(1) == 5000
+
+
+class TestInstrumentation():
+
+    def game(self, instrumentation: Instrumentation) -> Game:
+        egg_creator = Mock()
+        egg_creator.create.side_effect = [(0, 0), (3, 0), (10, 10)]
+        return Game(ui=HeadlessUi(), iterations=5, snake=[(1, 0), (0, 0)],
+                    egg_creator=egg_creator, draw_mode=DrawMode.VIEW,
+                    instrumentation=instrumentation)
+
+    def test_counters(self) -> None:
+        instrumentation = Instrumentation()
+        assert self.game(instrumentation).run() is True
+        assert instrumentation.counters == {
+            "ticks": 5, "eggs_placed": 2, "egg_retries": 1}
+
+    def test_every_phase_is_timed(self) -> None:
+        instrumentation = Instrumentation()
+        self.game(instrumentation).run()
+        assert instrumentation.phases[Phase.DRAW].count == 5
+        assert instrumentation.phases[Phase.DIRECTION].count == 5
+        assert instrumentation.phases[Phase.MOVE].count == 5
+        assert instrumentation.phases[Phase.PLACE_EGG].count == 2
+
+    def test_sampling(self) -> None:
+        instrumentation = Instrumentation(sample_every=2)
+        self.game(instrumentation).run()
+        assert instrumentation.phases[Phase.MOVE].count == 3
+        assert instrumentation.counters["ticks"] == 5
+
+    def test_hooks(self) -> None:
+        samples: List[Tuple[Phase, int]] = []
+        instrumentation = Instrumentation(hooks=[lambda phase, ns: samples.append((phase, ns))])
+        self.game(instrumentation).run()
+        assert len(samples) == 17
+        assert all(ns >= 0 for _, ns in samples)
+
+    def test_summary(self) -> None:
+        instrumentation = Instrumentation()
+        self.game(instrumentation).run()
+        summary = instrumentation.summary()
+        assert summary["draw"]["samples"] == 5
+        assert summary["counters"]["ticks"] == 5
+
+    def test_invalid_sampling(self) -> None:
+        with pytest.raises(ValueError):
+            Instrumentation(sample_every=0)
+
+    def test_same_game_with_or_without(self) -> None:
+        plain = Game(ui=HeadlessUi(script=[Direction.DOWN] * 3 + [Direction.LEFT]),
+                     iterations=30, snake=[(1, 0), (0, 0)])
+        timed = Game(ui=HeadlessUi(script=[Direction.DOWN] * 3 + [Direction.LEFT]),
+                     iterations=30, snake=[(1, 0), (0, 0)],
+                     instrumentation=Instrumentation())
+        assert plain.run() == timed.run()
+        assert plain.ticks == timed.ticks == 30
@@ -0,0 +1,96 @@
+import os
+from time import perf_counter
+from typing import Any, List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # type: ignore
+
+from snake.direction import Direction
+from snake.ui.pygame import BLACK, CELL_SIZE, WHITE, YELLOW, PygameUi
+
+
+class TestPygameUi():
+
+    def setup_method(self) -> None:
+        self.ui = PygameUi(4, fps=None)
+        self.updates: List[Any] = []
+        self._update = pygame.display.update
+        pygame.display.update = lambda *args: self.updates.append(args)
+
+    def teardown_method(self) -> None:
+        pygame.display.update = self._update
+        pygame.quit()
+
+    def color_at(self, x: int, y: int) -> Any:
+        return tuple(self.ui.screen.get_at((x * CELL_SIZE, y * CELL_SIZE)))[:3]
+
+    def test_full_draw(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 3))
+        assert self.color_at(1, 0) == WHITE
+        assert self.color_at(3, 3) == YELLOW
+        assert self.updates == [()]
+
+    def test_delta_only_updates_changed_cells(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 3))
+        self.ui.draw_delta(head=(2, 0), tail=(0, 0), egg=(3, 3))
+        assert self.color_at(0, 0) == BLACK
+        assert self.color_at(2, 0) == WHITE
+        rects = self.updates[-1][0]
+        assert [(rect.x, rect.y) for rect in rects] == [
+            (0, 0), (2 * CELL_SIZE, 0)]
+
+    def test_delta_moved_egg(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (2, 0))
+        self.ui.draw_delta(head=(2, 0), tail=None, egg=(0, 3))
+        assert self.color_at(2, 0) == WHITE
+        assert self.color_at(0, 3) == YELLOW
+        assert len(self.updates[-1][0]) == 2
+
+    def press(self, *keys: int) -> None:
+        for key in keys:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def test_quick_turns_play_on_successive_ticks(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 3))
+        self.press(pygame.K_UP, pygame.K_LEFT)
+        assert self.ui.direction() is Direction.UP
+        self.ui.draw_delta(head=(1, 3), tail=(0, 0), egg=(3, 3))
+        assert self.ui.direction() is Direction.LEFT
+        assert self.ui.direction() is Direction.DEFAULT
+
+    def test_skips_turns_going_back(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 3))
+        self.press(pygame.K_LEFT, pygame.K_RIGHT, pygame.K_DOWN)
+        assert self.ui.direction() is Direction.DOWN
+        assert self.ui.input.skipped == 2
+
+    def test_heading_from_wrapped_snake(self) -> None:
+        self.ui.draw([(0, 0), (3, 0)], (3, 3))
+        self.press(pygame.K_LEFT, pygame.K_UP)
+        assert self.ui.direction() is Direction.UP
+
+    def test_input_to_render_latency(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 3))
+        self.press(pygame.K_UP)
+        self.ui.direction()
+        self.ui.draw_delta(head=(1, 3), tail=(0, 0), egg=(3, 3))
+        assert self.ui.input.latency.count == 1
+        self.ui.draw_delta(head=(1, 2), tail=(1, 0), egg=(3, 3))
+        assert self.ui.input.latency.count == 1
+
+    def test_frames_are_paced(self) -> None:
+        ui = PygameUi(4, fps=50)
+        start = perf_counter()
+        for _ in range(4):
+            ui.draw([(1, 0), (0, 0)], (3, 3))
+        # The first frame goes out at once, then one every 20ms
+        assert .05 <= perf_counter() - start < .5
+
+    def test_frames_are_capped_by_default(self) -> None:
+        ui = PygameUi(4)
+        start = perf_counter()
+        for _ in range(2):
+            ui.draw([(1, 0), (0, 0)], (3, 3))
+        # 5 fps without a Timestep: the second frame waits about 200ms
+        assert perf_counter() - start >= .15
@@ -0,0 +1,135 @@
+import os
+import struct
+import subprocess
+import sys
+import zlib
+from pathlib import Path
+from random import Random
+from typing import List
+
+import numpy as np  # type: ignore
+import pytest
+
+from snake.render import EGG, EMPTY, PALETTE, SNAKE, OffscreenUi, encode_png, render_replay, render_replays
+from snake.replay import Replay, Replayer, record_game
+from snake.ui.headless import HeadlessUi
+from snake.ui.style import BLACK, CELL_SIZE, WHITE, YELLOW
+
+
+def decode_png(data: bytes) -> 'np.ndarray':
+    # Enough of a PNG decoder for what encode_png writes: (h, w, 3) colors
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    offset = 8
+    chunks = {}
+    while offset < len(data):
+        length, = struct.unpack_from(">I", data, offset)
+        kind = data[offset + 4:offset + 8]
+        body = data[offset + 8:offset + 8 + length]
+        crc, = struct.unpack_from(">I", data, offset + 8 + length)
+        assert crc == zlib.crc32(body, zlib.crc32(kind))
+        chunks[kind] = body
+        offset += 12 + length
+    width, height, depth, color_type = struct.unpack_from(">IIBB", chunks[b"IHDR"])
+    assert (depth, color_type) == (8, 3)
+    palette = np.frombuffer(chunks[b"PLTE"], dtype=np.uint8).reshape(-1, 3)
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, width + 1)
+    assert not rows[:, 0].any()
+    return palette[rows[:, 1:]]
+
+
+def color_at(image: 'np.ndarray', x: int, y: int) -> tuple:
+    return tuple(image[y * CELL_SIZE + CELL_SIZE // 2, x * CELL_SIZE + CELL_SIZE // 2])
+
+
+def recorded(path: Path, seed: int) -> Replay:
+    with open(path, "wb") as out:
+        record_game(out, HeadlessUi(rng=Random(seed)), seed=seed, iterations=30, size=10)
+    with open(path, "rb") as source:
+        return Replay.load(source)
+
+
+class TestOffscreenUi():
+
+    def test_draw(self) -> None:
+        frames: List[bytes] = []
+        ui = OffscreenUi(4, 3, lambda rows: frames.append(encode_png(rows)))
+        ui.draw([(1, 0), (0, 0)], (3, 2))
+        assert ui.frame.shape == (3 * CELL_SIZE, 4 * CELL_SIZE)
+        image = decode_png(frames[0])
+        assert color_at(image, 1, 0) == WHITE
+        assert color_at(image, 0, 0) == WHITE
+        assert color_at(image, 3, 2) == YELLOW
+        assert color_at(image, 2, 1) == BLACK
+
+    def test_draw_delta_repaints_changed_cells(self) -> None:
+        ui = OffscreenUi(4)
+        ui.draw([(1, 0), (0, 0)], (3, 3))
+        ui.draw_delta((2, 0), (0, 0), (3, 3))
+        expected = OffscreenUi(4)
+        expected.draw([(2, 0), (1, 0)], (3, 3))
+        assert (ui.frame == expected.frame).all()
+        ui.draw_delta((3, 0), None, (0, 2))
+        assert ui.frame[2 * CELL_SIZE, 0] == EGG
+        assert ui.frame[0, 3 * CELL_SIZE] == SNAKE
+        assert ui.frames == 3
+
+    def test_reuses_one_buffer(self) -> None:
+        seen = []
+        ui = OffscreenUi(4, sink=lambda rows: seen.append(rows))
+        ui.draw([(1, 0), (0, 0)], (3, 3))
+        ui.draw_delta((2, 0), (0, 0), (3, 3))
+        assert seen[0] is seen[1]
+
+    def test_palette(self) -> None:
+        assert [PALETTE[EMPTY], PALETTE[SNAKE], PALETTE[EGG]] == [BLACK, WHITE, YELLOW]
+
+    def test_does_not_load_pygame(self) -> None:
+        code = "import sys, snake.render; assert 'pygame' not in sys.modules"
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class TestRenderReplay():
+
+    def test_one_frame_per_tick(self, tmp_path: Path) -> None:
+        replay = recorded(tmp_path / "game.snkr", 3)
+        frames = render_replay(replay, str(tmp_path / "frames"))
+        assert frames == replay.ticks + 1
+        names = sorted(os.listdir(tmp_path / "frames"))
+        assert len(names) == frames
+        assert names[0] == "frame_000000.png"
+        first = decode_png((tmp_path / "frames" / names[0]).read_bytes())
+        for x, y in replay.snake:
+            assert color_at(first, x, y) == WHITE
+
+    def test_matches_a_full_redraw(self, tmp_path: Path) -> None:
+        replay = recorded(tmp_path / "game.snkr", 5)
+        render_replay(replay, str(tmp_path / "frames"))
+        last = sorted(os.listdir(tmp_path / "frames"))[-1]
+        image = decode_png((tmp_path / "frames" / last).read_bytes())
+
+        game = Replayer(replay).run()
+        expected = OffscreenUi(10)
+        expected.draw(game.snake, game.egg)
+        assert (image == np.array(PALETTE, dtype=np.uint8)[expected.frame]).all()
+
+    def test_parallel(self, tmp_path: Path) -> None:
+        paths = [str(tmp_path / "game{}.snkr".format(seed)) for seed in range(3)]
+        replays = [recorded(Path(path), seed) for seed, path in enumerate(paths)]
+        results = render_replays(paths, str(tmp_path / "out"), workers=2)
+        assert results == [(path, replay.ticks + 1) for path, replay in zip(paths, replays)]
+        for seed in range(3):
+            assert len(os.listdir(tmp_path / "out" / "game{}".format(seed))) == replays[seed].ticks + 1
+
+    def test_pygame_reads_the_frames(self, tmp_path: Path) -> None:
+        pygame = pytest.importorskip("pygame")
+        path = tmp_path / "frame.png"
+
+        def save(rows: 'np.ndarray') -> None:
+            path.write_bytes(encode_png(rows))
+
+        ui = OffscreenUi(3, sink=save)
+        ui.draw([(1, 1), (0, 1)], (2, 2))
+        surface = pygame.image.load(str(path))
+        assert surface.get_size() == (3 * CELL_SIZE, 3 * CELL_SIZE)
+        assert tuple(surface.get_at((CELL_SIZE + 1, CELL_SIZE + 1)))[:3] == WHITE
+        assert tuple(surface.get_at((2 * CELL_SIZE + 1, 2 * CELL_SIZE + 1)))[:3] == YELLOW
@@ -0,0 +1,129 @@
+import io
+from random import Random
+from typing import Iterable, List, Optional
+
+import pytest
+
+from snake.autopilot import Autopilot
+from snake.direction import Direction
+from snake.game import DrawMode
+from snake.replay import InvalidReplayError, Recorder, Replay, Replayer, record_game
+from snake.types import Position
+from snake.ui.headless import HeadlessUi
+
+
+class FrameUi(HeadlessUi):
+    def __init__(self, rng: Random):
+        super().__init__(rng=rng)
+        self.frames: List[List[Position]] = []
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        self.frames.append(list(snake))
+
+
+def recorded(seed: int, iterations: Optional[int] = None, size: int = 10) -> bytes:
+    out = io.BytesIO()
+    record_game(out, FrameUi(Random(seed)), seed=seed, iterations=iterations, size=size)
+    return out.getvalue()
+
+
+class TestRecorder():
+
+    def test_two_bits_per_tick(self) -> None:
+        out = io.BytesIO()
+        recorder = Recorder(out, 4, 4, 1, [(1, 0), (0, 0)])
+        for direction in [Direction.UP, Direction.DOWN, Direction.LEFT,
+                          Direction.RIGHT, Direction.LEFT]:
+            recorder.record(direction)
+        recorder.close()
+        replay = Replay.from_bytes(out.getvalue())
+        assert replay.ticks == 5
+        assert len(replay.moves) == 2
+        assert [replay.direction(tick) for tick in range(5)] == [
+            Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT, Direction.LEFT]
+        assert replay.snake == [(1, 0), (0, 0)]
+        assert (replay.width, replay.height, replay.seed) == (4, 4, 1)
+
+    def test_records_the_direction_taken(self) -> None:
+        out = io.BytesIO()
+        record_game(out, HeadlessUi(script=[Direction.LEFT, None, Direction.UP]),  # type: ignore
+                    seed=0, iterations=3, snake=[(1, 0), (0, 0)])
+        replay = Replay.from_bytes(out.getvalue())
+        assert [replay.direction(tick) for tick in range(3)] == [
+            Direction.RIGHT, Direction.RIGHT, Direction.UP]
+
+    def test_invalid(self) -> None:
+        with pytest.raises(InvalidReplayError):
+            Replay.from_bytes(b"not a replay at all, really")
+        with pytest.raises(InvalidReplayError):
+            Replay.from_bytes(recorded(0, iterations=20)[:-5])
+
+
+class TestReplayer():
+
+    def test_replays_every_frame(self) -> None:
+        ui = FrameUi(Random(5))
+        out = io.BytesIO()
+        won = record_game(out, ui, seed=5, size=10)
+        replayer = Replayer(Replay.from_bytes(out.getvalue()))
+        for frame in ui.frames:
+            assert list(replayer.game.snake) == frame
+            replayer.step()
+        assert replayer.step() is False
+        assert replayer.game.lost is not won
+
+    def test_rectangular_board(self) -> None:
+        ui = FrameUi(Random(2))
+        out = io.BytesIO()
+        record_game(out, ui, seed=2, iterations=200, width=12, height=7)
+        replayer = Replayer(Replay.from_bytes(out.getvalue()))
+        for frame in ui.frames:
+            assert list(replayer.game.snake) == frame
+            replayer.step()
+
+    def test_run_to_the_end(self) -> None:
+        replay = Replay.from_bytes(recorded(3, iterations=500))
+        game = Replayer(replay).run()
+        assert game.ticks == replay.ticks
+
+    def test_seek(self) -> None:
+        # A whole game, won by the autopilot: many eggs are placed after
+        # the keyframes, most of them once the free cells are indexed
+        out = io.BytesIO()
+        record_game(out, Autopilot(8), seed=3, size=8, draw_mode=DrawMode.VIEW)
+        replay = Replay.from_bytes(out.getvalue())
+        reference = Replayer(replay)
+        expected = []
+        while True:
+            expected.append((list(reference.game.snake), reference.game.egg))
+            if not reference.step():
+                break
+        assert reference.game.won
+
+        replayer = Replayer(replay, keyframe_interval=8)
+        replayer.run()
+        for tick in range(replay.ticks, -1, -1):
+            game = replayer.seek(tick)
+            assert (list(game.snake), game.egg) == expected[tick]
+        for tick in [200, 10, 250, 250, 0, replay.ticks, 33]:
+            game = replayer.seek(tick)
+            assert (list(game.snake), game.egg) == expected[tick]
+
+    def test_keyframes_are_capped(self) -> None:
+        replay = Replay.from_bytes(recorded(3, iterations=500))
+        replayer = Replayer(replay, keyframe_interval=1, max_keyframes=8)
+        replayer.run()
+        assert len(replayer._keyframes) <= 8
+        assert all(tick % replayer._interval == 0 for tick in replayer._keyframes)
+        reference = Replayer(replay)
+        for tick in [replay.ticks, 0, replay.ticks // 2, 1]:
+            reference.seek(0)
+            while reference.tick < tick:
+                reference.step()
+            game = replayer.seek(tick)
+            assert (list(game.snake), game.egg) == (list(reference.game.snake), reference.game.egg)
+
+    def test_seek_out_of_replay(self) -> None:
+        replay = Replay.from_bytes(recorded(1, iterations=10))
+        with pytest.raises(IndexError):
+            Replayer(replay).seek(replay.ticks + 1)
@@ -0,0 +1,49 @@
+import asyncio
+from typing import List, Tuple
+
+from snake.game import Game
+from snake.server import Delta, End, Full, GameServer, Message, read_message
+
+
+async def play(server: GameServer, inputs: bytes, messages: int) -> Tuple[List[Message], GameServer]:
+    listener = await server.start()
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(inputs)
+    received: List[Message] = [await read_message(reader)]
+    width = received[0].width  # type: ignore
+    for _ in range(messages - 1):
+        received.append(await read_message(reader, width))
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    return received, server
+
+
+class TestGameServer():
+
+    def test_full_frame_then_deltas(self) -> None:
+        server = GameServer(size=20, interval=.001, seed=0)
+        messages, _ = asyncio.run(play(server, b"", 3))
+        full, first, second = messages
+        assert isinstance(full, Full)
+        assert (full.width, full.height, full.snake) == (20, 20, Game.DEFAULT_SNAKE)
+        assert first == Delta(head=(8, 5), tail=(5, 5), egg=full.egg)
+        assert second == Delta(head=(9, 5), tail=(6, 5), egg=full.egg)
+
+    def test_inputs(self) -> None:
+        # The first tick is played on connection, the turns arrive for the
+        # second one and only the latest counts
+        server = GameServer(size=20, interval=.05, seed=0)
+        messages, _ = asyncio.run(play(server, bytes((1, 9, 2)), 3))
+        assert messages[1] == Delta(head=(8, 5), tail=(5, 5), egg=messages[0].egg)  # type: ignore
+        assert isinstance(messages[2], Delta)
+        assert messages[2].head == (8, 6)
+
+    def test_end_of_game(self) -> None:
+        server = GameServer(size=20, interval=.001, max_ticks=3, seed=0)
+        messages, server = asyncio.run(play(server, b"", 4))
+        assert messages[-1] == End(won=False, lost=False, ticks=3)
+        assert server.games == 1
+        assert server.ticks == 2
+        assert server.lateness.count == 2
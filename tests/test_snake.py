@@ -25,6 +25,11 @@ class TestSnake():
             snake = Snake(self.board, positions=[(0, 0)])
         assert str(e.value) == "snake should have a length of at least 2"
 
+    def test_create_must_fit_on_the_board(self) -> None:
+        with pytest.raises(Exception) as e:
+            Snake(self.board, positions=[(4, 0), (3, 0)])
+        assert str(e.value) == "snake should fit on the board"
+
     def test_compute_direction(self) -> None:
         # TODO: test through the public API ; direction should not be part of the public api
         assert Snake(self.board, positions=[(1, 0), (0, 0)]).direction \
@@ -94,6 +99,68 @@ class TestSnake():
         snake = Snake(self.board, positions=[(0, 1), (0, 0)])
         assert [pos for pos in snake] == [(0, 1), (0, 0)]
 
+    def test_contains(self) -> None:
+        snake = Snake(self.board, positions=[(1, 0), (0, 0)])
+        assert (1, 0) in snake
+        assert (0, 0) in snake
+        assert (2, 0) not in snake
+        snake.move()
+        assert (0, 0) not in snake
+        assert (2, 0) in snake
+        assert len(snake) == 2
+
+    def test_move_into_vacated_tail(self) -> None:
+        snake = Snake(self.board, positions=[(0, 1), (0, 0), (1, 0), (1, 1)])
+        snake.direction = Direction.RIGHT
+        snake.move()
+        assert snake.positions == [(1, 1), (0, 1), (0, 0), (1, 0)]
+
+    def test_free_cells_follow_the_snake(self) -> None:
+        snake = Snake(self.board, positions=[(1, 0), (0, 0)])
+        assert len(snake.free_cells) == 14
+        snake.move()
+        assert (0, 0) in snake.free_cells
+        assert (2, 0) not in snake.free_cells
+        snake.move(True)
+        assert len(snake.free_cells) == 13
+
+    def test_clone(self) -> None:
+        snake = Snake(self.board, positions=[(1, 0), (0, 0)])
+        clone = snake.clone()
+        clone.direction = Direction.DOWN
+        clone.move(True)
+        assert snake.positions == [(1, 0), (0, 0)]
+        assert snake.direction == Direction.RIGHT
+        assert (1, 1) not in snake
+        assert clone.positions == [(1, 1), (1, 0), (0, 0)]
+
+    def test_make_and_unmake_move(self) -> None:
+        snake = Snake(self.board, positions=[(1, 0), (0, 0)])
+        assert snake.make_move(Direction.DOWN) is False
+        assert snake.make_move(Direction.LEFT, egg=(0, 1)) is True
+        assert snake.positions == [(0, 1), (1, 1), (1, 0)]
+        snake.unmake_move()
+        assert snake.positions == [(1, 1), (1, 0)]
+        assert snake.direction == Direction.DOWN
+        snake.unmake_move()
+        assert snake.positions == [(1, 0), (0, 0)]
+        assert snake.direction == Direction.RIGHT
+        assert (1, 1) not in snake and (0, 0) in snake
+        assert len(snake.free_cells) == 14
+
+    def test_make_move_bite_leaves_snake_untouched(self) -> None:
+        snake = Snake(self.board, positions=[
+                      (0, 1), (0, 0), (1, 0), (1, 1), (1, 2)])
+        with pytest.raises(Snake.BitesItselfError):
+            snake.make_move(Direction.RIGHT)
+        assert snake.positions == [(0, 1), (0, 0), (1, 0), (1, 1), (1, 2)]
+        assert snake.direction == Direction.DOWN
+        assert (1, 2) in snake
+
+    def test_default_positions_not_shared(self) -> None:
+        Snake(self.board).move(True)
+        assert Snake(self.board).positions == [(1, 0), (0, 0)]
+
 
 class TestLoopOver():
     board = Board(width=4, height=6)
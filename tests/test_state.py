@@ -0,0 +1,71 @@
+from unittest.mock import Mock
+
+import pytest
+
+from snake.direction import Direction
+from snake.game import Board, Game, Snake
+from snake.state import GameState
+
+
+class TestGameState():
+
+    def test_game_state_is_detached(self) -> None:
+        egg_creator = Mock()
+        egg_creator.create.return_value = (10, 10)
+        game = Game(ui=Mock(), iterations=1, snake=[(1, 0), (0, 0)], egg_creator=egg_creator)
+        game.start()
+        state = game.state()
+        state.make_move(Direction.DOWN)
+        assert list(game.snake) == [(1, 0), (0, 0)]
+        assert list(state.snake) == [(1, 1), (1, 0)]
+        assert state.egg == (10, 10)
+
+    def test_clone(self) -> None:
+        state = GameState(Snake(Board(4, 4), [(1, 0), (0, 0)]), (2, 0))
+        clone = state.clone()
+        clone.make_move(Direction.DEFAULT)
+        assert clone.egg is None
+        assert state.egg == (2, 0)
+        assert list(state.snake) == [(1, 0), (0, 0)]
+
+    def test_make_unmake_eat(self) -> None:
+        state = GameState(Snake(Board(4, 4), [(1, 0), (0, 0)]), (2, 0))
+        assert state.make_move(Direction.DEFAULT) is True
+        assert state.egg is None
+        assert len(state.snake) == 3
+        state.unmake_move()
+        assert state.egg == (2, 0)
+        assert list(state.snake) == [(1, 0), (0, 0)]
+
+    def test_make_unmake_bite(self) -> None:
+        state = GameState(Snake(Board(20, 20), [(0, 1), (0, 0), (1, 0), (1, 1), (1, 2)]))
+        assert state.make_move(Direction.RIGHT) is False
+        assert state.lost
+        with pytest.raises(ValueError):
+            state.make_move(Direction.RIGHT)
+        state.unmake_move()
+        assert not state.lost
+        assert list(state.snake) == [(0, 1), (0, 0), (1, 0), (1, 1), (1, 2)]
+
+    def test_won(self) -> None:
+        state = GameState(Snake(Board(2, 2), [(0, 1), (0, 0), (1, 0)]), (1, 1))
+        assert state.make_move(Direction.RIGHT) is False
+        assert state.won and state.over and not state.lost
+        state.unmake_move()
+        assert not state.over
+
+    def test_search_round_trip(self) -> None:
+        state = GameState(Snake(Board(5, 5), [(2, 2), (1, 2), (0, 2)]), (4, 4))
+        before = (list(state.snake), state.snake.direction, state.egg, len(state.snake.free_cells))
+
+        def explore(depth: int) -> None:
+            if depth == 0 or state.over:
+                return
+            for direction in [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]:
+                state.make_move(direction)
+                explore(depth - 1)
+                state.unmake_move()
+
+        explore(5)
+        assert (list(state.snake), state.snake.direction, state.egg,
+                len(state.snake.free_cells)) == before
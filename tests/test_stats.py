@@ -0,0 +1,106 @@
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from snake.game import BIT_ITSELF, HIT_WALL, STOPPED, WON, GameResult
+from snake.stats import ACCURACY, Aggregator, Distribution
+
+
+def result(ticks: int, cause: str = STOPPED, egg_ticks: tuple = ()) -> GameResult:
+    return GameResult(ticks=ticks, length=3 + len(egg_ticks), eggs=len(egg_ticks),
+                      cause=cause, egg_ticks=egg_ticks)
+
+
+class TestDistribution():
+
+    def test_moments(self) -> None:
+        distribution = Distribution()
+        for value in [2, 4, 4, 4, 5, 5, 7, 9]:
+            distribution.add(value)
+        assert distribution.count == 8
+        assert distribution.mean == 5
+        assert distribution.variance == pytest.approx(4)
+        assert (distribution.min, distribution.max) == (2, 9)
+
+    def test_quantiles_within_accuracy(self) -> None:
+        rng = Random(0)
+        values = sorted(rng.expovariate(1 / 1000) for _ in range(10000))
+        distribution = Distribution()
+        for value in values:
+            distribution.add(value)
+        for q in [.1, .5, .9, .99]:
+            exact = values[int(q * (len(values) - 1))]
+            assert distribution.quantile(q) == pytest.approx(exact, rel=2 * ACCURACY)
+
+    def test_constant_memory(self) -> None:
+        distribution = Distribution()
+        for value in range(1, 200000):
+            distribution.add(value)
+        assert len(distribution.buckets) < 700
+
+    def test_zeros(self) -> None:
+        distribution = Distribution()
+        for value in [0, 0, 0, 10]:
+            distribution.add(value)
+        assert distribution.quantile(.5) == 0
+        assert distribution.histogram()[0] == (0.0, 0.0, 3)
+        assert sum(count for _, _, count in distribution.histogram()) == 4
+
+    def test_merge_is_exact(self) -> None:
+        rng = Random(1)
+        values = [rng.randint(0, 5000) for _ in range(3000)]
+        whole, left, right = Distribution(), Distribution(), Distribution()
+        for index, value in enumerate(values):
+            whole.add(value)
+            (left if index % 3 else right).add(value)
+        left.merge(right)
+        left.merge(Distribution())
+        assert left.count == whole.count
+        assert left.mean == pytest.approx(whole.mean)
+        assert left.variance == pytest.approx(whole.variance)
+        assert (left.min, left.max, left.zeros) == (whole.min, whole.max, whole.zeros)
+        assert left.buckets == whole.buckets
+
+
+class TestAggregator():
+
+    def test_add(self) -> None:
+        aggregator = Aggregator().add_all([
+            result(10, WON, (2, 3)),
+            result(20, BIT_ITSELF, (5,)),
+            result(30, HIT_WALL),
+            result(40),
+        ])
+        summary = aggregator.summary()
+        assert (summary["games"], summary["won"], summary["lost"]) == (4, 1, 2)
+        assert summary["causes"] == {WON: 1, BIT_ITSELF: 1, HIT_WALL: 1, STOPPED: 1}
+        assert summary["ticks"]["mean"] == 25
+        assert summary["eggs"]["max"] == 2
+        assert aggregator.metrics["ticks_per_egg"].count == 3
+        assert summary["ticks_per_egg"]["mean"] == pytest.approx(10 / 3)
+
+    def test_merge(self) -> None:
+        results = [result(ticks, BIT_ITSELF, (ticks // 2,)) for ticks in range(1, 100)]
+        whole = Aggregator().add_all(results)
+        merged = Aggregator().add_all(results[:40])
+        merged.merge(Aggregator().add_all(results[40:]))
+        assert merged.games == 99
+        assert merged.causes == whole.causes
+        for metric in Aggregator.METRICS:
+            assert merged.metrics[metric].summary() == pytest.approx(whole.metrics[metric].summary())
+
+    def test_checkpoints(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "stats.json")
+        aggregator = Aggregator(path, checkpoint_every=10)
+        for ticks in range(1, 26):
+            aggregator.add(result(ticks))
+        assert Aggregator.load(path).games == 20
+        aggregator.save()
+        loaded = Aggregator.load(path)
+        assert loaded.summary() == aggregator.summary()
+        assert not (tmp_path / "stats.json.partial").exists()
+
+    def test_save_without_a_path(self) -> None:
+        with pytest.raises(ValueError):
+            Aggregator().save()
@@ -0,0 +1,161 @@
+import io
+import os
+import re
+from random import Random
+from typing import Dict, List, Tuple
+
+import pytest
+
+from snake.direction import Direction
+from snake.game import DrawMode, Game, RandomEggCreator
+from snake.ui.term import COLORS, EGG, EMPTY, SNAKE, TermUi
+
+SEQUENCE = re.compile(rb"\x1b\[(\??[0-9;]*)([A-Za-z])")
+
+
+class Screen:
+    # Just enough of a terminal for what TermUi writes: cursor moves and
+    # background colors, text written at the cursor
+    def __init__(self) -> None:
+        self.cells: Dict[Tuple[int, int], Tuple[bytes, int]] = {}
+        self.row = self.column = 1
+        self.color = 0
+
+    def feed(self, data: bytes) -> None:
+        index = 0
+        while index < len(data):
+            match = SEQUENCE.match(data, index)
+            if match:
+                arguments, command = match.groups()
+                if command == b"H":
+                    self.row, self.column = (int(value) for value in arguments.split(b";"))
+                elif command == b"m":
+                    code = b"\x1b[" + arguments + b"m"
+                    self.color = COLORS.index(code) if code in COLORS else 0
+                elif command == b"J":
+                    self.cells.clear()
+                index = match.end()
+            else:
+                self.cells[(self.row, self.column)] = (data[index:index + 1], self.color)
+                self.column += 1
+                index += 1
+
+    def cell(self, x: int, y: int) -> int:
+        # Color of a board cell, as two columns inside the border
+        left = self.cells.get((y + 2, 2 * x + 2), (b" ", EMPTY))
+        right = self.cells.get((y + 2, 2 * x + 3), (b" ", EMPTY))
+        assert left == right
+        return left[1]
+
+
+class TestTermUi():
+
+    def setup_method(self) -> None:
+        self.read, self.write = os.pipe()
+        self.out = io.BytesIO()
+        self.ui = TermUi(4, 3, fps=None, out=self.out, stdin=self.read)
+        self.screen = Screen()
+
+    def teardown_method(self) -> None:
+        os.close(self.read)
+        os.close(self.write)
+
+    def written(self) -> bytes:
+        data = self.out.getvalue()
+        self.out.seek(0)
+        self.out.truncate()
+        self.screen.feed(data)
+        return data
+
+    def board(self) -> List[List[int]]:
+        return [[self.screen.cell(x, y) for x in range(4)] for y in range(3)]
+
+    def test_border(self) -> None:
+        self.written()
+        assert self.screen.cells[(1, 1)][0] == b"+"
+        assert self.screen.cells[(1, 10)][0] == b"+"
+        assert self.screen.cells[(3, 10)][0] == b"|"
+        assert self.screen.cells[(5, 1)][0] == b"+"
+
+    def test_full_draw(self) -> None:
+        self.written()
+        self.ui.draw([(1, 0), (0, 0)], (3, 2))
+        self.written()
+        assert self.board() == [
+            [SNAKE, SNAKE, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY, EGG],
+        ]
+
+    def test_only_changed_cells_are_written(self) -> None:
+        self.written()
+        self.ui.draw([(1, 0), (0, 0)], (3, 2))
+        self.written()
+        self.ui.draw([(1, 0), (0, 0)], (3, 2))
+        assert self.written() == b""
+        self.ui.draw_delta((2, 0), (0, 0), (3, 2))
+        delta = self.written()
+        assert self.board()[0] == [EMPTY, SNAKE, SNAKE, EMPTY]
+        # Two cells, one cursor move each: the head is not next to the tail
+        assert delta.count(b"H") == 2
+
+    def test_adjacent_cells_need_no_cursor_move(self) -> None:
+        self.written()
+        self.ui.draw([(2, 0), (1, 0), (0, 0)], (0, 2))
+        assert self.written().count(b"H") == 2
+
+    def test_constant_bytes_per_tick(self) -> None:
+        sizes = []
+        for size in (10, 200):
+            out = io.BytesIO()
+            ui = TermUi(size, fps=None, out=out, stdin=self.read)
+            game = Game(ui=ui, iterations=100, size=size, draw_mode=DrawMode.DELTA,
+                        snake=[(2, 0), (1, 0), (0, 0)])
+            game.run()
+            ui.draw_delta(game.snake.head, game.vacated, game.egg)
+            before = ui.bytes_written
+            for _ in range(50):
+                game.step(Direction.DEFAULT)
+                ui.draw_delta(game.snake.head, game.vacated, game.egg)
+            sizes.append((ui.bytes_written - before) / 50)
+        assert max(sizes) < 40
+        assert sizes[1] < sizes[0] + 4
+
+    def test_arrow_keys(self) -> None:
+        self.ui.draw([(1, 0), (0, 0)], (3, 2))
+        os.write(self.write, b"\x1b[A\x1bOD")
+        assert self.ui.direction() is Direction.UP
+        assert self.ui.direction() is Direction.LEFT
+        assert self.ui.direction() is Direction.DEFAULT
+
+    def test_key_split_across_reads(self) -> None:
+        os.write(self.write, b"x\x1b[")
+        assert self.ui.direction() is Direction.DEFAULT
+        os.write(self.write, b"B")
+        self.ui.poll()
+        assert self.ui.input.pop(None) is Direction.DOWN
+
+    def test_quit(self) -> None:
+        os.write(self.write, b"q")
+        with pytest.raises(SystemExit):
+            self.ui.direction()
+        assert self.written().endswith(b"\x1b[?25h")
+
+    def test_closed_stdin(self) -> None:
+        os.close(self.write)
+        self.write = os.open(os.devnull, os.O_WRONLY)
+        assert self.ui.direction() is Direction.DEFAULT
+        assert self.ui.direction() is Direction.DEFAULT
+
+    def test_plays_a_game(self) -> None:
+        ui = TermUi(8, fps=None, out=self.out, stdin=self.read)
+        game = Game(ui=ui, iterations=20, size=8, draw_mode=DrawMode.DELTA,
+                    egg_creator=RandomEggCreator(8, Random(0)), snake=[(1, 0), (0, 0)])
+        assert game.run()
+        ui.draw_delta(game.snake.head, game.vacated, game.egg)
+        self.written()
+        expected = [[EMPTY] * 8 for _ in range(8)]
+        for x, y in game.snake:
+            expected[y][x] = SNAKE
+        expected[game.egg[1]][game.egg[0]] = EGG
+        assert [[self.screen.cell(x, y) for x in range(8)] for y in range(8)] == expected
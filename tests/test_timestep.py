@@ -0,0 +1,158 @@
+from typing import Iterable, List, Optional, Tuple
+
+import pytest
+
+from snake.direction import Direction
+from snake.game import DrawMode, Game
+from snake.instrumentation import Instrumentation, Phase
+from snake.timestep import Timestep, TimestepStats
+from snake.types import Position
+from snake.ui.protocol import UiProtocol
+
+MS = 1_000_000
+
+
+class Clock:
+    # Time only goes by when slept, or when a test says so
+    def __init__(self) -> None:
+        self.now = 0
+        self.slept: List[float] = []
+
+    def __call__(self) -> int:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += round(seconds * 1e9)
+
+
+class Recorder(UiProtocol):
+    # Records what is drawn, and when; a tick can take time
+    def __init__(self, clock: Clock, tick_ns: int = 0) -> None:
+        self.clock = clock
+        self.tick_ns = tick_ns
+        self.calls: List[Tuple[str, int]] = []
+
+    def draw(self, snake: Iterable[Position], egg: Position) -> None:
+        self.calls.append(("draw", self.clock.now))
+
+    def draw_delta(self, head: Position, tail: Optional[Position], egg: Position) -> None:
+        self.calls.append(("delta", self.clock.now))
+
+    def direction(self) -> Direction:
+        self.clock.now += self.tick_ns
+        return Direction.DEFAULT
+
+
+def play(ticks: int,
+         tick_ns: int = 0,
+         draw_mode: DrawMode = DrawMode.COPY,
+         **kwargs) -> Tuple[TimestepStats, Clock, Recorder]:
+    clock = Clock()
+    timestep = Timestep(clock=clock, sleep=clock.sleep, **kwargs)
+    ui = Recorder(clock, tick_ns)
+    game = Game(ui=ui, iterations=ticks, size=100, draw_mode=draw_mode, timestep=timestep)
+    game.run()
+    return game.timestep_stats, clock, ui
+
+
+class TestTimestep():
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            Timestep(tick_rate=0)
+        with pytest.raises(ValueError):
+            Timestep(fps=-1)
+        with pytest.raises(ValueError):
+            Timestep(max_catch_up=0)
+
+    def test_ticks_on_schedule(self) -> None:
+        stats, clock, ui = play(10, tick_rate=10)
+        assert stats.ticks == 10
+        # The first tick is right away, then one every 100ms
+        assert clock.now == 900 * MS
+        assert stats.dropped == 0
+        # One frame per tick, the frame after the last tick is not drawn
+        assert [time for _, time in ui.calls] == [0] + [tick * 100 * MS for tick in range(9)]
+
+    def test_catches_up(self) -> None:
+        # Ticks take 250ms out of 100ms: the late ones run back to back
+        stats, clock, ui = play(20, tick_ns=250 * MS, tick_rate=10, fps=0, max_catch_up=100)
+        assert stats.ticks == 20
+        assert stats.dropped == 0
+        assert clock.slept == []
+
+    def test_drops_what_it_cannot_catch_up(self) -> None:
+        stats, clock, ui = play(20, tick_ns=250 * MS, tick_rate=10, fps=0, max_catch_up=2)
+        assert stats.ticks == 20
+        assert stats.dropped > 0
+        # Dropped time is given up: never more than max_catch_up ticks late
+        ticked = stats.ticks + stats.dropped
+        assert ticked * 100 * MS <= clock.now + 100 * MS
+
+    def test_frames_are_capped(self) -> None:
+        stats, clock, ui = play(100, tick_rate=100, fps=25)
+        assert stats.ticks == 100
+        # 1s of game at 25 fps: a frame every fourth tick
+        assert 24 <= stats.frames <= 26
+        times = [time for _, time in ui.calls]
+        assert all(later - earlier >= 40 * MS for earlier, later in zip(times, times[1:]))
+
+    def test_no_frames(self) -> None:
+        stats, clock, ui = play(10, tick_rate=10, fps=0)
+        assert ui.calls == []
+        assert stats.frames == 0
+        assert stats.ticks == 10
+
+    def test_unthrottled(self) -> None:
+        stats, clock, ui = play(50, tick_ns=MS, tick_rate=None, fps=10)
+        assert stats.ticks == 50
+        assert clock.slept == []
+        # 50ms of ticking: the first frame, then one per 100ms at most
+        assert stats.frames == 1
+
+    def test_deltas_spanning_ticks_are_full_draws(self) -> None:
+        stats, clock, ui = play(100, draw_mode=DrawMode.DELTA, tick_rate=100, fps=25)
+        kinds = [kind for kind, _ in ui.calls]
+        assert kinds[0] == "draw"
+        assert "delta" not in kinds
+
+    def test_deltas_every_tick(self) -> None:
+        stats, clock, ui = play(10, draw_mode=DrawMode.DELTA, tick_rate=10, fps=60)
+        kinds = [kind for kind, _ in ui.calls]
+        assert kinds == ["draw"] + ["delta"] * 9
+
+    def test_waits_through_the_ui(self) -> None:
+        clock = Clock()
+
+        class Waiting(Recorder):
+            def wait(self, timeout: float) -> None:
+                self.calls.append(("wait", self.clock.now))
+                clock.sleep(timeout)
+
+        ui = Waiting(clock)
+        timestep = Timestep(tick_rate=10, clock=clock)
+        Game(ui=ui, iterations=3, size=10, timestep=timestep).run()
+        assert [kind for kind, _ in ui.calls].count("wait") == 2
+
+    def test_instrumented(self) -> None:
+        clock = Clock()
+        instrumentation = Instrumentation()
+        timestep = Timestep(tick_rate=100, fps=25, clock=clock, sleep=clock.sleep)
+        game = Game(ui=Recorder(clock), iterations=100, size=100,
+                    instrumentation=instrumentation, timestep=timestep)
+        game.run()
+        assert instrumentation.counters["ticks"] == 100
+        assert instrumentation.phases[Phase.MOVE].count == 100
+        assert instrumentation.phases[Phase.DIRECTION].count == 100
+        # Only the frames drawn are timed, on ticks the sampling picks
+        assert 0 < instrumentation.phases[Phase.DRAW].count <= game.timestep_stats.frames
+
+    def test_stats_are_per_game(self) -> None:
+        clock = Clock()
+        timestep = Timestep(tick_rate=10, fps=0, clock=clock, sleep=clock.sleep)
+        games = [Game(ui=Recorder(clock), iterations=ticks, size=10, timestep=timestep)
+                 for ticks in (3, 5)]
+        for game in games:
+            game.run()
+        assert [game.timestep_stats.ticks for game in games] == [3, 5]
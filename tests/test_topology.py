@@ -0,0 +1,143 @@
+from pathlib import Path
+from random import Random
+from typing import Tuple
+
+import pytest
+
+from snake.arena import WALL as WALL_DEATH
+from snake.arena import Arena
+from snake.direction import TURNS, Direction
+from snake.game import HIT_WALL, Board, Game, RandomEggCreator, Snake
+from snake.topology import WALL, Topology
+from snake.ui.headless import HeadlessUi
+
+MAP = """
+.....
+.#...
+.#...
+.....
+"""
+
+
+class TestTopology():
+
+    def test_wrap_matches_the_torus(self) -> None:
+        topology = Topology(5, 3)
+        for turn in TURNS:
+            for y in range(3):
+                for x in range(5):
+                    assert topology.neighbour((x, y), turn) == \
+                        ((x + turn.x) % 5, (y + turn.y) % 3)
+
+    def test_walls(self) -> None:
+        topology = Topology.walls(5, 3)
+        assert topology.neighbour((4, 1), Direction.RIGHT) is WALL
+        assert topology.neighbour((0, 0), Direction.UP) is WALL
+        assert topology.neighbour((3, 1), Direction.RIGHT) == (4, 1)
+
+    def test_parse(self) -> None:
+        topology = Topology.parse(MAP)
+        assert (topology.width, topology.height) == (5, 4)
+        assert topology.obstacles == {(1, 1), (1, 2)}
+        assert topology.playable == 18
+        assert topology.neighbour((0, 1), Direction.RIGHT) is WALL
+        assert topology.neighbour((1, 0), Direction.DOWN) is WALL
+        assert not topology.wrap
+
+    def test_load(self, tmp_path: Path) -> None:
+        path = tmp_path / "map.txt"
+        path.write_text(MAP)
+        topology = Topology.load(str(path), wrap=True)
+        assert topology.obstacles == {(1, 1), (1, 2)}
+        assert topology.neighbour((4, 0), Direction.RIGHT) == (0, 0)
+
+    def test_invalid_maps(self) -> None:
+        with pytest.raises(ValueError):
+            Topology.parse("...\n..\n")
+        with pytest.raises(ValueError):
+            Topology.parse("\n")
+        with pytest.raises(ValueError):
+            Topology(3, 3, obstacles=[(3, 0)])
+
+
+class TestSnakeOnTopology():
+
+    def test_hits_a_wall(self) -> None:
+        board = Board(4, 4, Topology.walls(4, 4))
+        snake = Snake(board, [(3, 0), (2, 0)])
+        with pytest.raises(Snake.HitsWallError):
+            snake.move()
+        assert snake.positions == [(3, 0), (2, 0)]
+
+    def test_hits_an_obstacle(self) -> None:
+        board = Board(5, 4, Topology.parse(MAP))
+        snake = Snake(board, [(0, 1), (0, 0)])
+        snake.direction = Direction.RIGHT
+        with pytest.raises(Snake.BitesItselfError):
+            snake.move()
+        assert (1, 1) not in snake
+
+    def test_initial_direction_through_the_tables(self) -> None:
+        board = Board(4, 4, Topology(4, 4))
+        assert Snake(board, [(3, 0), (0, 0)]).direction is Direction.LEFT
+        assert Snake(board, [(0, 3), (0, 0)]).direction is Direction.UP
+        with pytest.raises(ValueError):
+            Snake(Board(4, 4, Topology.walls(4, 4)), [(3, 0), (0, 0)])
+
+    def test_cannot_start_on_an_obstacle(self) -> None:
+        with pytest.raises(Exception):
+            Snake(Board(5, 4, Topology.parse(MAP)), [(1, 1), (0, 1)])
+
+    def test_make_move_into_a_wall(self) -> None:
+        snake = Snake(Board(4, 4, Topology.walls(4, 4)), [(2, 0), (1, 0)])
+        assert not snake.make_move(Direction.RIGHT)
+        with pytest.raises(Snake.HitsWallError):
+            snake.make_move(Direction.UP)
+        assert snake.direction is Direction.RIGHT
+        snake.unmake_move()
+        assert snake.positions == [(2, 0), (1, 0)]
+
+    def test_fills_board_without_obstacles(self) -> None:
+        topology = Topology(2, 2, obstacles=[(1, 1)])
+        snake = Snake(Board(2, 2, topology), [(0, 1), (0, 0), (1, 0)])
+        assert snake.fills_board()
+
+
+class TestGameOnTopology():
+
+    def test_lost_on_a_wall(self) -> None:
+        game = Game(ui=HeadlessUi(), topology=Topology.walls(10, 10))
+        assert not game.run()
+        assert game.lost
+        assert game.ticks == 3
+        assert game.result().cause == HIT_WALL
+
+    def test_eggs_skip_obstacles(self) -> None:
+        obstacles = [(x, y) for x in range(10) for y in range(10) if (x + y) % 3 == 0]
+        topology = Topology(10, 10, obstacles=[cell for cell in obstacles
+                                               if cell not in Game.DEFAULT_SNAKE])
+        game = Game(ui=HeadlessUi(), topology=topology,
+                    egg_creator=RandomEggCreator(10, Random(0)))
+        for _ in range(200):
+            game._place_egg()
+            assert game.egg not in topology.obstacles
+            assert game.egg not in game.snake
+
+    def test_eggs_from_old_creators_skip_obstacles(self) -> None:
+        class ObstacleFirstEggCreator():
+            def __init__(self) -> None:
+                self.eggs = [(1, 1), (3, 3)]
+
+            def create(self) -> Tuple[int, int]:
+                return self.eggs.pop(0)
+
+        game = Game(ui=HeadlessUi(), topology=Topology.parse(MAP),
+                    snake=[(0, 1), (0, 0)], egg_creator=ObstacleFirstEggCreator())
+        game._place_egg()
+        assert game.egg == (3, 3)
+
+    def test_arena_walls(self) -> None:
+        arena = Arena([[(9, 0), (8, 0)], [(0, 5), (1, 5)]], topology=Topology.walls(10, 10),
+                      rng=Random(0))
+        assert not arena.step([Direction.RIGHT, Direction.UP])
+        assert arena.causes == [WALL_DEATH, None]
@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+from typing import Iterable
+
+import pytest
+
+from snake.direction import Direction
+from snake.game import Game
+from snake.tournament import SeedResult, aggregate, main, play, run_tournament, summarize
+from snake.types import Position
+
+
+def go_down(snake: Iterable[Position], egg: Position) -> Direction:
+    return Direction.DOWN
+
+
+class TestTournament():
+
+    def test_play_is_seeded(self) -> None:
+        assert play(7, size=8, max_ticks=500) == play(7, size=8, max_ticks=500)
+
+    def test_play_result(self) -> None:
+        result = play(3, size=8, max_ticks=50)
+        assert result.seed == 3
+        assert result.ticks <= 50
+        assert result.eggs == result.length - len(Game.DEFAULT_SNAKE)
+        assert not (result.won and result.lost)
+
+    def test_policy_with_tick_limit(self) -> None:
+        result = play(0, policy=go_down, size=20, max_ticks=10)
+        assert result == SeedResult(seed=0, won=False, lost=False,
+                                    ticks=10, length=result.length, eggs=result.eggs)
+
+    def test_same_results_whatever_the_workers(self) -> None:
+        seeds = range(40)
+        inline = list(run_tournament(seeds, size=8, max_ticks=300, workers=1))
+        pooled = list(run_tournament(seeds, size=8, max_ticks=300, workers=2, chunk_size=7))
+        assert inline == pooled
+        assert [result.seed for result in pooled] == list(seeds)
+        assert summarize(inline) == summarize(pooled)
+
+    def test_summarize(self) -> None:
+        summary = summarize([
+            SeedResult(seed=0, won=True, lost=False, ticks=10, length=6, eggs=3),
+            SeedResult(seed=1, won=False, lost=True, ticks=20, length=4, eggs=1),
+        ])
+        assert summary == {"games": 2, "won": 1, "lost": 1, "mean_ticks": 15.0,
+                           "mean_length": 5.0, "mean_eggs": 2.0}
+
+    def test_cli(self, capsys: pytest.CaptureFixture) -> None:
+        main(["--seeds", "2:5", "--size", "8", "--max-ticks", "100", "--results",
+              "--policy", "tests.test_tournament:go_down"])
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["seed"] for line in lines[:3]] == [2, 3, 4]
+        assert json.loads(lines[3])["games"] == 3
+
+    def test_aggregate_whatever_the_workers(self) -> None:
+        seeds = range(30)
+        inline = aggregate(seeds, size=8, max_ticks=300)
+        pooled = aggregate(seeds, size=8, max_ticks=300, workers=2, chunk_size=7)
+        assert inline.games == pooled.games == 30
+        assert inline.causes == pooled.causes
+        assert inline.summary()["ticks"] == pytest.approx(pooled.summary()["ticks"])
+        results = list(run_tournament(seeds, size=8, max_ticks=300))
+        assert inline.won == sum(result.won for result in results)
+        assert inline.lost == sum(result.lost for result in results)
+
+    def test_cli_checkpoint_and_resume(self, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+        checkpoint = str(tmp_path / "stats.json")
+        main(["--seeds", "20", "--size", "8", "--max-ticks", "100", "--checkpoint", checkpoint])
+        whole = json.loads(capsys.readouterr().out)
+        assert whole["games"] == 20
+        partial = aggregate(range(12), size=8, max_ticks=100)
+        partial.save(checkpoint)
+        main(["--seeds", "20", "--size", "8", "--max-ticks", "100", "--checkpoint", checkpoint,
+              "--resume"])
+        resumed = json.loads(capsys.readouterr().out)
+        assert resumed["games"] == 20
+        assert resumed["causes"] == whole["causes"]
+        assert resumed["ticks"]["mean"] == pytest.approx(whole["ticks"]["mean"])